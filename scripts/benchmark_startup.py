@@ -0,0 +1,58 @@
+"""Measure spinta startup time
+
+Each case is run in a fresh Python process, with and without commands index
+(see `spinta index-commands`). Example:
+
+    python scripts/benchmark_startup.py -n 5
+    python scripts/benchmark_startup.py --asgi  # needs configured backends
+
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = {
+    "spinta --help": [sys.executable, "-m", "spinta", "--help"],
+    "create_context": [
+        sys.executable,
+        "-c",
+        "from spinta.core.context import create_context; create_context()",
+    ],
+}
+
+ASGI = [sys.executable, "-c", "import spinta.asgi"]
+
+
+def run(cmd, env) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=3, help="number of runs of each case")
+    parser.add_argument("--asgi", action="store_true", help="also measure ASGI app import")
+    args = parser.parse_args()
+
+    cases = dict(CASES)
+    if args.asgi:
+        cases["import spinta.asgi"] = ASGI
+
+    for index in (True, False):
+        env = dict(os.environ)
+        if not index:
+            # Empty path disables commands index.
+            env["SPINTA_COMMANDS__INDEX"] = ""
+        for name, cmd in cases.items():
+            times = [run(cmd, env) for _ in range(args.n)]
+            label = f"{name} ({'with' if index else 'without'} index)"
+            print(f"{label:<45} min: {min(times):.2f}s median: {statistics.median(times):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
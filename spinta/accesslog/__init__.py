@@ -1,14 +1,15 @@
 import datetime
 import os
 import time
-from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, TypeVar, overload
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, TypeVar, overload
 
 import psutil
 from starlette.requests import Request
 
 from spinta import commands
 from spinta.auth import Token, get_default_auth_client_id
-from spinta.components import Config, Context, UrlParams
+from spinta.components import Config, Context, Store, UrlParams
+from spinta.utils.config import asbool
 
 
 class AccessLog:
@@ -16,7 +17,8 @@ class AccessLog:
     method: str = None
     reason: str = None
     url: str = None
-    buffer_size: int = 100
+    buffer_size: int = 300
+    log_memory: bool = True  # log memory used by a request
     format: str = None  # response format
     content_type: str = None  # request content-type header
     agent: str = None  # request user-agent header
@@ -51,7 +53,7 @@ class AccessLog:
     ):
         self.txn = txn
         self.start = self._get_time()
-        self.memory = self._get_memory()
+        self.memory = self._get_memory() if self.log_memory else None
         message = {
             "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "pid": os.getpid(),
@@ -81,18 +83,33 @@ class AccessLog:
         objects: int,
     ):
         delta = self._get_time() - self.start
-        memory = self._get_memory() - self.memory
         message = {
             "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "type": "response",
             "delta": delta,
-            "memory": memory,
             "objects": objects,
             "txn": self.txn,
         }
+        if self.memory is not None:
+            message["memory"] = self._get_memory() - self.memory
 
         self.log(message)
 
+    def body(
+        self,
+        *,
+        buffer_size: int,
+        flushes: int,
+    ):
+        message = {
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "type": "body",
+            "buffer_size": buffer_size,
+            "flushes": flushes,
+            "txn": self.txn,
+        }
+        self.log(message)
+
     def auth(
         self,
         *,
@@ -120,7 +137,18 @@ class AccessLog:
 
     def _get_memory(self) -> float:
         "Get currently used memory in bytes"
-        return psutil.Process().memory_info().rss
+        return _get_process().memory_info().rss
+
+
+_process: Optional[psutil.Process] = None
+
+
+def _get_process() -> psutil.Process:
+    # Process is created once per process, but forked workers need their own.
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process
 
 
 @overload
@@ -129,8 +157,25 @@ def load(context: Context, accesslog: AccessLog, config: Config):
     accesslog.buffer_size = config.rc.get(
         "accesslog",
         "buffer_size",
+        cast=int,
         required=True,
     )
+    accesslog.log_memory = config.rc.get(
+        "accesslog",
+        "memory",
+        default=AccessLog.log_memory,
+        cast=asbool,
+    )
+
+
+@overload
+@commands.load.register(Context, AccessLog, Store)
+def load(context: Context, accesslog: AccessLog, store: Store):  # noqa
+    # Request access logs are created without config, so settings are taken
+    # from store access log.
+    if isinstance(store.accesslog, AccessLog):
+        accesslog.buffer_size = store.accesslog.buffer_size
+        accesslog.log_memory = store.accesslog.log_memory
 
 
 @overload
@@ -192,6 +237,19 @@ def log_response(
     accesslog.response(objects=objects)
 
 
+def log_body(
+    context: Context,
+    chunks: Iterable[bytes],
+    buffer_size: int,
+) -> Iterator[bytes]:
+    flushes = 0
+    for chunk in chunks:
+        flushes += 1
+        yield chunk
+    accesslog: AccessLog = context.get("accesslog")
+    accesslog.body(buffer_size=buffer_size, flushes=flushes)
+
+
 async def log_async_response(
     context: Context,
     rows: AsyncIterator[TRow],
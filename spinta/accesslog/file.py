@@ -1,7 +1,14 @@
+import atexit
 import json
+import logging
+import os
 import pathlib
+import queue
+import signal
 import sys
-from typing import Any, Dict, TextIO, Union
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO, Union
 
 from starlette.requests import Request
 
@@ -9,22 +16,202 @@ from spinta import commands
 from spinta.accesslog import AccessLog
 from spinta.components import Config, Context, Store
 
+log = logging.getLogger(__name__)
+
+
+class AccessLogWriter:
+    """Process wide access log file writer
+
+    Messages are put to a queue and are encoded and written to the file by a
+    background thread. Queued messages are written, when `buffer_size`
+    messages are queued or every `flush_interval` seconds. File given as a
+    path is kept open and is reopened after `reopen`, for example on SIGHUP
+    after log rotation.
+
+    Threads are not inherited by forked processes, so a forked process starts
+    its own writer thread, when it writes first message.
+    """
+
+    def __init__(
+        self,
+        file: Union[TextIO, pathlib.Path],
+        *,
+        buffer_size: int = 300,
+        flush_interval: float = 1.0,
+    ):
+        self.file = file
+        self.buffer_size = max(buffer_size, 1)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._start()
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._stream: Optional[TextIO] = None
+        # Messages queued, but not yet written by parent process, are not
+        # written again by a forked process.
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._reopen = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._queue,),
+            name="spinta-accesslog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._start()
+
+    def write(self, message: Dict[str, Any]) -> None:
+        self._check_pid()
+        self._queue.put(message)
+
+    def flush(self) -> None:
+        if self._closed:
+            return
+        self._check_pid()
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def reopen(self) -> None:
+        self._check_pid()
+        self._reopen.set()
+        self._queue.put(None)
+
+    def close(self) -> None:
+        if self._closed or self._pid != os.getpid():
+            return
+        self._closed = True
+        self._queue.put(StopIteration)
+        self._thread.join()
+
+    def _open(self) -> TextIO:
+        if self._stream is None or self._reopen.is_set():
+            self._reopen.clear()
+            if isinstance(self.file, pathlib.Path):
+                if self._stream is not None:
+                    self._stream.close()
+                self._stream = self.file.open("a")
+            else:
+                self._stream = self.file
+        return self._stream
+
+    def _flush(self, messages: List[Dict[str, Any]]) -> None:
+        try:
+            stream = self._open()
+            if messages:
+                stream.write("".join(json.dumps(message) + "\n" for message in messages))
+                stream.flush()
+        except Exception:
+            log.exception("Failed to write %d access log messages.", len(messages))
+        messages.clear()
+
+    def _run(self, messages_queue: queue.SimpleQueue) -> None:
+        messages = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = messages_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                messages.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(messages) < self.buffer_size and time.monotonic() < deadline:
+                    continue
+
+            self._flush(messages)
+            deadline = None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is StopIteration:
+                break
+
+        if isinstance(self.file, pathlib.Path) and self._stream is not None:
+            self._stream.close()
+
+
+_writers: Dict[Any, AccessLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _reopen_writers(signum, frame) -> None:
+    for writer in list(_writers.values()):
+        if isinstance(writer.file, pathlib.Path):
+            writer.reopen()
+    if callable(_previous_sighup):
+        _previous_sighup(signum, frame)
+
+
+def _close_writers() -> None:
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+_previous_sighup = None
+_sighup_installed = False
+
+
+def _install_sighup_handler() -> None:
+    # SIGHUP is handled only when logging to a file, that can be rotated,
+    # otherwise default SIGHUP handling (process termination) is kept.
+    global _previous_sighup, _sighup_installed
+    if _sighup_installed or not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        _previous_sighup = signal.signal(signal.SIGHUP, _reopen_writers)
+    except ValueError:
+        # Signal handlers can only be set from the main thread.
+        log.debug("Could not install SIGHUP handler for access log.")
+    else:
+        _sighup_installed = True
+
+
+def get_accesslog_writer(
+    file: Union[TextIO, pathlib.Path],
+    *,
+    buffer_size: int,
+    flush_interval: float,
+) -> AccessLogWriter:
+    key = str(file.resolve()) if isinstance(file, pathlib.Path) else id(file)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            if not _writers:
+                atexit.register(_close_writers)
+            if isinstance(file, pathlib.Path):
+                _install_sighup_handler()
+            writer = _writers[key] = AccessLogWriter(
+                file,
+                buffer_size=buffer_size,
+                flush_interval=flush_interval,
+            )
+        return writer
+
 
 class FileAccessLog(AccessLog):
     file: Union[TextIO, pathlib.Path] = None
+    flush_interval: float = 1.0
 
-    _file: TextIO = None
-    _closed: bool = True
-
-    def __exit__(self, *exc):
-        if not self._closed:
-            self._file.close()
+    writer: AccessLogWriter = None
 
     def log(self, message: Dict[str, Any]) -> None:
-        if self._file is None:
+        if self.writer is None:
             return
-        message = json.dumps(message)
-        print(message, file=self._file)
+        self.writer.write(message)
+
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
 
 
 @commands.load.register(Context, FileAccessLog, Config)
@@ -32,6 +219,12 @@ def load(context: Context, accesslog: FileAccessLog, config: Config):
     commands.load[Context, AccessLog, Config](context, accesslog, config)
 
     file = config.rc.get("accesslog", "file")
+    accesslog.flush_interval = config.rc.get(
+        "accesslog",
+        "flush_interval",
+        default=FileAccessLog.flush_interval,
+        cast=float,
+    )
 
     if file == "stdout":
         file = sys.stdout
@@ -47,25 +240,20 @@ def load(context: Context, accesslog: FileAccessLog, config: Config):
             pass
 
     accesslog.file = file
+    if file is not None:
+        accesslog.writer = get_accesslog_writer(
+            file,
+            buffer_size=accesslog.buffer_size,
+            flush_interval=accesslog.flush_interval,
+        )
     return accesslog
 
 
-def _prepare_file(
-    accesslog: AccessLog,
-    file: Union[TextIO, pathlib.Path, None],
-) -> None:
-    if isinstance(file, pathlib.Path):
-        file = file.open("a")
-        accesslog._closed = False
-    else:
-        accesslog._closed = True
-    accesslog._file = file
-
-
 @commands.load.register(Context, FileAccessLog, Store)
 def load(context: Context, accesslog: FileAccessLog, store: Store):
+    commands.load[Context, AccessLog, Store](context, accesslog, store)
     if isinstance(store.accesslog, FileAccessLog):
-        _prepare_file(accesslog, store.accesslog.file)
+        accesslog.writer = store.accesslog.writer
 
 
 @commands.load.register(Context, FileAccessLog, Request)
@@ -73,4 +261,4 @@ def load(context: Context, accesslog: FileAccessLog, request: Request):
     commands.load[Context, AccessLog, Request](context, accesslog, request)
     store: Store = context.get("store")
     if isinstance(store.accesslog, FileAccessLog):
-        _prepare_file(accesslog, store.accesslog.file)
+        accesslog.writer = store.accesslog.writer
@@ -17,6 +17,7 @@ class PythonAccessLog(AccessLog):
 
 @commands.load.register(Context, PythonAccessLog, Store)
 def load(context: Context, accesslog: PythonAccessLog, store: Store):
+    commands.load[Context, AccessLog, Store](context, accesslog, store)
     if context.has("accesslog.stream"):
         accesslog.stream = context.get("accesslog.stream")
     else:
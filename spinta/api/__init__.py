@@ -503,4 +503,9 @@ def init(context: Context):
         BearerTokenValidator,
     )
 
+    if config.sql_schema_warmup:
+        from spinta.datasets.backends.sql.helpers import warm_up_schema
+
+        warm_up_schema(context, context.get("store").manifest)
+
     return app
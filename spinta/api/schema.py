@@ -7,6 +7,7 @@ from starlette.responses import JSONResponse
 
 from spinta import commands
 from spinta.auth import Scopes, check_scope
+from spinta.backends.helpers import clear_serialization_plans
 from spinta.cli.helpers.migrate import MigrationConfig
 from spinta.cli.helpers.store import prepare_manifest
 from spinta.components import Config, Context, Model, Property, Store, UrlParams
@@ -165,6 +166,8 @@ def reset_affected_objects(context: Context, manifest: Manifest, dataset_name: s
         if model.external and model.external.dataset and model.external.dataset.name == dataset_name:
             del objects["model"][key]
 
+    clear_serialization_plans()
+
 
 async def schema_api(context: Context, request: Request, params: UrlParams):
     check_scope(context, Scopes.SCHEMA_WRITE)
@@ -4,6 +4,7 @@ import base64
 import dataclasses
 import datetime
 import enum
+import hashlib
 import json
 import logging
 import os
@@ -23,7 +24,7 @@ from authlib.oauth2.rfc6749 import OAuth2Payload, grants, list_to_scope
 from authlib.oauth2.rfc6749.errors import InvalidClientError
 from authlib.oauth2.rfc6749.util import scope_to_list
 from authlib.oauth2.rfc6750.errors import InsufficientScopeError
-from cachetools import LRUCache, cached
+from cachetools import LRUCache, TLRUCache, cached
 from cachetools.keys import hashkey
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import rsa
@@ -77,6 +78,7 @@ WORLD_READABLE_FILE = 0o644  # rw-r--r-- (owner read/write, others read)
 CLIENT_FILE_CACHE_SIZE_LIMIT = 1000
 KEYMAP_CACHE_SIZE_LIMIT = 1
 DEFAULT_CLIENT_ID_CACHE_SIZE_LIMIT = 1
+VERIFIED_TOKEN_CACHE_SIZE_LIMIT = 10000
 DEFAULT_CREDENTIALS_SECTION = "default"
 DEPRECATED_SCOPE_PREFIX = "spinta_"
 
@@ -254,20 +256,94 @@ def download_and_store_public_keys(context: Context) -> JWKS | None:
         json.dump(jwks, f, indent=4)
         log.info(f"Successfully downloaded public keys ({jwks}) from {config.downloaded_public_keys_file=}")
 
+    verified_tokens.clear()
+
     return jwks
 
 
+def _get_token_expiration(key: tuple, claims: dict, now: float) -> float:
+    return claims["exp"]
+
+
+class VerifiedTokenCache:
+    """Claims of tokens, that have already been verified
+
+    Tokens are identified by a hash of the token string and public keys used
+    to verify it. Entries expire together with the token.
+    """
+
+    def __init__(self, maxsize: int):
+        self._cache = TLRUCache(maxsize, ttu=_get_token_expiration, timer=time.time)
+        self._lock = Lock()
+        self._keys: str | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, keys: str, token_string: str | bytes) -> tuple[str, bytes]:
+        if isinstance(token_string, str):
+            token_string = token_string.encode()
+        return keys, hashlib.sha256(token_string).digest()
+
+    def get(self, keys: str, token_string: str | bytes) -> dict | None:
+        with self._lock:
+            claims = self._cache.get(self._key(keys, token_string))
+            if claims is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return dict(claims)
+
+    def set(self, keys: str, token_string: str | bytes, claims: dict) -> None:
+        if not isinstance(claims.get("exp"), (int, float)):
+            return
+        with self._lock:
+            self._cache[self._key(keys, token_string)] = dict(claims)
+
+    def use_keys(self, keys: str) -> None:
+        # Drop tokens verified with previous public keys.
+        with self._lock:
+            if self._keys != keys:
+                self._keys = keys
+                self._cache.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+verified_tokens = VerifiedTokenCache(VERIFIED_TOKEN_CACHE_SIZE_LIMIT)
+
+
 class BearerTokenValidator(rfc6750.BearerTokenValidator):
     def __init__(self, context: Context):
         super().__init__()
         self._context = context
         self._default_public_key: RSAKey = load_key(context, KeyType.public)
         self._all_public_keys: list[RSAKey] = load_all_public_keys(context)
+        verified_tokens.use_keys(self._public_keys_id)
+
+    @cached_property
+    def _public_keys_id(self) -> str:
+        return ",".join(key.thumbprint() for key in self._all_public_keys)
 
     def decode_token(self, token_string: str) -> dict:
         if not token_string:
             raise InvalidToken("Token string is required")
 
+        claims = verified_tokens.get(self._public_keys_id, token_string)
+        if claims is None:
+            claims = self._verify_token(token_string)
+            verified_tokens.set(self._public_keys_id, token_string, claims)
+        return claims
+
+    def _verify_token(self, token_string: str) -> dict:
         try:
             token_header = decode_unverified_header(token_string)
             if kid := (token_header.get("kid") or token_header.get("key")):
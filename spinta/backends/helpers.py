@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import Any, Iterable, Iterator, TypeVar
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
 import sqlalchemy as sa
 from multipledispatch import dispatch
@@ -14,9 +16,10 @@ from spinta.backends.components import SelectTree
 from spinta.backends.constants import BackendOrigin, TableType
 from spinta.backends.postgresql.helpers import get_pg_name
 from spinta.commands import build_full_response
-from spinta.components import Component, Config, Context, DataItem, Model, Namespace, Property
+from spinta.components import Component, Config, Context, DataItem, Model, Namespace, Property, page_in_data
 from spinta.core.enums import Action
 from spinta.exceptions import BackendUnavailable
+from spinta.formats.components import Format
 from spinta.types.datatype import Base32, DataType, Denorm, PrimaryKey, String
 from spinta.utils.data import take
 
@@ -331,6 +334,126 @@ def get_ns_reserved_props(action: Action) -> list[str]:
     return []
 
 
+class SerializationPlan:
+    """Prepare model rows for response without per row dispatch
+
+    Selected properties and `prepare_dtype_for_response` implementations do
+    not change within a request, so they are resolved once and then applied
+    to each row. Result is the same as calling `prepare_data_for_response`
+    for each row.
+    """
+
+    model: Model
+    fmt: Format
+    action: Action
+    select: SelectTree
+    # (property, select) pairs for rows with and without `_page`.
+    props: list[tuple[Property, SelectTree]]
+    page_props: list[tuple[Property, SelectTree]]
+    # Resolved `prepare_dtype_for_response` implementations by
+    # (context type, data type, value type).
+    funcs: dict[tuple[type, type, type], Callable]
+
+    def __init__(
+        self,
+        model: Model,
+        fmt: Format,
+        action: Action,
+        select: SelectTree,
+        prop_names: list[str],
+    ):
+        self.model = model
+        self.fmt = fmt
+        self.action = action
+        self.select = select
+        self.props = self._select(prop_names, include_page=False)
+        self.page_props = self._select(prop_names, include_page=True)
+        self.funcs = {}
+
+    def _select(self, prop_names: list[str], include_page: bool) -> list[tuple[Property, SelectTree]]:
+        props = self.model.properties
+        reserved = get_model_reserved_props(self.action, include_page)
+        return [
+            *select_only_props(self.model, reserved, props, self.select),
+            *select_only_props(self.model, prop_names, props, self.select, reserved=False),
+        ]
+
+    def __call__(self, context: Context, row: dict) -> dict:
+        result = {}
+        for prop, sel in self.page_props if page_in_data(row) else self.props:
+            if self.select is None and prop.name not in row:
+                # Same as in `select_keys`.
+                continue
+            val = row.get(prop.name)
+            key = (type(context), type(prop.dtype), type(val))
+            func = self.funcs.get(key)
+            if func is None:
+                func = self.funcs[key] = _resolve_prepare_dtype_for_response(context, self.fmt, prop.dtype, val)
+            result[prop.name] = func(
+                context,
+                self.fmt,
+                prop.dtype,
+                val,
+                data=row,
+                action=self.action,
+                select=sel,
+            )
+        return result
+
+
+def _resolve_prepare_dtype_for_response(context: Context, fmt: Format, dtype: DataType, value: Any) -> Callable:
+    func = commands.prepare_dtype_for_response.dispatch(type(context), type(fmt), type(dtype), type(value))
+    # Let the command itself report a missing implementation.
+    return func or commands.prepare_dtype_for_response
+
+
+# Max number of serialization plans kept in memory.
+SERIALIZATION_PLAN_CACHE_SIZE = 256
+
+_serialization_plans: OrderedDict[tuple, SerializationPlan] = OrderedDict()
+_serialization_plans_lock = threading.Lock()
+
+
+def get_serialization_plan(
+    context: Context,
+    model: Model,
+    fmt: Format,
+    action: Action,
+    select: SelectTree,
+    prop_names: list[str],
+) -> SerializationPlan | None:
+    """Get a cached serialization plan, if it can be used for `model` rows
+
+    Returns None if `prepare_data_for_response` is overridden for `model` or
+    `fmt`, in that case each row must be prepared using the command.
+    """
+    generic = commands.prepare_data_for_response.dispatch(Context, Model, Format, dict)
+    impl = commands.prepare_data_for_response.dispatch(type(context), type(model), type(fmt), dict)
+    if impl is not generic:
+        return None
+
+    # Model is part of the key by identity and plan keeps a reference to it,
+    # so plans of reloaded manifests are never reused and eventually evicted.
+    key = (id(model), type(fmt), action, repr(select), tuple(prop_names))
+    with _serialization_plans_lock:
+        plan = _serialization_plans.get(key)
+        if plan is not None and plan.model is model:
+            _serialization_plans.move_to_end(key)
+            return plan
+
+    plan = SerializationPlan(model, fmt, action, select, prop_names)
+    with _serialization_plans_lock:
+        _serialization_plans[key] = plan
+        if len(_serialization_plans) > SERIALIZATION_PLAN_CACHE_SIZE:
+            _serialization_plans.popitem(last=False)
+    return plan
+
+
+def clear_serialization_plans() -> None:
+    with _serialization_plans_lock:
+        _serialization_plans.clear()
+
+
 @dataclasses.dataclass(frozen=True)
 class TableIdentifier:
     """
@@ -1,11 +1,11 @@
 from types import AsyncGeneratorType
-from typing import Optional
+from typing import List, Optional
 
 import sqlalchemy as sa
 
 from spinta import commands
 from spinta.backends.constants import TableType
-from spinta.backends.postgresql.components import PostgreSQL
+from spinta.backends.postgresql.components import PostgreSQL, WriteTransaction
 from spinta.backends.postgresql.sqlalchemy import utcnow
 from spinta.components import Context, DataItem, Model, Property
 from spinta.core.enums import Action
@@ -21,33 +21,55 @@ async def create_changelog_entry(
     dstream: AsyncGeneratorType,
 ) -> None:
     transaction = context.get("transaction")
-    connection = transaction.connection
+    config = context.get("config")
     table = backend.get_table(node, TableType.CHANGELOG)
+
+    # Data items are yielded only after their changelog entries are written,
+    # so that a consumer never sees a data item without a changelog entry.
+    buffer = []
+    entries = []
     async for data in dstream:
-        if not data.patch:
-            yield data
-            continue
-
-        qry = table.insert().values(
-            _txn=transaction.id,
-            datetime=utcnow(),
-            action=Action.INSERT.value,
-        )
-        filtered_data = _filter_data_by_action(data)
-        connection.execute(
-            qry,
-            [
-                {
-                    "_rid": data.saved["_id"] if data.saved else data.patch["_id"],
-                    "_revision": data.patch["_revision"] if data.patch else data.saved["_revision"],
-                    "_txn": transaction.id,
-                    "datetime": utcnow(),
-                    "action": data.action.value,
-                    "data": fix_data_for_json(filtered_data),
-                }
-            ],
-        )
-        yield data
+        buffer.append(data)
+        if data.patch:
+            entries.append(_build_changelog_entry(transaction, data))
+        if len(buffer) >= config.write_batch_size or data.flush:
+            _write_changelog_entries(transaction, table, entries)
+            for data_ in buffer:
+                yield data_
+            buffer = []
+            entries = []
+
+    _write_changelog_entries(transaction, table, entries)
+    for data_ in buffer:
+        yield data_
+
+
+def _build_changelog_entry(transaction: WriteTransaction, data: DataItem) -> dict:
+    return {
+        "_rid": data.saved["_id"] if data.saved else data.patch["_id"],
+        "_revision": data.patch["_revision"] if data.patch else data.saved["_revision"],
+        "_txn": transaction.id,
+        "action": data.action.value,
+        "data": fix_data_for_json(_filter_data_by_action(data)),
+    }
+
+
+def _write_changelog_entries(
+    transaction: WriteTransaction,
+    table: sa.Table,
+    entries: List[dict],
+) -> None:
+    if not entries:
+        return
+    qry = table.insert().values(
+        _txn=transaction.id,
+        datetime=utcnow(),
+        action=Action.INSERT.value,
+    )
+    # Multiple entries are inserted with a single multi-row INSERT, rows get
+    # their `_id` (change id) from the sequence in the same order, as if they
+    # were inserted one by one.
+    transaction.connection.execute(qry, entries)
 
 
 @commands.changes.register(Context, Model, PostgreSQL)
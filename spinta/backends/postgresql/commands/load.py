@@ -6,6 +6,7 @@ from spinta import commands
 from spinta.backends.postgresql.components import PostgreSQL
 from spinta.backends.postgresql.helpers.name import PG_NAMING_CONVENTION
 from spinta.backends.postgresql.sqlalchemy import create_postgresql_engine
+from spinta.backends.postgresql.ufuncs.query.cache import QueryCache
 from spinta.components import Context
 from spinta.utils.sqlalchemy import get_metadata_naming_convention
 
@@ -16,6 +17,7 @@ def load(context: Context, backend: PostgreSQL, config: Dict[str, Any]):
     backend.engine = create_postgresql_engine(backend.dsn, echo=False)
     backend.schema = sa.MetaData(backend.engine, naming_convention=get_metadata_naming_convention(PG_NAMING_CONVENTION))
     backend.tables = {}
+    backend.query_cache = QueryCache(config.get("query_cache_size", 1000))
 
 
 @commands.unload_backend.register()
@@ -2,6 +2,7 @@ from typing import Iterator, overload
 
 from spinta import commands
 from spinta.backends.postgresql.components import PostgreSQL
+from spinta.backends.postgresql.ufuncs.query.cache import build_query
 from spinta.components import Context, Model, Property
 from spinta.core.ufuncs import Expr
 from spinta.exceptions import ItemDoesNotExist, NotFoundError
@@ -52,16 +53,10 @@ def getall(
             params = QueryParams()
         params.default_expand = default_expand
 
-    builder = backend.query_builder_class(context)
-    builder.update(model=model)
-    table = backend.get_table(model)
-    env = builder.init(backend, table, params)
-    expr = env.resolve(query)
-    where = env.execute(expr)
-    qry = env.build(where)
+    env = build_query(context, backend, model, query, params)
 
     conn = connection.execution_options(stream_results=True)
-    result = conn.execute(qry)
+    result = conn.execute(env.query)
 
     env_selected = env.selected
     is_page_enabled = env.page.page_.enabled
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Callable, Iterator, List, Tuple
 
+import sqlalchemy as sa
 from sqlalchemy import exc
+from sqlalchemy.sql import ClauseElement
 
 from spinta import commands, exceptions, spyna
 from spinta.backends.constants import TableType
@@ -15,7 +17,7 @@ from spinta.components import Context, DataItem, DataSubItem, Model, Property, S
 from spinta.core.enums import Action
 from spinta.core.ufuncs import Expr, asttoexpr
 from spinta.types.datatype import Ref
-from spinta.utils.aiotools import adrain
+from spinta.utils.aiotools import achunks, adrain
 from spinta.utils.data import take
 from spinta.utils.nestedstruct import flat_dicts_to_nested, flatten
 
@@ -42,34 +44,43 @@ async def insert(
 
     redirect_table = backend.get_table(model, TableType.REDIRECT)
 
-    async for data in dstream:
-        try:
-            savepoint = connection.begin_nested()
-            patch = commands.before_write(context, model, backend, data=data)
-            # TODO: Refactor this to insert batches with single query.
-            qry = table.insert().values(
-                _id=patch["_id"],
-                _revision=patch["_revision"],
-                _txn=transaction.id,
-                _created=utcnow(),
-            )
-            connection.execute(qry, patch)
-            commands.after_write(context, model, backend, data=data)
-
-            # On insert remove redirect entry if _id already exists
-            remove_from_redirect(connection, redirect_table, patch["_id"])
-            savepoint.commit()
-        except exc.DatabaseError as error:
-            rollback_full = True
-            savepoint.rollback()
-            exception = create_exception(data, error)
-            error_list.append(exception)
-            data.error = exception
-            if len(error_list) >= max_error_count or stop_on_error:
+    async for chunk in achunks(dstream, config.write_batch_size, _is_flush):
+        if len(chunk) > 1 and _write_chunk(
+            connection,
+            chunk,
+            lambda: _insert_chunk(context, model, backend, table, redirect_table, chunk),
+        ):
+            for data in chunk:
                 yield data
-                savepoint_transaction_start.rollback()
-                raise exceptions.MultipleErrors(error_list)
-        yield data
+            continue
+
+        for data in chunk:
+            try:
+                savepoint = connection.begin_nested()
+                patch = commands.before_write(context, model, backend, data=data)
+                qry = table.insert().values(
+                    _id=patch["_id"],
+                    _revision=patch["_revision"],
+                    _txn=transaction.id,
+                    _created=utcnow(),
+                )
+                connection.execute(qry, patch)
+                commands.after_write(context, model, backend, data=data)
+
+                # On insert remove redirect entry if _id already exists
+                remove_from_redirect(connection, redirect_table, patch["_id"])
+                savepoint.commit()
+            except exc.DatabaseError as error:
+                rollback_full = True
+                savepoint.rollback()
+                exception = create_exception(data, error)
+                error_list.append(exception)
+                data.error = exception
+                if len(error_list) >= max_error_count or stop_on_error:
+                    yield data
+                    savepoint_transaction_start.rollback()
+                    raise exceptions.MultipleErrors(error_list)
+            yield data
 
     if rollback_full:
         savepoint_transaction_start.rollback()
@@ -96,38 +107,48 @@ async def update(
     error_list = []
     savepoint_transaction_start = connection.begin_nested()
     rollback_full = False
-    async for data in dstream:
-        if not data.patch:
-            yield data
+    async for chunk in achunks(dstream, config.write_batch_size, _is_flush):
+        if len(chunk) > 1 and _write_chunk(
+            connection,
+            chunk,
+            lambda: _update_chunk(context, model, backend, table, chunk),
+        ):
+            for data in chunk:
+                yield data
             continue
-        try:
-            savepoint = connection.begin_nested()
-            pk = data.saved["_id"]
-            patch = commands.before_write(context, model, backend, data=data)
-            result = connection.execute(
-                table.update()
-                .where(table.c._id == pk)
-                .where(table.c._revision == data.saved["_revision"])
-                .values(patch)
-            )
-            if result.rowcount == 0:
-                raise Exception(f"Update failed, {model} with {pk} not found.")
-            elif result.rowcount > 1:
-                raise Exception(f"Update failed, {model} with {pk} has found and update {result.rowcount} rows.")
-            commands.after_write(context, model, backend, data=data)
-            savepoint.commit()
-        except exc.DatabaseError as error:
-            rollback_full = True
-            savepoint.rollback()
-            exception = create_exception(data, error)
-            error_list.append(exception)
-            data.error = exception
 
-            if len(error_list) >= max_error_count:
+        for data in chunk:
+            if not data.patch:
                 yield data
-                savepoint_transaction_start.rollback()
-                raise exceptions.MultipleErrors(error_list)
-        yield data
+                continue
+            try:
+                savepoint = connection.begin_nested()
+                pk = data.saved["_id"]
+                patch = commands.before_write(context, model, backend, data=data)
+                result = connection.execute(
+                    table.update()
+                    .where(table.c._id == pk)
+                    .where(table.c._revision == data.saved["_revision"])
+                    .values(patch)
+                )
+                if result.rowcount == 0:
+                    raise Exception(f"Update failed, {model} with {pk} not found.")
+                elif result.rowcount > 1:
+                    raise Exception(f"Update failed, {model} with {pk} has found and update {result.rowcount} rows.")
+                commands.after_write(context, model, backend, data=data)
+                savepoint.commit()
+            except exc.DatabaseError as error:
+                rollback_full = True
+                savepoint.rollback()
+                exception = create_exception(data, error)
+                error_list.append(exception)
+                data.error = exception
+
+                if len(error_list) >= max_error_count:
+                    yield data
+                    savepoint_transaction_start.rollback()
+                    raise exceptions.MultipleErrors(error_list)
+            yield data
 
     if rollback_full:
         savepoint_transaction_start.rollback()
@@ -154,25 +175,35 @@ async def delete(
     error_list = []
     savepoint_transaction_start = connection.begin_nested()
     rollback_full = False
-    async for data in dstream:
-        try:
-            savepoint = connection.begin_nested()
-            commands.before_write(context, model, backend, data=data)
-            connection.execute(table.delete().where(table.c._id == data.saved["_id"]))
-            commands.after_write(context, model, backend, data=data)
-            savepoint.commit()
-        except exc.DatabaseError as error:
-            rollback_full = True
-            savepoint.rollback()
-            exception = create_exception(data, error)
-            error_list.append(exception)
-            data.error = exception
-
-            if len(error_list) >= max_error_count:
+    async for chunk in achunks(dstream, config.write_batch_size, _is_flush):
+        if len(chunk) > 1 and _write_chunk(
+            connection,
+            chunk,
+            lambda: _delete_chunk(context, model, backend, table, chunk),
+        ):
+            for data in chunk:
                 yield data
-                savepoint_transaction_start.rollback()
-                raise exceptions.MultipleErrors(error_list)
-        yield data
+            continue
+
+        for data in chunk:
+            try:
+                savepoint = connection.begin_nested()
+                commands.before_write(context, model, backend, data=data)
+                connection.execute(table.delete().where(table.c._id == data.saved["_id"]))
+                commands.after_write(context, model, backend, data=data)
+                savepoint.commit()
+            except exc.DatabaseError as error:
+                rollback_full = True
+                savepoint.rollback()
+                exception = create_exception(data, error)
+                error_list.append(exception)
+                data.error = exception
+
+                if len(error_list) >= max_error_count:
+                    yield data
+                    savepoint_transaction_start.rollback()
+                    raise exceptions.MultipleErrors(error_list)
+            yield data
 
     if rollback_full:
         savepoint_transaction_start.rollback()
@@ -180,6 +211,167 @@ async def delete(
     savepoint_transaction_start.commit()
 
 
+def _is_flush(data: DataItem) -> bool:
+    return data.flush
+
+
+def _write_chunk(
+    connection: sa.engine.Connection,
+    chunk: List[DataItem],
+    write: Callable[[], bool],
+) -> bool:
+    """Write whole chunk of data items in a single savepoint
+
+    Returns False if chunk could not be written, in that case all changes made
+    by the chunk are rolled back and data items should be written one by one,
+    in order to find out which data item caused the error.
+    """
+    # `before_write` changes patches in place, for example file content is
+    # replaced with written file blocks, so patches are restored, when data
+    # items have to be written again.
+    patches = [_copy_patch(data.patch) for data in chunk]
+    savepoint = connection.begin_nested()
+    try:
+        written = write()
+    except exc.DatabaseError:
+        written = False
+    if written:
+        savepoint.commit()
+    else:
+        savepoint.rollback()
+        for data, patch in zip(chunk, patches):
+            data.patch = patch
+    return written
+
+
+def _copy_patch(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy_patch(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_patch(v) for v in value]
+    return value
+
+
+def _split_patch(patch: dict) -> Tuple[dict, dict]:
+    # SQL expressions, like `utcnow()`, can't be passed as query parameters,
+    # they must be rendered inline.
+    params = {}
+    inline = {}
+    for key, value in patch.items():
+        if isinstance(value, ClauseElement):
+            inline[key] = value
+        else:
+            params[key] = value
+    return params, inline
+
+
+def _group_by_keys(
+    patches: List[Tuple[DataItem, dict]],
+) -> Iterator[Tuple[Tuple[str, ...], List[Tuple[DataItem, dict]]]]:
+    # Multi-row queries require all rows to have same set of columns.
+    groups = {}
+    for data, patch in patches:
+        keys = tuple(sorted(patch))
+        groups.setdefault(keys, []).append((data, patch))
+    yield from groups.items()
+
+
+def _insert_chunk(
+    context: Context,
+    model: Model,
+    backend: PostgreSQL,
+    table: sa.Table,
+    redirect_table: sa.Table,
+    chunk: List[DataItem],
+) -> bool:
+    transaction = context.get("transaction")
+    connection = transaction.connection
+
+    patches = [(data, commands.before_write(context, model, backend, data=data)) for data in chunk]
+    for _, group in _group_by_keys(patches):
+        _, inline = _split_patch(group[0][1])
+        qry = table.insert().values(**inline)
+        # psycopg2 dialect renders executemany inserts as multi-row
+        # INSERT ... VALUES statements.
+        connection.execute(qry, [_split_patch(patch)[0] for data, patch in group])
+
+    for data in chunk:
+        commands.after_write(context, model, backend, data=data)
+
+    # On insert remove redirect entries if _id already exists
+    connection.execute(redirect_table.delete().where(redirect_table.c._id.in_([patch["_id"] for _, patch in patches])))
+    return True
+
+
+def _update_chunk(
+    context: Context,
+    model: Model,
+    backend: PostgreSQL,
+    table: sa.Table,
+    chunk: List[DataItem],
+) -> bool:
+    transaction = context.get("transaction")
+    connection = transaction.connection
+
+    chunk = [data for data in chunk if data.patch]
+    patches = [(data, commands.before_write(context, model, backend, data=data)) for data in chunk]
+    for _, group in _group_by_keys(patches):
+        params, inline = _split_patch(group[0][1])
+        keys = list(params)
+        values = sa.values(
+            sa.column("_saved_id", table.c._id.type),
+            sa.column("_saved_revision", table.c._revision.type),
+            *(sa.column(key, table.c[key].type) for key in keys),
+            name="_batch",
+        ).data(
+            [
+                (
+                    data.saved["_id"],
+                    data.saved["_revision"],
+                    *(patch[key] for key in keys),
+                )
+                for data, patch in group
+            ]
+        )
+        qry = (
+            table.update()
+            .where(table.c._id == sa.cast(values.c._saved_id, table.c._id.type))
+            .where(table.c._revision == sa.cast(values.c._saved_revision, table.c._revision.type))
+            .values(
+                {
+                    **{key: sa.cast(values.c[key], table.c[key].type) for key in keys},
+                    **inline,
+                }
+            )
+        )
+        result = connection.execute(qry)
+        if result.rowcount != len(group):
+            # Let row by row update to find out, which row is missing.
+            return False
+
+    for data in chunk:
+        commands.after_write(context, model, backend, data=data)
+    return True
+
+
+def _delete_chunk(
+    context: Context,
+    model: Model,
+    backend: PostgreSQL,
+    table: sa.Table,
+    chunk: List[DataItem],
+) -> bool:
+    transaction = context.get("transaction")
+    connection = transaction.connection
+
+    for data in chunk:
+        commands.before_write(context, model, backend, data=data)
+    connection.execute(table.delete().where(table.c._id.in_([data.saved["_id"] for data in chunk])))
+    for data in chunk:
+        commands.after_write(context, model, backend, data=data)
+    return True
+
+
 def _get_data_action(data: DataSubItem | DataItem) -> Action:
     if isinstance(data, DataItem):
         return data.action
@@ -11,6 +11,7 @@ from spinta.backends.components import Backend
 from spinta.backends.constants import BackendFeatures, TableType
 from spinta.backends.helpers import get_table_identifier
 from spinta.backends.postgresql.sqlalchemy import utcnow
+from spinta.backends.postgresql.ufuncs.query.cache import QueryCache
 from spinta.components import Model, Property
 from spinta.exceptions import BackendUnavailable, MultipleRowsFound, NotFoundError
 from spinta.utils.schema import NA
@@ -21,6 +22,7 @@ class PostgreSQL(Backend):
         "name": "postgresql",
         "properties": {
             "dsn": {"type": "string", "required": True},
+            "query_cache_size": {"type": "integer"},
         },
     }
 
@@ -35,6 +37,7 @@ class PostgreSQL(Backend):
     engine: Engine = None
     schema: sa.MetaData = None
     tables: Dict[str, sa.Table] = None
+    query_cache: QueryCache = None
 
     query_builder_type = "postgresql"
     result_builder_type = "postgresql"
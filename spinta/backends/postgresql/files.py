@@ -1,6 +1,6 @@
 import io
 import uuid
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import sqlalchemy as sa
 
@@ -107,6 +107,22 @@ class DatabaseFile(io.RawIOBase):
 
         return buffer
 
+    def iter_range(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Read file content from `start` to `end` (excluded) block by block
+
+        Only one block is loaded into memory at a time.
+        """
+        end = self.size if end is None else min(end, self.size)
+        self.seek(start)
+        while self._pos < end:
+            self._read_block()
+            pos = self._pos % self.bsize
+            chunk = self._block[pos : pos + end - self._pos]
+            if not chunk:
+                break
+            self._pos += len(chunk)
+            yield chunk
+
     def write(self, b):
         self._read_block()
 
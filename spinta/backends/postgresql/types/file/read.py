@@ -1,4 +1,4 @@
-from typing import Optional, overload
+from typing import Iterator, Optional, overload
 
 from spinta import commands
 from spinta.backends.constants import BackendFeatures, TableType
@@ -82,3 +82,34 @@ def getfile(
         mode="r",
     ) as f:
         return f.read()
+
+
+@commands.iterfile.register(Context, Property, File, PostgreSQL)
+def iterfile(
+    context: Context,
+    prop: Property,
+    dtype: File,
+    backend: PostgreSQL,
+    *,
+    data: FileObjectData,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[bytes]:
+    # Connection is taken here, because returned iterator might be consumed
+    # in another thread.
+    connection = context.get("transaction").connection
+    table = backend.get_table(prop, TableType.FILE)
+    file = DatabaseFile(
+        connection,
+        table,
+        data["_size"],
+        data["_blocks"],
+        data["_bsize"],
+        mode="r",
+    )
+    return _iter_file(file, start, end)
+
+
+def _iter_file(file: DatabaseFile, start: int, end: Optional[int]) -> Iterator[bytes]:
+    with file:
+        yield from file.iter_range(start, end)
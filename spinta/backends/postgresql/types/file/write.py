@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from starlette.requests import Request
 
 from spinta import commands
@@ -63,6 +65,9 @@ async def push(
         action=action,
     )
 
+    # Check if object exists, before receiving file content.
+    data.saved = commands.getone(context, prop, dtype, prop.model.backend, id_=params.pk)
+
     if action == Action.DELETE:
         data.given = {
             prop.name: {
@@ -75,7 +80,7 @@ async def push(
         data.given = {
             prop.name: {
                 "_content_type": request.headers.get("content-type"),
-                "_content": await request.body(),
+                "_content": await _write_file(context, dtype, backend, request.stream()),
             }
         }
         data.given[prop.name]["_id"] = get_filename(request)
@@ -85,8 +90,6 @@ async def push(
 
     commands.simple_data_check(context, data, data.prop, data.model.backend)
 
-    data.saved = commands.getone(context, prop, dtype, prop.model.backend, id_=params.pk)
-
     dstream = aiter([data])
     dstream = validate_data(context, dstream)
     dstream = prepare_patch(context, dstream)
@@ -116,6 +119,30 @@ async def push(
     return render(context, request, prop, params, response, status_code=status_code)
 
 
+async def _write_file(
+    context: Context,
+    dtype: File,
+    backend: PostgreSQL,
+    stream: AsyncIterator[bytes],
+) -> DatabaseFile:
+    # Uploaded content is written to file blocks as it is received, only
+    # written file is passed further and saved to the model in before_write.
+    transaction = context.get("transaction")
+    table = backend.get_table(dtype.prop, TableType.FILE)
+    with DatabaseFile(transaction.connection, table, mode="w") as f:
+        # Writing a partial block stores a new copy of the block, so content
+        # is buffered and written in full blocks.
+        buffer = bytearray()
+        async for chunk in stream:
+            buffer += chunk
+            while len(buffer) >= f.bsize:
+                f.write(bytes(buffer[: f.bsize]))
+                del buffer[: f.bsize]
+        if buffer or not f.blocks:
+            f.write(bytes(buffer))
+    return f
+
+
 @commands.before_write.register(Context, File, PostgreSQL)
 def before_write(
     context: Context,
@@ -125,7 +152,13 @@ def before_write(
     data: DataSubItem,
 ):
     content = take("_content", data.patch)
-    if isinstance(content, bytes) and isinstance(dtype.backend, PostgreSQL):
+    if isinstance(content, DatabaseFile):
+        # File content is already written by push.
+        del data.patch["_content"]
+        data.patch["_size"] = content.size
+        data.patch["_blocks"] = content.blocks
+        data.patch["_bsize"] = content.bsize
+    elif isinstance(content, bytes) and isinstance(dtype.backend, PostgreSQL):
         transaction = context.get("transaction")
         connection = transaction.connection
         prop = dtype.prop
@@ -0,0 +1,341 @@
+"""Cache of built PostgreSQL `getall` queries
+
+Building a query walks the whole ufunc resolver tree, but many requests differ
+only in literal values given in the URL query. Built queries are cached by
+model and query shape, literal values are lifted out of the query and bound to
+the cached statement as bind parameters.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import datetime
+import decimal
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+
+from spinta.components import Context, Model, Page
+from spinta.core.ufuncs import Expr, NoOp, Unresolved
+from spinta.ufuncs.querybuilder.components import QueryPage, QueryParams, Selected
+from spinta.utils.schema import NA
+
+if TYPE_CHECKING:
+    from spinta.backends.postgresql.components import PostgreSQL
+
+log = logging.getLogger(__name__)
+
+
+class _LiftedStr(str):
+    index: int
+
+
+class _LiftedInt(int):
+    index: int
+
+
+class _LiftedFloat(float):
+    index: int
+
+
+_LIFTED = {
+    str: _LiftedStr,
+    int: _LiftedInt,
+    float: _LiftedFloat,
+}
+
+_LIFTED_TYPES = tuple(_LIFTED.values())
+
+# Values of these types are not lifted, but are used as part of query shape.
+_CONSTANT_TYPES = (
+    type(None),
+    bool,
+    datetime.date,
+    datetime.time,
+    datetime.datetime,
+    decimal.Decimal,
+    uuid.UUID,
+)
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class CompiledQuery:
+    query: sa.sql.Select
+    selected: Dict[str, Selected]
+    page: QueryPage
+    model: Model
+
+
+@dataclasses.dataclass
+class _Entry:
+    compiled: CompiledQuery
+    # Bind parameter keys and indexes of lifted literals bound to them.
+    binds: List[Tuple[str, int]]
+    # SQLAlchemy cache key of the statement and values of bind parameters,
+    # that are not lifted literals.
+    sql_key: Any
+    constants: List[Any]
+    selected: List[tuple]
+    literals: List[Any]
+    # Entry is used only after it was verified, that the query built with
+    # different literal values has exactly the same shape.
+    verified: bool = False
+    cacheable: bool = True
+
+
+class QueryCache:
+    size: int
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, size: int = 1000):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: tuple, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def build_query(
+    context: Context,
+    backend: PostgreSQL,
+    model: Model,
+    query: Optional[Expr],
+    params: Optional[QueryParams],
+) -> CompiledQuery:
+    cache: Optional[QueryCache] = backend.query_cache
+    if cache is None or not cache.size:
+        return _build(context, backend, model, query, params)
+
+    literals = []
+    try:
+        shape, lifted = _lift(query, literals)
+        key = (id(model), shape, _params_shape(params), _token_shape(context))
+    except _Uncacheable:
+        return _build(context, backend, model, query, params)
+
+    entry = cache.get(key)
+    if entry is not None and entry.compiled.model is not model:
+        # Model was reloaded and the same id was reused.
+        entry = None
+
+    if entry is not None and entry.verified:
+        cache.hits += 1
+        return _bind(entry, literals)
+
+    cache.misses += 1
+    compiled = _build(context, backend, model, lifted, params)
+    new = _analyze(compiled, literals)
+    if entry is None:
+        cache.set(key, new)
+    elif entry.cacheable and new.cacheable and _same_shape(entry, new):
+        if all(_differ(a, b) for a, b in zip(entry.literals, literals)):
+            new.verified = True
+            cache.set(key, new)
+    elif entry.cacheable:
+        log.debug("Query of %s model can't be cached.", model.name)
+        new.cacheable = False
+        cache.set(key, new)
+    return _bind(new, literals)
+
+
+def _build(
+    context: Context,
+    backend: PostgreSQL,
+    model: Model,
+    query: Optional[Expr],
+    params: Optional[QueryParams],
+) -> CompiledQuery:
+    builder = backend.query_builder_class(context)
+    builder.update(model=model)
+    table = backend.get_table(model)
+    env = builder.init(backend, table, params)
+    expr = env.resolve(query)
+    where = env.execute(expr)
+    qry = env.build(where)
+    return CompiledQuery(query=qry, selected=env.selected, page=env.page, model=model)
+
+
+def _bind(entry: _Entry, literals: List[Any]) -> CompiledQuery:
+    if not entry.binds:
+        return entry.compiled
+    qry = entry.compiled.query.params({key: literals[index] for key, index in entry.binds})
+    return dataclasses.replace(entry.compiled, query=qry)
+
+
+def _analyze(compiled: CompiledQuery, literals: List[Any]) -> _Entry:
+    entry = _Entry(
+        compiled=compiled,
+        binds=[],
+        sql_key=None,
+        constants=[],
+        selected=_selected_shape(compiled.selected),
+        literals=literals,
+    )
+    cache_key = compiled.query._generate_cache_key()
+    if cache_key is None:
+        entry.cacheable = False
+        return entry
+
+    entry.sql_key = cache_key.key
+    for bind in cache_key.bindparams:
+        if isinstance(bind.value, _LIFTED_TYPES):
+            entry.binds.append((bind.key, bind.value.index))
+        else:
+            entry.constants.append(bind.value)
+
+    # Literal, that is not used as is, was converted to something else and can't
+    # be replaced.
+    if {index for _, index in entry.binds} != set(range(len(literals))):
+        entry.cacheable = False
+    return entry
+
+
+def _same_shape(a: _Entry, b: _Entry) -> bool:
+    try:
+        return (
+            a.sql_key == b.sql_key
+            and [i for _, i in a.binds] == [i for _, i in b.binds]
+            and a.constants == b.constants
+            and a.selected == b.selected
+        )
+    except Exception:
+        return False
+
+
+def _differ(a: Any, b: Any) -> bool:
+    return a != b and str(a) != str(b)
+
+
+def _selected_shape(selected: Optional[Dict[str, Selected]]) -> List[tuple]:
+    if not selected:
+        return []
+    return [
+        (key, sel.item, sel.prop.place if sel.prop else None, repr(sel.prep)) if sel else (key, None)
+        for key, sel in selected.items()
+    ]
+
+
+def _lift(value: Any, literals: List[Any]) -> Tuple[Any, Any]:
+    """Replace literal values with their lifted copies
+
+    Returns a hashable shape of the value and the value with lifted literals.
+    """
+    if type(value) is str and not value:
+        # Empty strings are rejected by some resolvers, for example in
+        # `contains(name, "")`, so they are part of a shape and a query with an
+        # empty string is always resolved.
+        return (type(value).__name__, value), value
+
+    if type(value) in _LIFTED:
+        lifted = _LIFTED[type(value)](value)
+        lifted.index = len(literals)
+        literals.append(value)
+        return type(value).__name__, lifted
+
+    if value is NA or isinstance(value, _CONSTANT_TYPES):
+        return (type(value).__name__, value), value
+
+    if isinstance(value, NoOp):
+        return (type(value).__name__,), value
+
+    if isinstance(value, Expr):
+        if value.name == "bind" or (not value.args and not value.kwargs):
+            # Property names are part of a shape.
+            return (type(value).__name__, value.name, repr(value)), value
+        args = [_lift(arg, literals) for arg in value.args]
+        kwargs = {k: _lift(v, literals) for k, v in value.kwargs.items()}
+        shape = (
+            type(value).__name__,
+            value.name,
+            tuple(s for s, _ in args),
+            tuple((k, s) for k, (s, _) in kwargs.items()),
+        )
+        return shape, type(value)(value.name, *(v for _, v in args), **{k: v for k, (_, v) in kwargs.items()})
+
+    if isinstance(value, Unresolved):
+        # Names of properties and other unresolved names are part of a shape.
+        return (type(value).__name__, repr(value), str(value)), value
+
+    if isinstance(value, (list, tuple)):
+        items = [_lift(v, literals) for v in value]
+        return (type(value).__name__, tuple(s for s, _ in items)), type(value)(v for _, v in items)
+
+    if isinstance(value, Page):
+        page = copy.deepcopy(value)
+        by = []
+        for key, page_by in page.by.items():
+            shape, page_by.value = _lift(page_by.value, literals)
+            by.append((key, page_by.prop.place if page_by.prop else None, shape))
+        shape = ("page", page.enabled, page.filter_only, page.size, page.first_time, tuple(by))
+        return shape, page
+
+    raise _Uncacheable(value)
+
+
+def _params_shape(params: Optional[QueryParams]) -> tuple:
+    if params is None:
+        return ()
+    return (
+        params.prioritize_uri,
+        tuple(params.lang_priority or ()),
+        _lift(params.expand, [])[0],
+        params.default_expand,
+        tuple(params.lang or ()),
+        params.push,
+        repr(params.url_params),
+    )
+
+
+def _token_shape(context: Context) -> tuple:
+    # Selected properties depend on client and scopes given to it.
+    if not context.has("auth.token"):
+        return ()
+    token = context.get("auth.token")
+    try:
+        scope = token.get_scope()
+    except NotImplementedError:
+        scope = None
+    return (
+        type(token).__name__,
+        token.get_client_id(),
+        token.get_sub(),
+        scope,
+    )
@@ -1,6 +1,7 @@
+import pathlib
 from typing import List, Optional
 
-from typer import Argument, Option, echo
+from typer import Argument, Exit, Option, echo
 from typer import Context as TyperContext
 
 from spinta import commands
@@ -8,7 +9,7 @@ from spinta.cli.helpers.manifest import convert_str_to_manifest_path
 from spinta.cli.helpers.store import prepare_manifest
 from spinta.components import Context, Store
 from spinta.core.config import KeyFormat
-from spinta.core.context import configure_context
+from spinta.core.context import configure_context, get_commands_index_path, write_commands_index
 from spinta.core.enums import Mode
 
 
@@ -47,3 +48,30 @@ def check(
         handler.post_process()
     else:
         echo("OK")
+
+
+def index_commands(
+    ctx: TyperContext,
+    output: Optional[pathlib.Path] = Option(
+        None,
+        "-o",
+        "--output",
+        help="Index file path, by default `commands.index` configuration value is used.",
+    ),
+):
+    """Build index of modules registering commands
+
+    With the index, on startup only modules defining commands and ufuncs are
+    imported, other modules are imported on first use of their commands.
+    Modules changed after the index was built are imported on startup, run
+    this command again after upgrading spinta.
+    """
+    context = configure_context(ctx.obj)
+    rc = context.get("rc")
+    output = output or get_commands_index_path(rc)
+    if output is None:
+        echo("Commands index is disabled, set `commands.index` or use --output.", err=True)
+        raise Exit(code=1)
+    index = write_commands_index(rc.get("commands", "modules", cast=list), output)
+    lazy = sum(bool(entry["commands"]) for entry in index["modules"].values())
+    echo(f"Indexed {len(index['modules'])} modules, {lazy} of them are imported on first use: {output}")
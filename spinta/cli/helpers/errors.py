@@ -1,13 +1,19 @@
+import threading
+
+
 class ErrorCounter:
     count: int
     max_error_count: int
 
     def __init__(self, max_count: int):
         self.max_error_count = max_count
+        # Errors can be counted from several push worker threads.
+        self._lock = threading.Lock()
         self.reset()
 
     def increase(self):
-        self.count += 1
+        with self._lock:
+            self.count += 1
 
     def reset(self):
         self.count = 0
@@ -1,15 +1,18 @@
+import contextlib
 import datetime
 import itertools
 import json
-from typing import Iterable, Iterator, List, Tuple
+from typing import ContextManager, Dict, Iterable, Iterator, List, Tuple
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
 
 from spinta import spyna
 from spinta.cli.helpers.push import prepare_data_for_push_state
 from spinta.cli.helpers.push.components import PushRow, Saved
 from spinta.cli.helpers.push.utils import get_data_checksum
 from spinta.components import Context, Model, pagination_enabled
+from spinta.utils.itertools import chunks
 from spinta.utils.json import fix_data_for_json
 from spinta.utils.sqlite import migrate_table
 
@@ -84,108 +87,161 @@ def reset_pushed(
         conn.execute(table.update().values(pushed=None))
 
 
-def check_push_state(context: Context, rows: Iterable[PushRow], metadata: sa.MetaData):
+# Number of rows looked up in push state with a single query.
+STATE_BATCH_SIZE = 1000
+
+
+def check_push_state(
+    context: Context,
+    rows: Iterable[PushRow],
+    metadata: sa.MetaData,
+    batch_size: int = STATE_BATCH_SIZE,
+):
     conn = context.get("push.state.conn")
 
     for model_type, group in itertools.groupby(rows, key=_get_model_type):
-        saved_rows = {}
-        if model_type:
-            table = metadata.tables[model_type]
-
-            query = sa.select([table.c.id, table.c.revision, table.c.checksum])
-            saved_rows = {
-                state[table.c.id]: Saved(
-                    state[table.c.revision],
-                    state[table.c.checksum],
-                )
-                for state in conn.execute(query)
-            }
-
-        for row in group:
-            if row.send and not row.error and row.op != "delete":
-                _id = row.data["_id"]
-                row.checksum = get_data_checksum(row.data, row.model)
-                saved = saved_rows.get(_id)
-                if saved is None:
-                    row.op = "insert"
-                    row.saved = False
-                else:
-                    row.op = "patch"
-                    row.saved = True
-                    row.data["_revision"] = saved.revision
-                    if saved.checksum == row.checksum:
-                        conn.execute(table.update().where(table.c.id == _id).values(pushed=datetime.datetime.now()))
-                        # Skip if no changes, but only if not paginated, since pagination already skips those
-                        if "_page" not in row.data:
-                            continue
-
-            yield row
+        if not model_type:
+            yield from group
+            continue
+
+        table = metadata.tables[model_type]
+
+        # Push state is read in batches of ids, in order to not load whole
+        # state table into memory.
+        for batch in chunks(group, batch_size):
+            ids = [row.data["_id"] for row in batch if _needs_push_state(row)]
+            saved_rows = _read_saved_rows(conn, table, ids)
+
+            unchanged = []
+            ready = []
+            for row in batch:
+                if _needs_push_state(row):
+                    _id = row.data["_id"]
+                    row.checksum = get_data_checksum(row.data, row.model)
+                    saved = saved_rows.get(_id)
+                    if saved is None:
+                        row.op = "insert"
+                        row.saved = False
+                    else:
+                        row.op = "patch"
+                        row.saved = True
+                        row.data["_revision"] = saved.revision
+                        if saved.checksum == row.checksum:
+                            unchanged.append(_id)
+                            # Skip if no changes, but only if not paginated, since pagination already skips those
+                            if "_page" not in row.data:
+                                continue
+                ready.append(row)
+
+            if unchanged:
+                conn.execute(table.update().where(table.c.id.in_(unchanged)).values(pushed=datetime.datetime.now()))
+
+            yield from ready
+
+
+def _needs_push_state(row: PushRow) -> bool:
+    return row.send and not row.error and row.op != "delete"
+
+
+def _read_saved_rows(
+    conn: sa.engine.Connection,
+    table: sa.Table,
+    ids: List[str],
+) -> Dict[str, Saved]:
+    if not ids:
+        return {}
+    query = sa.select([table.c.id, table.c.revision, table.c.checksum]).where(table.c.id.in_(ids))
+    return {
+        state[table.c.id]: Saved(
+            state[table.c.revision],
+            state[table.c.checksum],
+        )
+        for state in conn.execute(query)
+    }
 
 
 def save_push_state(
     context: Context,
-    rows: Iterable[PushRow],
+    chunks: Iterable[List[PushRow]],
     metadata: sa.MetaData,
 ) -> Iterator[PushRow]:
     conn = context.get("push.state.conn")
     page_table = metadata.tables["_page"]
     model_pagination_check = {}
-    for row in rows:
-        table = metadata.tables[row.data["_type"]]
-        model_name = row.model.model_type()
-        if model_name not in model_pagination_check:
-            model_pagination_check[model_name] = pagination_enabled(row.model)
-
-        if model_pagination_check[model_name] and "_page" in row.data:
-            loaded = row.data["_page"]
-            page = {prop.name: loaded[i] for i, prop in enumerate(row.model.page.keys.values())}
-            page = prepare_data_for_push_state(context, row.model, page)
-            save_page_values(conn=conn, table=page_table, model=row.model, page_data=page)
-            page = {f"page.{key}": value for key, value in page.items()}
-            row.data.pop("_page")
-        else:
-            page = {}
-
-        if row.error and row.op != "delete":
-            data = fix_data_for_json(row.data)
-            data = json.dumps(data)
-        else:
-            data = None
-
-        if "_id" in row.data:
-            _id = row.data["_id"]
-        else:
-            _id = spyna.parse(row.data["_where"])["args"][1]
-
-        if row.op == "delete" and not row.error:
-            conn.execute(table.delete().where(table.c.id == _id))
-        elif row.saved:
-            conn.execute(
-                table.update()
-                .where(table.c.id == _id)
-                .values(
-                    id=_id,
-                    revision=row.data.get("_revision"),
-                    checksum=row.checksum,
-                    pushed=datetime.datetime.now(),
-                    error=row.error,
-                    data=data,
-                    **page,
-                )
-            )
-        else:
-            conn.execute(
-                table.insert().values(
-                    id=_id,
-                    revision=row.data.get("_revision"),
-                    checksum=row.checksum,
-                    pushed=datetime.datetime.now(),
-                    error=row.error,
-                    data=data,
+    for chunk in chunks:
+        writes: List[Tuple[Tuple[str, str, Tuple[str, ...]], dict]] = []
+        # Last page value of each model in this chunk.
+        pages: Dict[str, Tuple[Model, dict]] = {}
+        for row in chunk:
+            model_name = row.model.model_type()
+            if model_name not in model_pagination_check:
+                model_pagination_check[model_name] = pagination_enabled(row.model)
+
+            if model_pagination_check[model_name] and "_page" in row.data:
+                loaded = row.data["_page"]
+                page = {prop.name: loaded[i] for i, prop in enumerate(row.model.page.keys.values())}
+                page = prepare_data_for_push_state(context, row.model, page)
+                pages[model_name] = (row.model, page)
+                page = {f"page.{key}": value for key, value in page.items()}
+                row.data.pop("_page")
+            else:
+                page = {}
+
+            if row.error and row.op != "delete":
+                data = fix_data_for_json(row.data)
+                data = json.dumps(data)
+            else:
+                data = None
+
+            if "_id" in row.data:
+                _id = row.data["_id"]
+            else:
+                _id = spyna.parse(row.data["_where"])["args"][1]
+
+            if row.op == "delete" and not row.error:
+                op = "delete"
+                values = {"id": _id}
+            else:
+                op = "upsert"
+                values = {
+                    "id": _id,
+                    "revision": row.data.get("_revision"),
+                    "checksum": row.checksum,
+                    "pushed": datetime.datetime.now(),
+                    "error": row.error,
+                    "data": data,
                     **page,
-                )
-            )
-        yield row
+                }
+            writes.append(((op, row.data["_type"], tuple(values)), values))
+
+        # Whole chunk is written in a single transaction, so after a crash,
+        # push is resumed from the last fully saved chunk.
+        with _begin(conn):
+            # Consecutive statements of the same kind are written using a
+            # single executemany call.
+            for (op, table_name, keys), group in itertools.groupby(writes, key=lambda w: w[0]):
+                values = [v for _, v in group]
+                table = metadata.tables[table_name]
+                if op == "delete":
+                    conn.execute(table.delete().where(table.c.id.in_([v["id"] for v in values])))
+                else:
+                    qry = sqlite.insert(table)
+                    qry = qry.on_conflict_do_update(
+                        index_elements=[table.c.id],
+                        set_={key: qry.excluded[key] for key in keys if key != "id"},
+                    )
+                    conn.execute(qry, values)
+            for model, page in pages.values():
+                save_page_values(conn=conn, table=page_table, model=model, page_data=page)
+
+        yield from chunk
+
+
+def _begin(conn: sa.engine.Connection) -> ContextManager:
+    if conn.in_transaction():
+        # Connection is already in a transaction, managed by the caller.
+        return contextlib.nullcontext()
+    return conn.begin()
 
 
 def save_page_values(conn: sa.engine.Connection, table: sa.Table, model: Model, page_data: dict):
@@ -2,9 +2,12 @@ import itertools
 import json
 import textwrap
 import time
+import urllib.parse
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import copy
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import pprintpp
 import requests
@@ -20,6 +23,7 @@ from spinta.cli.helpers.push.state import check_push_state, save_push_state
 from spinta.cli.helpers.push.utils import get_data_checksum
 from spinta.components import Context, Model
 from spinta.core.ufuncs import asttoexpr
+from spinta.types.datatype import Ref
 from spinta.utils.json import fix_data_for_json
 
 
@@ -46,6 +50,14 @@ def _prepare_rows_for_push(rows: Iterable[PushRow]) -> Iterator[PushRow]:
         yield row
 
 
+# Number of errored rows checked on the target server with a single request.
+ERROR_ROWS_BATCH_SIZE = 100
+
+# Maximum length of a request URL used to check errored rows, many servers
+# and proxies reject longer URLs.
+ERROR_ROWS_MAX_URL_LENGTH = 2000
+
+
 def prepare_rows_with_errors(
     client: requests.Session,
     server: str,
@@ -55,49 +67,124 @@ def prepare_rows_with_errors(
     table: sa.Table,
     timeout: Tuple[float, float],
     error_counter: ErrorCounter = None,
+    batch_size: int = ERROR_ROWS_BATCH_SIZE,
+    max_url_length: int = ERROR_ROWS_MAX_URL_LENGTH,
 ) -> Iterable[ModelRow]:
     conn = context.get("push.state.conn")
-    for row in rows:
-        type = model.model_type()
-        _id = row[table.c.id]
-        checksum = row[table.c.checksum]
-        data = json.loads(row[table.c.data]) if row[table.c.data] else {}
-
+    type = model.model_type()
+    for batch in _iter_error_row_batches(server, type, rows, table, batch_size, max_url_length):
         status_code, resp = send_request(
             client,
-            f"{server}/{type}/{_id}",
+            _build_error_rows_url(server, type, [row[table.c.id] for row in batch]),
             "GET",
             rows=[],
             data="",
-            ignore_errors=[404],
             error_counter=error_counter,
             timeout=timeout,
         )
-
-        if status_code == 200:
-            # Was deleted on local server, but found on target server,
-            # which means we need to delete it
-            if not data:
-                yield prepare_rows_for_deletion(model, _id, error=True)
-            # Was inserted or updated without errors
-            elif checksum == get_data_checksum(resp, model):
-                conn.execute(
-                    table.update().where((table.c.id == _id)).values(revision=resp["_revision"], error=False, data=None)
+        if status_code != 200:
+            continue
+
+        found = {item["_id"]: item for item in resp["_data"]}
+        verified = []
+        deleted = []
+        ready = []
+        for row in batch:
+            _id = row[table.c.id]
+            checksum = row[table.c.checksum]
+            data = json.loads(row[table.c.data]) if row[table.c.data] else {}
+
+            if _id not in found:
+                # Moved rows are only found by following a redirect of the
+                # row itself.
+                status_code, resp = send_request(
+                    client,
+                    f"{server}/{type}/{_id}",
+                    "GET",
+                    rows=[],
+                    data="",
+                    ignore_errors=[404],
+                    error_counter=error_counter,
+                    timeout=timeout,
                 )
-                yield PushRow(model, {"_type": type}, send=False)
+                if status_code == 200:
+                    found[_id] = resp
+                elif status_code != 404:
+                    continue
+
+            if _id in found:
+                resp = found[_id]
+                # Was deleted on local server, but found on target server,
+                # which means we need to delete it
+                if not data:
+                    ready.append(prepare_rows_for_deletion(model, _id, error=True))
+                # Was inserted or updated without errors
+                elif checksum == get_data_checksum(resp, model):
+                    verified.append({"_id": _id, "_revision": resp["_revision"]})
+                    ready.append(PushRow(model, {"_type": type}, send=False))
                 # Need to push again
+                else:
+                    data["_revision"] = resp["_revision"]
+                    ready.append(PushRow(model, data, checksum=checksum, saved=True, op="patch", error=True))
+
             else:
-                data["_revision"] = resp["_revision"]
-                yield PushRow(model, data, checksum=checksum, saved=True, op="patch", error=True)
-
-        elif status_code == 404:
-            # Was deleted on both - local and target servers
-            if not data:
-                conn.execute(table.delete().where((table.c.id == _id)))
-                yield PushRow(model, {"_type": type}, send=False)
-            # Need to push again
-            else:
-                yield PushRow(model, data, checksum=checksum, saved=True, op="insert", error=True)
+                # Was deleted on both - local and target servers
+                if not data:
+                    deleted.append(_id)
+                    ready.append(PushRow(model, {"_type": type}, send=False))
+                # Need to push again
+                else:
+                    ready.append(PushRow(model, data, checksum=checksum, saved=True, op="insert", error=True))
+
+        if verified:
+            conn.execute(
+                table.update()
+                .where(table.c.id == sa.bindparam("_id"))
+                .values(revision=sa.bindparam("_revision"), error=False, data=None),
+                verified,
+            )
+        if deleted:
+            conn.execute(table.delete().where(table.c.id.in_(deleted)))
+
+        yield from ready
+
+
+def _iter_error_row_batches(
+    server: str,
+    model: str,
+    rows: Iterable[sa.engine.Row],
+    table: sa.Table,
+    batch_size: int,
+    max_url_length: int,
+) -> Iterator[List[sa.engine.Row]]:
+    # Rows are added to a batch, while all their ids fit into a single URL.
+    base = len(_build_error_rows_url(server, model, []))
+    batch = []
+    length = base
+    for row in rows:
+        size = len(_quote_query(", " + spyna.unparse(row[table.c.id])))
+        if batch and (len(batch) >= batch_size or length + size > max_url_length):
+            yield batch
+            batch = []
+            length = base
+        batch.append(row)
+        length += size
+    if batch:
+        yield batch
+
+
+def _build_error_rows_url(server: str, model: str, ids: List[str]) -> str:
+    query = spyna.unparse(
+        {
+            "name": "any",
+            "args": ["eq", {"name": "bind", "args": ["_id"]}, *ids],
+        }
+    )
+    return f"{server}/{model}?format(json)&{_quote_query(query)}"
+
+
+def _quote_query(query: str) -> str:
+    return urllib.parse.quote(query, safe="(),")
 
 
 def prepare_rows_for_deletion(model: Model, _id: str, error: bool = False):
@@ -147,7 +234,51 @@ def _push_to_remote_spinta(
     dry_run: bool = False,
     stop_on_error: bool = False,
     error_counter: ErrorCounter = None,
-) -> Iterator[PushRow]:
+    workers: int = 1,
+    inflight: Optional[int] = None,
+) -> Iterator[List[PushRow]]:
+    # Yields rows grouped by sent chunks, so that push state of a whole chunk
+    # could be saved at once.
+    chunks = _iter_push_chunks(rows, chunk_size, error_counter)
+    if workers > 1:
+        yield from _send_and_receive_concurrently(
+            client,
+            server,
+            chunks,
+            workers=workers,
+            inflight=inflight or workers,
+            dry_run=dry_run,
+            stop_on_error=stop_on_error,
+            error_counter=error_counter,
+            timeout=timeout,
+        )
+    else:
+        for ready, data in chunks:
+            if ready:
+                yield list(
+                    _send_and_receive(
+                        client,
+                        server,
+                        ready,
+                        data,
+                        dry_run=dry_run,
+                        stop_on_error=stop_on_error,
+                        error_counter=error_counter,
+                        timeout=timeout,
+                    )
+                )
+
+
+def _iter_push_chunks(
+    rows: Iterable[PushRow],
+    chunk_size: int,
+    error_counter: ErrorCounter = None,
+) -> Iterator[Tuple[List[PushRow], str]]:
+    """Group rows into JSON encoded chunks of given size in bytes
+
+    Yields (rows, data) pairs. An empty list of rows means, that all chunks
+    yielded so far must be pushed before continuing (PUSH_NOW).
+    """
     prefix = '{"_data":['
     suffix = "]}"
     slen = len(suffix)
@@ -167,18 +298,11 @@ def _push_to_remote_spinta(
         data = json.dumps(tmp, ensure_ascii=False)
 
         if ready and (len(chunk) + len(data) + slen > chunk_size or row.push):
-            yield from _send_and_receive(
-                client,
-                server,
-                ready,
-                chunk + suffix,
-                dry_run=dry_run,
-                stop_on_error=stop_on_error,
-                error_counter=error_counter,
-                timeout=timeout,
-            )
+            yield ready, chunk + suffix
             chunk = prefix
             ready = []
+        if row.push:
+            yield [], ""
         if not row.push and row.send:
             chunk += ("," if ready else "") + data
             ready.append(row)
@@ -186,27 +310,9 @@ def _push_to_remote_spinta(
     if ready:
         if error_counter:
             if not error_counter.has_reached_max():
-                yield from _send_and_receive(
-                    client,
-                    server,
-                    ready,
-                    chunk + suffix,
-                    dry_run=dry_run,
-                    stop_on_error=stop_on_error,
-                    error_counter=error_counter,
-                    timeout=timeout,
-                )
+                yield ready, chunk + suffix
         else:
-            yield from _send_and_receive(
-                client,
-                server,
-                ready,
-                chunk + suffix,
-                dry_run=dry_run,
-                stop_on_error=stop_on_error,
-                error_counter=error_counter,
-                timeout=timeout,
-            )
+            yield ready, chunk + suffix
 
 
 def _send_and_receive(
@@ -220,6 +326,30 @@ def _send_and_receive(
     stop_on_error: bool = False,
     error_counter: ErrorCounter = None,
 ) -> Iterator[PushRow]:
+    recv = _send_chunk(
+        client,
+        server,
+        rows,
+        data,
+        dry_run=dry_run,
+        stop_on_error=stop_on_error,
+        error_counter=error_counter,
+        timeout=timeout,
+    )
+    yield from _map_sent_and_recv(rows, recv)
+
+
+def _send_chunk(
+    client: requests.Session,
+    server: str,
+    rows: List[PushRow],
+    data: str,
+    timeout: Tuple[float, float],
+    *,
+    dry_run: bool = False,
+    stop_on_error: bool = False,
+    error_counter: ErrorCounter = None,
+) -> Optional[List[Dict[str, Any]]]:
     if dry_run:
         recv = _send_data_dry_run(data)
     else:
@@ -235,7 +365,69 @@ def _send_and_receive(
         )
         if recv:
             recv = recv["_data"]
-    yield from _map_sent_and_recv(rows, recv)
+    return recv
+
+
+def _send_and_receive_concurrently(
+    client: requests.Session,
+    server: str,
+    chunks: Iterator[Tuple[List[PushRow], str]],
+    timeout: Tuple[float, float],
+    *,
+    workers: int,
+    inflight: int,
+    dry_run: bool = False,
+    stop_on_error: bool = False,
+    error_counter: ErrorCounter = None,
+) -> Iterator[List[PushRow]]:
+    """Keep up to `inflight` chunks in flight using `workers` threads
+
+    Chunks are read and encoded in the calling thread, while previous chunks
+    are being sent. Received results are yielded strictly in the same order
+    as chunks were read, so push state is saved in the same order as with
+    sequential push.
+
+    Chunks of different models are not sent concurrently, because a model
+    might reference objects of previous models, which must be saved on the
+    target server first. Same applies to chunks of self-referencing models.
+    """
+    pending: Deque[Tuple[List[PushRow], Future]] = deque()
+    models: Set[str] = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for ready, data in chunks:
+            chunk_models = {row.model.name: row.model for row in ready}
+            wait = (
+                not ready
+                or set(chunk_models) != models
+                or len(models) > 1
+                or any(_is_self_referencing(model) for model in chunk_models.values())
+            )
+            while pending and (wait or len(pending) >= inflight):
+                sent, future = pending.popleft()
+                yield list(_map_sent_and_recv(sent, future.result()))
+            if not ready:
+                continue
+            models = set(chunk_models)
+            future = executor.submit(
+                _send_chunk,
+                client,
+                server,
+                ready,
+                data,
+                dry_run=dry_run,
+                stop_on_error=stop_on_error,
+                error_counter=error_counter,
+                timeout=timeout,
+            )
+            pending.append((ready, future))
+
+        while pending:
+            sent, future = pending.popleft()
+            yield list(_map_sent_and_recv(sent, future.result()))
+
+
+def _is_self_referencing(model: Model) -> bool:
+    return any(isinstance(prop.dtype, Ref) and prop.dtype.model is model for prop in model.flatprops.values())
 
 
 def _send_data_dry_run(
@@ -396,6 +588,8 @@ def push(
     dry_run: bool = False,  # do not send or write anything
     stop_on_error: bool = False,  # raise error immediately
     error_counter: ErrorCounter = None,
+    workers: int = 1,  # number of threads sending chunks concurrently
+    inflight: Optional[int] = None,  # max number of chunks sent, but not yet saved
 ) -> None:
     if stop_time:
         rows = _add_stop_time(rows, stop_time)
@@ -408,11 +602,21 @@ def push(
     if stop_row:
         rows = itertools.islice(rows, stop_row)
 
-    rows = _push_to_remote_spinta(
-        client, server, rows, chunk_size, dry_run=dry_run, error_counter=error_counter, timeout=timeout
+    chunks = _push_to_remote_spinta(
+        client,
+        server,
+        rows,
+        chunk_size,
+        dry_run=dry_run,
+        error_counter=error_counter,
+        timeout=timeout,
+        workers=workers,
+        inflight=inflight,
     )
     if state and not dry_run:
-        rows = save_push_state(context, rows, state.metadata)
+        rows = save_push_state(context, chunks, state.metadata)
+    else:
+        rows = itertools.chain.from_iterable(chunks)
 
     _push_rows(rows, stop_on_error, error_counter)
 
@@ -25,6 +25,7 @@ app = Typer()
 
 add(app, "config", config.config, short_help="Show current configuration values")
 add(app, "check", config.check, short_help="Check configuration and manifests")
+add(app, "index-commands", config.index_commands, short_help="Build index of modules registering commands")
 
 add(app, "key", auth.key, short_help="Manage client token validation keys")
 add(app, "token", auth.token, short_help="Tools for encoding/decode auth tokens")
@@ -50,6 +51,7 @@ add(app, "push", push.push, short_help="Push data into an external data store")
 
 add(app, "run", server.run, short_help="Run development server")
 add(app, "wait", server.wait, short_help="Wait while all backends are up")
+add(app, "refresh-schema", server.refresh_schema, short_help="Update schema cache of sql backends")
 
 add(app, "upgrade", upgrade, short_help="Run upgrade scripts")
 add(app, "admin", admin, short_help="Run admin scripts")
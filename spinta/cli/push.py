@@ -84,6 +84,16 @@ def push(
         help=("Timeout for reading a response, default: 5 minutes (300s). The value is in seconds."),
     ),
     connect_timeout: float = Option(5, "--connect-timeout", help=("Timeout for connecting, default: 5 seconds.")),
+    workers: int = Option(
+        1,
+        "--workers",
+        help=("Number of threads sending chunks to the target server concurrently, default: 1."),
+    ),
+    inflight: int = Option(
+        None,
+        "--inflight",
+        help=("Maximum number of chunks sent, but not yet saved to push state, default: same as --workers."),
+    ),
 ):
     """Push data to external data store"""
     synchronize_keymap = synchronize
@@ -125,6 +135,10 @@ def push(
     token = get_access_token(creds)
 
     client = requests.Session()
+    if workers > 1:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=workers)
+        client.mount("http://", adapter)
+        client.mount("https://", adapter)
     client.headers["Content-Type"] = "application/json"
     client.headers["Authorization"] = f"Bearer {token}"
 
@@ -219,6 +233,8 @@ def push(
             stop_on_error=stop_on_error,
             error_counter=error_counter,
             timeout=(connect_timeout, read_timeout),
+            workers=workers,
+            inflight=inflight,
         )
 
         if error_counter.has_errors():
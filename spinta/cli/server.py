@@ -49,3 +49,24 @@ def wait(
     store = load_store(context)
     if not commands.wait(context, store, seconds=seconds, verbose=True):
         raise Exit(code=1)
+
+
+def refresh_schema(
+    ctx: TyperContext,
+    manifests: Optional[List[str]] = Argument(None, help=("Manifest files to load")),
+    mode: Mode = Option("external", help="Mode of backend operation"),
+):
+    """Reflect tables of sql backends again and update schema cache
+
+    Run this after database schema of a sql backend was changed, so that
+    running servers see the changes after restart.
+    """
+    from spinta.datasets.backends.sql.helpers import get_sql_models, reflect_tables
+
+    manifests = convert_str_to_manifest_path(manifests)
+    context = configure_context(ctx.obj, manifests, mode=mode)
+    store = prepare_manifest(context, ensure_config_dir=True, verbose=False)
+    for backend, models in get_sql_models(context, store.manifest).values():
+        backend.refresh_schema()
+        reflect_tables(backend, models)
+        echo(f"{backend.name}: {len(backend.tables)} tables.")
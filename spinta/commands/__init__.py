@@ -550,6 +550,16 @@ def getfile():
     """
 
 
+@command()
+def iterfile():
+    """Iterate over file content
+
+    Yields file content from `start` to `end` (excluded) in chunks, without
+    reading whole file into memory. This command is used to stream file
+    content via subresource API, for backends storing files in blocks.
+    """
+
+
 @overload
 def getall(
     context: Context,
@@ -9,7 +9,8 @@ from starlette.responses import FileResponse, RedirectResponse, Response
 from spinta import commands
 from spinta.accesslog import AccessLog, log_response
 from spinta.backends.components import Backend
-from spinta.backends.helpers import get_select_prop_names, get_select_tree
+from spinta.backends.constants import BackendFeatures
+from spinta.backends.helpers import get_select_prop_names, get_select_tree, get_serialization_plan
 from spinta.backends.nobackend.components import NoBackend
 from spinta.compat import urlparams_to_expr
 from spinta.components import Context, Model, Node, Page, Property, UrlParams, get_page_size, pagination_enabled
@@ -30,6 +31,7 @@ from spinta.types.datatype import DataType, File, Object
 from spinta.ufuncs.querybuilder.components import QueryParams
 from spinta.ufuncs.querybuilder.helpers import add_page_expr, update_query_with_url_params
 from spinta.utils.data import take
+from spinta.utils.response import RangeNotSatisfiable, StreamingResponse, aiter, get_byte_range
 from spinta.utils.url import build_url_path
 
 
@@ -159,16 +161,21 @@ def prepare_data_for_response(
         include_denorm_props=False,
     )
 
+    plan = get_serialization_plan(context, model, params.fmt, action, prop_select_tree, prop_names)
+
     for row in rows:
-        result = commands.prepare_data_for_response(
-            context,
-            model,
-            params.fmt,
-            row,
-            action=action,
-            select=prop_select_tree,
-            prop_names=prop_names,
-        )
+        if plan is not None and type(row) is dict:
+            result = plan(context, row)
+        else:
+            result = commands.prepare_data_for_response(
+                context,
+                model,
+                params.fmt,
+                row,
+                action=action,
+                select=prop_select_tree,
+                prop_names=prop_names,
+            )
         if func_select:
             for key, func_prop in func_select.items():
                 result[key] = commands.prepare_dtype_for_response(
@@ -493,6 +500,19 @@ async def getone(
     # Return file content from property backend
     else:
         value = take(prop.place, data)
+        filename = value["_id"]
+        headers = {
+            "Revision": data["_revision"],
+            "Content-Disposition": (f'attachment; filename="{filename}"' if filename else "attachment"),
+            **(cache_control or {}),
+            # File content is identified by object revision.
+            "ETag": f'"{data["_revision"]}"',
+        }
+
+        if BackendFeatures.FILE_BLOCKS in dtype.backend.features:
+            if not value.get("_blocks"):
+                raise ItemDoesNotExist(dtype, id=params.pk)
+            return _stream_file(context, request, prop, dtype, value, headers)
 
         file = commands.getfile(
             context,
@@ -505,8 +525,6 @@ async def getone(
         if file is None:
             raise ItemDoesNotExist(dtype, id=params.pk)
 
-        filename = value["_id"]
-
         if isinstance(file, bytes):
             ResponseClass = Response
         elif isinstance(file, Path):
@@ -517,12 +535,55 @@ async def getone(
         return ResponseClass(
             file,
             media_type=value.get("_content_type"),
-            headers={
-                "Revision": data["_revision"],
-                "Content-Disposition": (f'attachment; filename="{filename}"' if filename else "attachment"),
-                **(cache_control or {}),
-            },
+            headers=headers,
+        )
+
+
+def _stream_file(
+    context: Context,
+    request: Request,
+    prop: Property,
+    dtype: File,
+    value: dict,
+    headers: dict,
+) -> Response:
+    size = value["_size"] or 0
+    start, end = 0, size
+    status_code = 200
+    headers = {**headers, "Accept-Ranges": "bytes"}
+
+    try:
+        byte_range = get_byte_range(request, size, headers["Revision"])
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+
+    if request.method == "HEAD":
+        content = []
+    else:
+        content = commands.iterfile(
+            context,
+            prop,
+            dtype,
+            dtype.backend,
+            data=value,
+            start=start,
+            end=end,
         )
+        # Each block can be large, so only one block is read ahead.
+        content = aiter(content, buffer_size=1)
+
+    return StreamingResponse(
+        content,
+        status_code=status_code,
+        media_type=value.get("_content_type"),
+        headers=headers,
+    )
 
 
 @commands.changes.register(Context, Model, Request)
@@ -3,7 +3,7 @@ import json
 import pathlib
 import typing
 from email.message import Message
-from typing import Any, AsyncIterator, Dict, Iterator, Optional, Union, overload
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
 
 from authlib.oauth2.rfc6750.errors import InsufficientScopeError
 from starlette.requests import Request
@@ -20,7 +20,19 @@ from spinta.core.ufuncs import asttoexpr
 from spinta.exceptions import RequiredField
 from spinta.formats.components import Format
 from spinta.renderer import render
-from spinta.types.datatype import Array, BackRef, DataType, Denorm, ExternalRef, File, Inherit, Object, Ref
+from spinta.types.datatype import (
+    Array,
+    BackRef,
+    DataType,
+    Denorm,
+    ExternalRef,
+    File,
+    Inherit,
+    Integer,
+    Object,
+    Ref,
+    String,
+)
 from spinta.urlparams import get_model_by_name
 from spinta.utils.aiotools import agroupby, aiter, alist, aslice
 from spinta.utils.data import take
@@ -519,62 +531,208 @@ async def read_existing_data(
     dstream: AsyncIterator[DataItem],
     stop_on_error: bool = True,
 ) -> AsyncIterator[DataItem]:
+    config = context.get("config")
+
+    # Existing data of a window of data items are read with a single query.
+    #
+    # Last data item of a window is marked with `flush`, this tells write and
+    # changelog stages to write all buffered data items, before next window is
+    # read. Without that, when same object is changed twice, second change
+    # would read stale data, because first change is still buffered.
+    window = []
+    keys = set()
     async for data in dstream:
-        # On insert there are no existing data.
-        if data.action == Action.INSERT:
+        key = _get_prefetch_key(data)
+        if key is not None and key in keys:
+            # Same object changed twice, it must be read again, after previous
+            # change is written.
+            for data_ in _read_existing_window(context, window, stop_on_error):
+                yield data_
+            window = []
+            keys = set()
+
+        window.append(data)
+        if key is not None:
+            keys.add(key)
+
+        if len(window) >= config.write_batch_size:
+            for data_ in _read_existing_window(context, window, stop_on_error):
+                yield data_
+            window = []
+            keys = set()
+
+    for data_ in _read_existing_window(context, window, stop_on_error):
+        yield data_
+
+
+def _get_prefetch_key(data: DataItem) -> Optional[Tuple[str, str, Any]]:
+    # Only `_where: eq(name, value)` lookups by `_id` or by a simple property
+    # value can be read in batches. Value is converted to property type, to
+    # match values of prefetched rows.
+    if data.action in (None, Action.INSERT) or data.prop or data.error is not None:
+        return None
+    if not data.given or "_where" not in data.given:
+        return None
+    where = data.given["_where"]
+    if where["name"] != "eq" or len(where["args"]) != 2:
+        return None
+    bind, value = where["args"]
+    if not isinstance(bind, dict) or bind.get("name") != "bind":
+        return None
+    if not isinstance(value, (str, int)) or isinstance(value, bool):
+        return None
+    name = bind["args"][0]
+    if name == "_id":
+        value = str(value)
+    else:
+        prop = data.model.properties.get(name)
+        if prop is None:
+            return None
+        if type(prop.dtype) is String:
+            value = str(value)
+        elif type(prop.dtype) is Integer:
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+        else:
+            return None
+    return data.model.name, name, value
+
+
+def _read_existing_window(
+    context: Context,
+    window: List[DataItem],
+    stop_on_error: bool,
+) -> Iterator[DataItem]:
+    last = None
+    for data in _read_existing_items(context, window, stop_on_error):
+        if last is not None:
+            yield last
+        last = data
+    if last is not None:
+        last.flush = True
+        yield last
+
+
+def _read_existing_items(
+    context: Context,
+    window: List[DataItem],
+    stop_on_error: bool,
+) -> Iterator[DataItem]:
+    if len(window) == 1:
+        prefetched = {}
+    else:
+        prefetched = _prefetch_existing_rows(context, window)
+    for data in window:
+        key = _get_prefetch_key(data)
+        if key in prefetched:
+            rows = prefetched[key]
+        elif data.action == Action.INSERT:
+            # On insert there are no existing data.
             # XXX: Maybe read exisint data if model has unique constraint?
             yield data
             continue
+        else:
+            rows = _read_existing_rows(context, data)
+        yield from _set_existing_data(context, data, rows, stop_on_error)
+
+
+def _prefetch_existing_rows(
+    context: Context,
+    window: List[DataItem],
+) -> Dict[Tuple[str, str, Any], List[Dict[str, Any]]]:
+    lookups: Dict[Tuple[str, str], Dict[Any, DataItem]] = {}
+    for data in window:
+        key = _get_prefetch_key(data)
+        if key is not None:
+            model_name, name, value = key
+            lookups.setdefault((model_name, name), {})[value] = data
+
+    prefetched = {}
+    for (model_name, name), items in lookups.items():
+        if len(items) < 2:
+            continue
+        model = next(iter(items.values())).model
+        query = asttoexpr(
+            {
+                "name": "or",
+                "args": [
+                    {
+                        "name": "eq",
+                        "args": [{"name": "bind", "args": [name]}, value],
+                    }
+                    for value in items
+                ],
+            }
+        )
+        for value in items:
+            prefetched[(model_name, name, value)] = []
+        for row in commands.getall(context, model, model.backend, query=query):
+            value = str(row[name]) if name == "_id" else row.get(name)
+            if (model_name, name, value) in prefetched:
+                prefetched[(model_name, name, value)].append(row)
+    return prefetched
 
-        try:
-            if data.prop:
-                # FIXME: Below is a temporary hack, because subresources does
-                #        not support getall searches.
-                rows = [
-                    commands.getone(
-                        context,
-                        data.prop,
-                        data.prop.dtype,
-                        data.backend,
-                        id_=data.given["_where"]["args"][1],
-                    )
-                ]
-            else:
-                query = data.given["_where"]
-                query = asttoexpr(query)
-                rows = commands.getall(
+
+def _read_existing_rows(context: Context, data: DataItem) -> Iterable[Dict[str, Any]]:
+    try:
+        if data.prop:
+            # FIXME: Below is a temporary hack, because subresources does
+            #        not support getall searches.
+            rows = [
+                commands.getone(
                     context,
-                    data.model,
-                    data.model.backend,
-                    query=query,
+                    data.prop,
+                    data.prop.dtype,
+                    data.backend,
+                    id_=data.given["_where"]["args"][1],
                 )
-        except exceptions.ItemDoesNotExist:
-            rows = []
-
-        rows = _cast_row_to_python(context, data, rows)
-
-        # When updating by id only, there must be exactly one existing record.
-        if data.action == Action.UPSERT or _has_id_in_where(data.given):
-            rows = list(itertools.islice(rows, 2))
-            number_of_rows = len(rows)
-            if number_of_rows == 1:
-                data.saved = rows[0]
-                data.saved["_type"] = data.model.model_type()
-            elif number_of_rows > 1:
-                data.error = exceptions.MultipleRowsFound(data.model, _id=rows[0]["_id"], number_of_rows=number_of_rows)
-                report_error(data.error, data.given, stop_on_error=stop_on_error)
-            elif data.action != Action.UPSERT:
-                data.error = exceptions.ItemDoesNotExist(data.model, id=data.given["_where"]["args"][1])
-                report_error(data.error, data.given, stop_on_error=stop_on_error)
-            yield data
-            continue
+            ]
+        else:
+            query = data.given["_where"]
+            query = asttoexpr(query)
+            rows = commands.getall(
+                context,
+                data.model,
+                data.model.backend,
+                query=query,
+            )
+    except exceptions.ItemDoesNotExist:
+        rows = []
+    return rows
+
 
-        # In other case, update multiple rows, and get multiple exising data.
-        for row in rows:
-            data = data.copy()
-            data.saved = row
+def _set_existing_data(
+    context: Context,
+    data: DataItem,
+    rows: Iterable[Dict[str, Any]],
+    stop_on_error: bool,
+) -> Iterator[DataItem]:
+    rows = _cast_row_to_python(context, data, rows)
+
+    # When updating by id only, there must be exactly one existing record.
+    if data.action == Action.UPSERT or _has_id_in_where(data.given):
+        rows = list(itertools.islice(rows, 2))
+        number_of_rows = len(rows)
+        if number_of_rows == 1:
+            data.saved = rows[0]
             data.saved["_type"] = data.model.model_type()
-            yield data
+        elif number_of_rows > 1:
+            data.error = exceptions.MultipleRowsFound(data.model, _id=rows[0]["_id"], number_of_rows=number_of_rows)
+            report_error(data.error, data.given, stop_on_error=stop_on_error)
+        elif data.action != Action.UPSERT:
+            data.error = exceptions.ItemDoesNotExist(data.model, id=data.given["_where"]["args"][1])
+            report_error(data.error, data.given, stop_on_error=stop_on_error)
+        yield data
+        return
+
+    # In other case, update multiple rows, and get multiple exising data.
+    for row in rows:
+        data = data.copy()
+        data.saved = row
+        data.saved["_type"] = data.model.model_type()
+        yield data
 
 
 def _cast_row_to_python(
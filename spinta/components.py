@@ -988,6 +988,7 @@ class DataItem:
     saved: Optional[dict] = None  # Current data stored in database.
     patch: Optional[dict] = None  # Patch that is going to be stored to database.
     error: Optional[exceptions.UserError] = None  # Error while processing data.
+    flush: bool = False  # Write all buffered data items, including this one.
 
     def __init__(
         self,
@@ -1146,6 +1147,19 @@ class Config:
     # MB
     max_api_file_size: int
     max_error_count_on_insert: int
+    write_batch_size: int = 1
+    # Bytes
+    response_buffer_size: int = 65536
+    fetch_concurrency: int = 1
+    fetch_rate_limit: Optional[float] = None
+    fetch_chunk_size: int = 10000
+    # MB
+    source_cache_size: float = 1024
+    source_cache_ttl: float = 0
+    sql_schema_cache: bool = True
+    sql_schema_warmup: bool = True
+    inspect_bulk: bool = True
+    inspect_workers: int = 4
 
     # Config variable that should only be set when running `upgrade` `cli` command, used to track when certain errors
     # can be ignored (like missing migrations while loading configs)
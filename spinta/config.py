@@ -19,6 +19,11 @@ CONFIG = {
         "service": {
             "range": "spinta.commands.helpers:range_",
         },
+        # Index of modules registering commands, built with
+        # `spinta index-commands`. If it exists, modules are imported only when
+        # one of their commands is used. Defaults to
+        # `{data_path}/commands-index.json`, empty value disables the index.
+        "index": None,
     },
     "ufuncs": [
         "spinta.ufuncs",
@@ -260,6 +265,52 @@ CONFIG = {
     "max_file_size": 100,
     # Used to determine max amount of errors can be thrown while writing, before canceling writing stream
     "max_error_count_on_insert": 100,
+    # Number of rows (and their changelog entries) written to the internal
+    # PostgreSQL backend with a single query. Rows are written one by one only
+    # if a whole batch fails, in order to find which row caused the error. Set
+    # to 1 to disable batching.
+    "write_batch_size": 1,
+    # Streamed JSON and JSON lines responses are sent to the client in chunks
+    # of at least this many bytes. Set to 0 to send each row separately.
+    "response_buffer_size": 65536,
+    # Default number of parametrized sources (for example one per `param`
+    # value) of a dataframe backend (csv, json, xml, soap) fetched at the same
+    # time. Can be set per backend with `concurrency` backend option. Data is
+    # always returned in the same order as with sequential fetching.
+    "fetch_concurrency": 1,
+    # Default maximum number of source fetches per second of a dataframe
+    # backend, None means no limit. Can be set per backend with `rate_limit`
+    # backend option.
+    "fetch_rate_limit": None,
+    # Default number of rows of json and xml sources read into a single
+    # partition, so that memory use depends on this number and not on the
+    # size of a source. Can be set per backend with `chunk_size` backend
+    # option.
+    "fetch_chunk_size": 10000,
+    # Maximum size (MB) of on-disk cache of csv, json, xml and soap sources
+    # fetched over HTTP, stored in `{data_path}/sources`. Set to 0 to disable
+    # source cache.
+    "source_cache_size": 1024,
+    # Default number of seconds a cached source is used without sending a
+    # request to the source. Can be set per backend with `cache_ttl` backend
+    # option or per resource with `cache(ttl: seconds)` in resource prepare.
+    # After that, sources with `ETag` or `Last-Modified` headers are
+    # revalidated with a conditional request.
+    "source_cache_ttl": 0,
+    # Store columns of reflected tables of sql backends as JSON in
+    # `{data_path}/sqlschema`, so that after restart tables are not reflected
+    # from database again. Use `spinta refresh-schema` after database schema
+    # changes.
+    "sql_schema_cache": True,
+    # Reflect tables of all sql backend models in background on startup,
+    # instead of on first request to a model.
+    "sql_schema_warmup": True,
+    # `spinta inspect` reads columns, keys and comments of all tables of a
+    # schema with a few catalog queries (PostgreSQL, Oracle, MSSQL,
+    # MySQL/MariaDB and SQLite). Set to False to read them table by table.
+    "inspect_bulk": True,
+    # Number of database schemas `spinta inspect` reads at the same time.
+    "inspect_workers": 4,
     # Ensures setting backends by default, disabled when Spinta used as library and does not contain configuration of backends
     "ensure_backends": True,
     # Response Cache-Control header.
@@ -340,6 +391,8 @@ CONFIG = {
             "default_access_level": "open",
             "access": "open",
             "sync_retry_count": 0,
+            "sql_schema_cache": False,
+            "sql_schema_warmup": False,
             "default_distribution_strategy": "undistributed",
         },
     },
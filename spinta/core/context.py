@@ -1,14 +1,25 @@
 import importlib
+import json
+import logging
+import os
 import pathlib
-from typing import Type, TypeVar
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
 
+import spinta
+from spinta import dispatcher
 from spinta.components import Context
-from spinta.core.config import RawConfig, configure_rc, read_config
+from spinta.core.config import DEFAULT_DATA_PATH, RawConfig, configure_rc, read_config
+from spinta.core.ufuncs import ufunc
 from spinta.handlers import CLIErrorHandler, ErrorManager
 from spinta.utils.imports import importstr
 
+log = logging.getLogger(__name__)
+
 ContextType = TypeVar("ContextType", bound=Context)
 
+COMMANDS_INDEX_VERSION = 1
+
 
 def create_context(
     name="spinta",
@@ -20,7 +31,10 @@ def create_context(
     if rc is None:
         rc = read_config(args, envfile)
 
-    load_commands(rc.get("commands", "modules", cast=list))
+    load_commands(
+        rc.get("commands", "modules", cast=list),
+        index=get_commands_index_path(rc),
+    )
 
     if context is None:
         Context_: Type[Context] = rc.get("components", "core", "context", cast=importstr, required=True)
@@ -41,7 +55,7 @@ def create_context(
     return context
 
 
-def load_commands(modules):
+def _find_command_modules(modules: List[str]) -> Iterator[Tuple[str, pathlib.Path]]:
     for module_path in modules:
         module = importlib.import_module(module_path)
         path = pathlib.Path(module.__file__).resolve()
@@ -55,7 +69,139 @@ def load_commands(modules):
             else:
                 module_path = path.relative_to(base).with_suffix("")
             module_path = ".".join(module_path.parts)
-            module = importlib.import_module(module_path)
+            yield module_path, path
+
+
+def load_commands(modules: List[str], index: Optional[pathlib.Path] = None):
+    """Import modules registering commands
+
+    If commands index built by `build_commands_index` is given, then modules,
+    that only register commands, are not imported here, but on first dispatch
+    of one of their signatures. Modules, that changed after index was built,
+    are imported as usual. If index is missing or was built by another spinta
+    version, all modules are imported.
+    """
+    index = read_commands_index(index) if index else None
+    if index is None:
+        for module_path, path in _find_command_modules(modules):
+            importlib.import_module(module_path)
+        return
+
+    lazy = {}
+    for module_path, path in _find_command_modules(modules):
+        entry = index.get(module_path)
+        if entry is None or entry["file"] != str(path) or entry["eager"] or not _is_index_entry_fresh(entry):
+            importlib.import_module(module_path)
+        else:
+            lazy[module_path] = entry
+
+    # Modules outside of given modules registering commands.
+    for module_path, entry in index.items():
+        if module_path in lazy or module_path in sys.modules:
+            continue
+        if not os.path.exists(entry["file"]):
+            continue
+        if entry["eager"] or not _is_index_entry_fresh(entry):
+            importlib.import_module(module_path)
+        else:
+            lazy[module_path] = entry
+
+    for module_path, entry in lazy.items():
+        if module_path in sys.modules:
+            continue
+        signatures = {}
+        for name, signature in entry["commands"]:
+            signatures.setdefault(name, []).append(signature)
+        for name, signatures_ in signatures.items():
+            if not dispatcher.add_pending(module_path, name, signatures_):
+                importlib.import_module(module_path)
+                break
+
+
+def _is_index_entry_fresh(entry: Dict[str, Any]) -> bool:
+    try:
+        stat = os.stat(entry["file"])
+    except OSError:
+        return False
+    return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime"]
+
+
+def get_commands_index_path(rc: RawConfig) -> Optional[pathlib.Path]:
+    index = rc.get("commands", "index")
+    if index is None:
+        return pathlib.Path(rc.get("data_path") or DEFAULT_DATA_PATH) / "commands-index.json"
+    if not index:
+        return None
+    return pathlib.Path(index)
+
+
+def read_commands_index(path: pathlib.Path) -> Optional[Dict[str, Dict[str, Any]]]:
+    if not path.is_file():
+        return None
+    try:
+        with path.open() as f:
+            index = json.load(f)
+    except ValueError:
+        log.warning("Commands index %s is not valid, importing all command modules.", path)
+        return None
+    if index.get("version") != COMMANDS_INDEX_VERSION or index.get("spinta") != spinta.__version__:
+        log.warning("Commands index %s is outdated, importing all command modules.", path)
+        return None
+    return index["modules"]
+
+
+def build_commands_index(modules: List[str]) -> Dict[str, Any]:
+    """Import all command modules and record commands they register
+
+    Modules defining commands or ufuncs and modules registering signatures
+    with types, that can't be referenced by name, are marked as eager and
+    are always imported on startup. Other modules are imported only when
+    one of their signatures is dispatched.
+    """
+    found = []
+    for module_path, path in _find_command_modules(modules):
+        importlib.import_module(module_path)
+        found.append(module_path)
+
+    eager = {command.module for command in dispatcher._commands.values()}
+    for registry in (ufunc.resolver, ufunc.executor):
+        eager.update(func.__module__ for name, func, types in registry._ufuncs)
+
+    registrations = {}
+    for name, command in dispatcher._commands.items():
+        for signature, module_path in command.sources.items():
+            refs = [dispatcher.get_type_ref(type_) for type_ in signature]
+            if None in refs:
+                eager.add(module_path)
+            registrations.setdefault(module_path, []).append([name, refs])
+
+    index = {}
+    for module_path in sorted(registrations.keys() | eager | set(found)):
+        module = sys.modules.get(module_path)
+        if module is None or not getattr(module, "__file__", None):
+            continue
+        path = pathlib.Path(module.__file__).resolve()
+        stat = path.stat()
+        index[module_path] = {
+            "file": str(path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "eager": module_path in eager,
+            "commands": [] if module_path in eager else registrations.get(module_path, []),
+        }
+    return {
+        "version": COMMANDS_INDEX_VERSION,
+        "spinta": spinta.__version__,
+        "modules": index,
+    }
+
+
+def write_commands_index(modules: List[str], path: pathlib.Path) -> Dict[str, Any]:
+    index = build_commands_index(modules)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as f:
+        json.dump(index, f)
+    return index
 
 
 def configure_context(context: Context, *args, **kwargs) -> Context:
@@ -161,6 +161,7 @@ def _inject_name(func, name):
     def wrapper(env, *args, **kwargs):
         return func(env, name, *args, **kwargs)
 
+    wrapper.__module__ = func.__module__
     return wrapper
 
 
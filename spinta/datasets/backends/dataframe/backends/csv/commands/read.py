@@ -29,5 +29,10 @@ def getall(
 
     builder = backend.query_builder_class(context)
     builder.update(model=model)
-    df = dask.dataframe.read_csv(list(bases), sep=resource_builder.seperator)
+    bases = list(bases)
+    if backend.source_cache is not None:
+        # Remote files are read from their local copies in source cache.
+        ttl = backend.get_cache_ttl(model.external.resource)
+        bases = [backend.source_cache.fetch(base, ttl=ttl) if base.startswith("http") else base for base in bases]
+    df = dask.dataframe.read_csv(bases, sep=resource_builder.seperator)
     yield from dask_get_all(context, query, df, backend, model, builder, extra_properties)
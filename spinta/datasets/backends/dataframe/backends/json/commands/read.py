@@ -1,26 +1,28 @@
 from __future__ import annotations
 
+import codecs
+import functools
+import io
 import json
 import pathlib
-from typing import Any, Iterator
-
-import requests
-from dask.bag import from_sequence
+import re
+from typing import Any, Iterator, TextIO
 
 from spinta import commands
 from spinta.components import Context, Model, Property
 from spinta.core.ufuncs import Expr
 from spinta.datasets.backends.dataframe.backends.json.components import Json
+from spinta.datasets.backends.dataframe.cache import SourceCache, open_source
 from spinta.datasets.backends.dataframe.commands.read import (
-    dask_get_all,
+    dask_get_all_chunks,
     get_dask_dataframe_meta,
     get_pkeys_if_ref,
+    iter_source_chunks,
     parametrize_bases,
 )
 from spinta.datasets.backends.helpers import is_file_path
 from spinta.dimensions.param.components import ResolvedParams
 from spinta.exceptions import CannotReadResource, UnexpectedErrorReadingData
-from spinta.manifests.dict.helpers import is_blank_node, is_list_of_dicts
 from spinta.typing import ObjectData
 from spinta.utils.schema import NA
 
@@ -37,114 +39,337 @@ def _get_prop_full_source(source: str, prop_source: str) -> str:
         return source
 
 
-def _parse_json_with_params(data: list | dict, source: list, model_props: dict) -> Iterator[dict[str, Any]]:
-    def get_prop_value(items: dict, pkeys: list, prop_source: list) -> Any:
-        new_value = items
-
-        # Remove empty values from split()
-        prop_source = [prop for prop in prop_source if prop]
-        if pkeys:
-            ref_keys = []
-            for key in pkeys:
-                split = key.split(".")
-                split = [prop for prop in split if prop]
-                new_value = items
-                for id, prop in enumerate(split):
-                    if isinstance(new_value, dict):
-                        if prop in new_value.keys():
-                            new_value = new_value[prop]
-                        else:
-                            break
-                    else:
-                        break
-                    if id == len(split) - 1:
-                        ref_keys.append(new_value)
-            if len(ref_keys) == 1:
-                return ref_keys[0]
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters, that change nesting level, when skipping a value.
+_SKIP_CHARS = re.compile(r'["\[\]{}]')
+# Rest of a string, after the opening quote.
+_STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+# Number or literal.
+_TOKEN = re.compile(r"[^\s,\]}]*")
+_DECODER = json.JSONDecoder()
+
+
+class _JsonReader:
+    """Incremental JSON reader
+
+    JSON text is read from a file object in chunks. Objects and arrays are
+    walked key by key and item by item, and only values, that are explicitly
+    read, are decoded, so memory use depends on the size of read values and
+    not on the size of the whole document.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, file: TextIO):
+        self._file = file
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        if self._pos > self.chunk_size:
+            # Drop already parsed data.
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        # Read at least as much as is left unparsed, so that a large value is
+        # decoded in a few attempts.
+        chunk = self._file.read(max(self.chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and return next character or "" at the end"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting {char!r}")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        char = self.peek()
+        if char not in ('"', "[", "{"):
+            # Numbers and literals have no closing character, so whole token
+            # must be read, before it is decoded.
+            while _TOKEN.match(self._buf, self._pos).end() == len(self._buf) and self._fill():
+                pass
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        if self.peek() not in ("[", "{"):
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            match = _SKIP_CHARS.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._fill():
+                    raise self._error("Unterminated value")
+                continue
+            self._pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._skip_string()
+            elif char in ("[", "{"):
+                depth += 1
             else:
-                return ref_keys
-        else:
-            for id, prop in enumerate(prop_source):
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_string(self) -> None:
+        while True:
+            match = _STRING_END.match(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.end()
+                return
+            if not self._fill():
+                raise self._error("Unterminated string")
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over object keys
+
+        Value of each key must be read or skipped, before next key is read.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array(self) -> Iterator[None]:
+        """Iterate over array items
+
+        Each item must be read or skipped, before next item is read.
+        """
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def end(self) -> None:
+        if self.peek() != "":
+            raise self._error("Extra data")
+
+
+def _split_source(source: str) -> list[str]:
+    # Remove empty values from split()
+    return [name for name in source.split(".") if name]
+
+
+def _get_prop_value(items: dict, pkeys: list, prop_source: list) -> Any:
+    new_value = items
+
+    prop_source = [prop for prop in prop_source if prop]
+    if pkeys:
+        ref_keys = []
+        for key in pkeys:
+            split = _split_source(key)
+            new_value = items
+            for id, prop in enumerate(split):
                 if isinstance(new_value, dict):
                     if prop in new_value.keys():
                         new_value = new_value[prop]
                     else:
-                        return None
+                        break
+                else:
+                    break
+                if id == len(split) - 1:
+                    ref_keys.append(new_value)
+        if len(ref_keys) == 1:
+            return ref_keys[0]
+        else:
+            return ref_keys
+    else:
+        for id, prop in enumerate(prop_source):
+            if isinstance(new_value, dict):
+                if prop in new_value.keys():
+                    new_value = new_value[prop]
                 else:
                     return None
-                if id == len(prop_source) - 1:
-                    return new_value
-
-    def traverse_json(
-        items: list | dict, current_value: dict, current_path: int = 0, in_model: bool = False
-    ) -> Iterator[dict[str, Any]]:
-        last_path = source[: current_path + 1]
-        current_source = source[current_path]
-        if current_source.endswith("[]"):
-            current_source = current_source[:-2]
-        if isinstance(items, dict):
-            if in_model or current_source == ".":
-                item = items
             else:
-                if current_source in items.keys():
-                    item = items[current_source]
-                else:
-                    return
-            if isinstance(item, list) and is_list_of_dicts(item):
-                yield from traverse_json(item, current_value, current_path, True)
+                return None
+            if id == len(prop_source) - 1:
+                return new_value
+
+
+class _JsonPath:
+    """Model source path prepared for reading
+
+    Level 0 is the document root (or each object of a root array) and each
+    source path name adds a level, the last level holds model objects.
+    Properties are read from the level of their `root_source`.
+    """
+
+    def __init__(self, source: str, model_props: dict):
+        source_list = [] if source == "." else source.split(".")
+        self.names = [name[:-2] if name.endswith("[]") else name for name in source_list]
+        self.sources = list(model_props)
+        self.props: list[list[dict]] = [[] for _ in range(len(self.names) + 1)]
+        # Keys of objects, that are needed to read property values.
+        self.keys: list[set[str]] = [set() for _ in range(len(self.names) + 1)]
+        for prop in model_props.values():
+            root_source = prop["root_source"]
+            if root_source == ["."]:
+                level = 0
+            elif root_source == source_list[: len(root_source)]:
+                level = len(root_source)
+            else:
+                continue
+            self.props[level].append(prop)
+            for key in prop["pkeys"] or [prop["source"]]:
+                split = _split_source(key)
+                if split:
+                    self.keys[level].add(split[0])
+
+    def get_values(self, level: int, values: dict) -> dict[str, Any]:
+        return {
+            prop["source"]: _get_prop_value(values, prop["pkeys"], prop["source"].split("."))
+            for prop in self.props[level]
+        }
+
+    def new_row(self, values: dict) -> dict[str, Any]:
+        row = dict.fromkeys(self.sources)
+        row.update(self.get_values(len(self.names), values))
+        return row
+
+
+def _read_value(reader: _JsonReader, path: _JsonPath, level: int) -> Iterator[dict[str, Any]]:
+    char = reader.peek()
+    if char == "[":
+        for _ in reader.iter_array():
+            if reader.peek() == "{":
+                yield from _read_object(reader, path, level)
             else:
-                for prop in model_props.values():
-                    prop_path = prop["root_source"]
-                    this_path = last_path
-                    if prop_path == this_path:
-                        current_value[prop["source"]] = get_prop_value(item, prop["pkeys"], prop["source"].split("."))
-                if current_path < len(source) - 1:
-                    yield from traverse_json(item, current_value, current_path + 1, False)
+                reader.skip_value()
+    elif char == "{":
+        yield from _read_object(reader, path, level)
+    else:
+        reader.skip_value()
+
+
+def _read_object(reader: _JsonReader, path: _JsonPath, level: int) -> Iterator[dict[str, Any]]:
+    if level == len(path.names):
+        # Model objects are decoded whole, parent objects are read key by key.
+        yield path.new_row(reader.read_value())
+        return
+
+    keys = path.keys[level]
+    name = path.names[level]
+    values = {}
+    # Rows read before all property values of this object are known.
+    pending = []
+    for key in reader.iter_object():
+        if key == name:
+            if key in keys:
+                values[key] = None
+            if level + 1 == len(path.names) and reader.peek() not in ("[", "{", ""):
+                reader.skip_value()
+                rows = [path.new_row({})]
+            else:
+                rows = _read_value(reader, path, level + 1)
+            for row in rows:
+                if pending or len(values) < len(keys):
+                    pending.append(row)
                 else:
-                    yield current_value
-        elif isinstance(items, list) and is_list_of_dicts(items):
-            for item in items:
-                yield from traverse_json(item, current_value.copy(), current_path, in_model)
+                    row.update(path.get_values(level, values))
+                    yield row
+        elif key in keys:
+            values[key] = reader.read_value()
+        else:
+            reader.skip_value()
+
+        if pending and len(values) == len(keys):
+            yield from _update_rows(pending, path.get_values(level, values))
+            pending = []
 
-    current_value = {}
-    for prop in model_props.values():
-        current_value[prop["source"]] = None
-    yield from traverse_json(data, current_value=current_value)
+    yield from _update_rows(pending, path.get_values(level, values))
 
 
-def _parse_json(data: str, source: str, model_props: dict) -> Iterator[dict[str, Any]]:
+def _update_rows(rows: list[dict[str, Any]], values: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    for row in rows:
+        row.update(values)
+        yield row
+
+
+def _parse_json(file: TextIO, source: str, model_props: dict) -> Iterator[dict[str, Any]]:
+    """Read model objects from JSON text while it is parsed
+
+    One flat row is yielded for each object found at model `source` path, so
+    memory use depends on the size of a single object, not the whole document.
+    Rows are held back only if property values of a parent object are given
+    after the nested objects.
+    """
+    reader = _JsonReader(file)
+    path = _JsonPath(source, model_props)
     try:
-        data = json.loads(data)
+        yield from _read_value(reader, path, 0)
+        reader.end()
     except json.decoder.JSONDecodeError as e:
         raise UnexpectedErrorReadingData(exception=type(e).__name__, message=str(e))
 
-    source_list = source.split(".")
-    # Prepare source for blank nodes
-    blank_nodes = is_blank_node(data)
-    if source == ".":
-        source_list = ["."]
-    else:
-        if blank_nodes:
-            source_list = ["."] + source_list
-    if blank_nodes:
-        for prop in model_props.values():
-            if prop["root_source"][0] != ".":
-                prop["root_source"].insert(0, ".")
-
-    yield from _parse_json_with_params(data, source_list, model_props)
-
 
-def _get_data_json(data_source: str, source: str, model_props: dict) -> Iterator[dict[str, Any]]:
+def _get_data_json(
+    data_source: str,
+    source: str,
+    model_props: dict,
+    cache: SourceCache | None = None,
+    ttl: float = 0,
+) -> Iterator[dict[str, Any]]:
     if data_source.startswith("http"):
-        response = requests.get(data_source, timeout=30)
-        yield from _parse_json(response.text, source, model_props)
+        with open_source(data_source, cache=cache, ttl=ttl) as response:
+            file = codecs.getreader(response.encoding or "utf-8-sig")(response.raw)
+            yield from _parse_json(file, source, model_props)
 
     elif is_file_path(data_source):
         with pathlib.Path(data_source).open(encoding="utf-8-sig") as file:
-            yield from _parse_json(file.read(), source, model_props)
+            yield from _parse_json(file, source, model_props)
 
     else:
-        yield from _parse_json(data_source, source, model_props)
+        yield from _parse_json(io.StringIO(data_source), source, model_props)
 
 
 @commands.getall.register(Context, Model, Json)
@@ -182,10 +407,12 @@ def getall(
     else:
         raise CannotReadResource(resource)
 
-    df = (
-        from_sequence(data_source)
-        .map(_get_data_json, source=model.external.name, model_props=props)
-        .flatten()
-        .to_dataframe(meta=meta)
+    read = functools.partial(
+        _get_data_json,
+        source=model.external.name,
+        model_props=props,
+        cache=backend.source_cache,
+        ttl=backend.get_cache_ttl(resource),
     )
-    yield from dask_get_all(context, query, df, backend, model, builder, extra_properties)
+    chunks = iter_source_chunks(backend, data_source, read, meta)
+    yield from dask_get_all_chunks(context, query, chunks, backend, model, builder, extra_properties)
@@ -22,7 +22,12 @@ from spinta.ufuncs.querybuilder.components import QueryParams
 
 
 def _get_data_soap(
-    url: str, backend: Soap, soap_request_body: dict, extra_headers: dict, source: str | None = None
+    url: str,
+    backend: Soap,
+    soap_request_body: dict,
+    extra_headers: dict,
+    source: str | None = None,
+    ttl: float | None = None,
 ) -> list[dict]:
     for key, value in soap_request_body.items():
         if isinstance(value, MakeCDATA):
@@ -35,7 +40,7 @@ def _get_data_soap(
 
     try:
         response_data = serialize_object(
-            backend.get_soap_operation(extra_headers=extra_headers)(**soap_request), target_cls=dict
+            backend.get_soap_operation(extra_headers=extra_headers, ttl=ttl)(**soap_request), target_cls=dict
         )
     except zeep.exceptions.Error as e:
         raise UnexpectedErrorReadingData(exception=type(e).__name__, message=str(e))
@@ -142,13 +147,14 @@ def getall(
 
     meta = get_dask_dataframe_meta(model)
     df = (
-        dask.bag.from_sequence(bases)
+        dask.bag.from_sequence(bases, partition_size=1)
         .map(
             _get_data_soap,
             backend=backend,
             soap_request_body=builder.soap_request_body,
             extra_headers=http_headers,
             source=model.external.name,
+            ttl=backend.get_cache_ttl(resource),
         )
         .flatten()
         .to_dataframe(meta=meta)
@@ -2,13 +2,47 @@ from __future__ import annotations
 
 import contextlib
 
+import requests
+from zeep import Transport
 from zeep.proxy import OperationProxy
 
+from spinta.datasets.backends.dataframe.cache import SourceCache
 from spinta.datasets.backends.dataframe.components import DaskBackend
 from spinta.datasets.backends.wsdl.components import WsdlBackend
 from spinta.exceptions import SoapServiceError
 
 
+class SourceCacheTransport(Transport):
+    """Zeep transport, that reads SOAP operation responses through source cache"""
+
+    def __init__(self, source_cache: SourceCache, ttl: float, **kwargs):
+        super().__init__(**kwargs)
+        self.source_cache = source_cache
+        self.ttl = ttl
+
+    def post(self, address: str, message: bytes, headers: dict) -> requests.Response:
+        with self.source_cache.open(
+            address,
+            ttl=self.ttl,
+            method="POST",
+            body=message,
+            headers=headers,
+            session=self.session,
+            timeout=self.operation_timeout,
+        ) as cached:
+            if isinstance(cached, requests.Response):
+                # Response is not cacheable, read it while connection is open.
+                cached.content
+                return cached
+            response = requests.Response()
+            response.status_code = cached.status_code
+            response.headers = cached.headers
+            response.encoding = cached.encoding
+            response.url = address
+            response._content = cached.raw.read()
+        return response
+
+
 class Soap(DaskBackend):
     type: str = "soap"
     query_builder_type = "soap"
@@ -18,11 +52,18 @@ class Soap(DaskBackend):
     port: str
     operation: str
 
-    def get_soap_operation(self, extra_headers: dict) -> OperationProxy:
+    def get_soap_operation(self, extra_headers: dict, ttl: float | None = None) -> OperationProxy:
         with self.wsdl_backend.begin():
             client = self.wsdl_backend.client
 
         client.transport.session.headers.update(extra_headers)
+        if self.source_cache is not None:
+            client.transport = SourceCacheTransport(
+                self.source_cache,
+                self.cache_ttl if ttl is None else ttl,
+                session=client.transport.session,
+                operation_timeout=client.transport.operation_timeout,
+            )
 
         try:
             soap_service = client.bind(self.service, self.port)
@@ -1,19 +1,21 @@
+import functools
 import io
 import pathlib
-from typing import Any, Iterator
+import re
+from typing import Any, Iterator, Optional
 
-import requests
-from dask.bag import from_sequence
 from lxml import etree
 
 from spinta import commands
 from spinta.components import Context, Model, Property
 from spinta.core.ufuncs import Expr
 from spinta.datasets.backends.dataframe.backends.xml.components import Xml
+from spinta.datasets.backends.dataframe.cache import SourceCache, open_source
 from spinta.datasets.backends.dataframe.commands.read import (
-    dask_get_all,
+    dask_get_all_chunks,
     get_dask_dataframe_meta,
     get_pkeys_if_ref,
+    iter_source_chunks,
     parametrize_bases,
 )
 from spinta.datasets.backends.helpers import is_file_path
@@ -22,10 +24,11 @@ from spinta.exceptions import CannotReadResource, UnexpectedErrorReadingData
 from spinta.typing import ObjectData
 from spinta.utils.schema import NA
 
+# Child element step of a path, optionally with a namespace prefix.
+_XML_STEP = re.compile(r"^(?:[\w.-]+:)?(?:[\w.-]+|\*)$")
 
-def _parse_xml_loop_model_properties(
-    value, added_root_elements: list, model_props: dict, namespaces: dict
-) -> dict[str, Any]:
+
+def _parse_xml_loop_model_properties(value, model_props: dict, namespaces: dict) -> dict[str, Any]:
     new_dict = {}
 
     # Go through each prop source with xpath of root path
@@ -72,32 +75,107 @@ def _parse_xml_loop_model_properties(
                 new_value = None
         new_dict[prop["source"]] = new_value
 
-    added_root_elements.append(value)
     return new_dict
 
 
-def _parse_xml(data, source: str, model_props: dict, namespaces={}) -> Iterator[dict[str, Any]]:
-    added_root_elements = []
+def _is_local_source(source: str) -> bool:
+    # Source is evaluated only within matched element.
+    return not source.startswith("/") and ".." not in source and "::" not in source
 
-    try:
-        iterparse = etree.iterparse(data, events=["start"], remove_blank_text=True)
-        _, root = next(iterparse)
-    except etree.XMLSyntaxError as e:
-        raise UnexpectedErrorReadingData(exception=type(e).__name__, message=str(e))
 
+def _get_stream_tags(source: str, model_props: dict, namespaces: dict) -> Optional[list[str]]:
+    """Get element tags of model source path, if it can be matched while parsing
+
+    Only paths made of child element steps are matched while parsing, and only
+    if all property sources are read from within matched element. Otherwise
+    None is returned and whole document has to be parsed.
+    """
+    if source.startswith("//") or source == "/":
+        return None
+
+    for prop in model_props.values():
+        for prop_source in [prop["source"], *prop["pkeys"]]:
+            if not _is_local_source(prop_source):
+                return None
+
+    tags = []
+    for step in source[1:].split("/"):
+        if not _XML_STEP.match(step):
+            return None
+        if ":" in step:
+            prefix, name = step.split(":", 1)
+            if prefix not in namespaces:
+                return None
+            step = f"{{{namespaces[prefix]}}}{name}"
+        tags.append(step)
+    return tags
+
+
+def _iterparse(data) -> Iterator[tuple[str, etree._Element, list[str]]]:
+    # Parsing stops at the end of root element, content after it is ignored.
+    path = []
+    for event, elem in etree.iterparse(data, events=("start", "end"), remove_blank_text=True):
+        if event == "start":
+            path.append(elem.tag)
+        yield event, elem, path
+        if event == "end":
+            path.pop()
+            if not path:
+                break
+
+
+def _parse_root(data) -> etree._Element:
+    root = None
+    for event, elem, path in _iterparse(data):
+        root = elem
+    return root
+
+
+def _iter_xml_elements(data, tags: list[str]) -> Iterator[etree._Element]:
+    depth = len(tags)
+    for event, elem, path in _iterparse(data):
+        if event == "start":
+            continue
+
+        level = len(path)
+        if level == depth and all(tag == "*" or tag == name for tag, name in zip(tags, path)):
+            yield elem
+
+        if level <= depth:
+            # Matched element and elements outside of it are no longer needed.
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _parse_xml(data, source: str, model_props: dict, namespaces={}) -> Iterator[dict[str, Any]]:
     if not source.startswith(("/", ".")):
         source = f"/{source}"
 
-    values = root.xpath(source, namespaces=namespaces)
-    for value in values:
-        if value not in added_root_elements:
-            yield _parse_xml_loop_model_properties(value, added_root_elements, model_props, namespaces)
+    try:
+        tags = _get_stream_tags(source, model_props, namespaces) if source.startswith("/") else None
+        if tags is None:
+            values = _parse_root(data).xpath(source, namespaces=namespaces)
+        else:
+            values = _iter_xml_elements(data, tags)
+
+        for value in values:
+            yield _parse_xml_loop_model_properties(value, model_props, namespaces)
+    except etree.XMLSyntaxError as e:
+        raise UnexpectedErrorReadingData(exception=type(e).__name__, message=str(e))
 
 
-def _get_data_xml(data_source: str, source: str, model_props: dict, namespaces: dict) -> Iterator[dict[str, Any]]:
+def _get_data_xml(
+    data_source: str,
+    source: str,
+    model_props: dict,
+    namespaces: dict,
+    cache: SourceCache | None = None,
+    ttl: float = 0,
+) -> Iterator[dict[str, Any]]:
     if data_source.startswith("http"):
-        response = requests.get(data_source, timeout=30)
-        yield from _parse_xml(io.BytesIO(response.content), source, model_props, namespaces)
+        with open_source(data_source, cache=cache, ttl=ttl) as response:
+            yield from _parse_xml(response.raw, source, model_props, namespaces)
 
     elif is_file_path(data_source):
         with pathlib.Path(data_source).open("rb") as file:
@@ -149,15 +227,13 @@ def getall(
     else:
         raise CannotReadResource(resource)
 
-    df = (
-        from_sequence(data_source)
-        .map(
-            _get_data_xml,
-            namespaces=_gather_namespaces_from_model(context, model),
-            source=model.external.name,
-            model_props=props,
-        )
-        .flatten()
-        .to_dataframe(meta=meta)
+    read = functools.partial(
+        _get_data_xml,
+        namespaces=_gather_namespaces_from_model(context, model),
+        source=model.external.name,
+        model_props=props,
+        cache=backend.source_cache,
+        ttl=backend.get_cache_ttl(resource),
     )
-    yield from dask_get_all(context, query, df, backend, model, builder, extra_properties)
+    chunks = iter_source_chunks(backend, data_source, read, meta)
+    yield from dask_get_all_chunks(context, query, chunks, backend, model, builder, extra_properties)
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+import uuid
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+log = logging.getLogger(__name__)
+
+# Request headers, that are set by requests itself and do not change response.
+_IGNORED_HEADERS = {"user-agent", "accept-encoding", "connection", "content-length"}
+
+
+class CachedResponse:
+    """Response body served from source cache
+
+    Has the same `raw`, `encoding`, `status_code` and `headers` attributes as
+    `requests.Response`, which are used by source readers.
+    """
+
+    status_code: int = 200
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        encoding: Optional[str],
+        headers: Dict[str, str],
+        path: pathlib.Path,
+    ):
+        self.raw = raw
+        self.encoding = encoding
+        self.headers = CaseInsensitiveDict(headers)
+        # Path of stored body, body is stored only after whole body is read.
+        self.path = path
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+class _CachingReader(io.RawIOBase):
+    """Read response body and write it to a cache file at the same time
+
+    Cache entry is stored only if whole body was read. If reader stops before
+    the end of body, at most `drain_size` remaining bytes are read on close.
+    """
+
+    drain_size: int = 64 * 1024
+
+    def __init__(self, cache: SourceCache, key: str, meta: Dict[str, Any], raw: BinaryIO):
+        self._cache = cache
+        self._key = key
+        self._meta = meta
+        self._raw = raw
+        self.path = cache.path / f"{key}-{uuid.uuid4().hex}.data"
+        self._part = self.path.with_suffix(".part")
+        cache.path.mkdir(parents=True, exist_ok=True)
+        self._file = self._part.open("wb")
+        self._size = 0
+        self.stored = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size if size is not None and size >= 0 else None)
+        if self._file is None:
+            return data
+        if data:
+            self._size += len(data)
+            if self._size > self._cache.size:
+                # Body does not fit into cache.
+                self._discard()
+            else:
+                self._file.write(data)
+        else:
+            self._file.close()
+            self._file = None
+            os.replace(self._part, self.path)
+            self._cache._store(self._key, self._meta, self.path, self._size)
+            self.stored = True
+        return data
+
+    def _discard(self) -> None:
+        self._file.close()
+        self._file = None
+        self._part.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        drained = 0
+        while self._file is not None and drained <= self.drain_size:
+            # For example XML parser stops at the end of root element.
+            drained += len(self.read(io.DEFAULT_BUFFER_SIZE))
+        if self._file is not None:
+            self._discard()
+        super().close()
+
+
+class SourceCache:
+    """Size bounded on-disk cache of source documents fetched over HTTP
+
+    Entries are keyed by request method, URL, body and headers. A stored
+    response is used without a request to the source for `ttl` seconds after
+    it was fetched or revalidated. After that, if source returned `ETag` or
+    `Last-Modified`, a conditional request is sent and stored body is used
+    again if source responds with 304 Not Modified.
+
+    Each entry is a JSON file with response metadata and a body file. Least
+    recently used entries are removed, when total size exceeds `size` bytes.
+    """
+
+    path: pathlib.Path
+    size: int
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+
+    def __init__(self, path: pathlib.Path, size: int):
+        self.path = path
+        self.size = size
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    # Cache is passed to Dask reader functions, which requires all given
+    # parameters to be hashable.
+    def __dask_tokenize__(self):
+        return type(self).__name__, str(self.path)
+
+    def _key(self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str]) -> str:
+        key = hashlib.sha256()
+        key.update(f"{method} {url}\n".encode())
+        for name, value in sorted((k.lower(), str(v)) for k, v in headers.items()):
+            if name not in _IGNORED_HEADERS:
+                key.update(f"{name}: {value}\n".encode())
+        key.update(b"\n")
+        key.update(body or b"")
+        return key.hexdigest()
+
+    def _read_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            meta = json.loads((self.path / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        if not (self.path / meta["data"]).exists():
+            return None
+        return meta
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        tmp = self.path / f"{key}-{uuid.uuid4().hex}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.path / f"{key}.json")
+
+    def _open_data(self, meta: Dict[str, Any]) -> Optional[CachedResponse]:
+        path = self.path / meta["data"]
+        try:
+            file = path.open("rb")
+        except OSError:
+            return None
+        return CachedResponse(file, meta["encoding"], {"Content-Type": meta["content_type"]}, path)
+
+    def _store(self, key: str, meta: Dict[str, Any], data: pathlib.Path, size: int) -> None:
+        old = self._read_meta(key)
+        meta = {**meta, "data": data.name, "size": size}
+        self._write_meta(key, meta)
+        if old and old["data"] != data.name:
+            (self.path / old["data"]).unlink(missing_ok=True)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries, until cache fits into `size`"""
+        with self._lock:
+            # key: [last used, size]
+            entries: Dict[str, list] = {}
+            total = 0
+            now = time.time()
+            for item in _scandir(self.path):
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                total += stat.st_size
+                if item.name.endswith((".part", ".tmp")):
+                    if stat.st_mtime < now - 3600:
+                        # Left after interrupted write.
+                        pathlib.Path(item.path).unlink(missing_ok=True)
+                    continue
+                key = item.name.split("-")[0].split(".")[0]
+                entry = entries.setdefault(key, [stat.st_mtime, 0])
+                entry[1] += stat.st_size
+                if item.name.endswith(".json"):
+                    entry[0] = stat.st_mtime
+            for key, (used, size) in sorted(entries.items(), key=lambda e: e[1][0]):
+                if total <= self.size:
+                    break
+                (self.path / f"{key}.json").unlink(missing_ok=True)
+                for file in self.path.glob(f"{key}-*.data"):
+                    file.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for item in _scandir(self.path):
+                pathlib.Path(item.path).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        entries = 0
+        size = 0
+        for item in _scandir(self.path):
+            if item.name.endswith(".json"):
+                entries += 1
+            with contextlib.suppress(OSError):
+                size += item.stat().st_size
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+        }
+
+    @contextlib.contextmanager
+    def open(
+        self,
+        url: str,
+        *,
+        ttl: float = 0,
+        method: str = "GET",
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[float] = 30,
+        store: bool = False,
+    ) -> Iterator[Union[requests.Response, CachedResponse]]:
+        """Open source response body for streaming
+
+        Response is stored if `ttl` is given or if source returned `ETag` or
+        `Last-Modified` headers. Pass `store=True` to store response in any
+        case. Responses other than 200 OK are returned as is.
+        """
+        headers = dict(headers or {})
+        request_headers = {**session.headers, **headers} if session else headers
+        key = self._key(method, url, body, request_headers)
+
+        meta = self._read_meta(key)
+        if meta and time.time() < meta["validated"] + ttl:
+            cached = self._open_data(meta)
+            if cached is not None:
+                self._touch(key)
+                self.hits += 1
+                with contextlib.closing(cached):
+                    yield cached
+                return
+
+        if meta:
+            if meta["etag"]:
+                headers["If-None-Match"] = meta["etag"]
+            if meta["last_modified"]:
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        session = session or requests
+        with session.request(
+            method,
+            url,
+            data=body,
+            headers=headers,
+            timeout=timeout,
+            stream=True,
+        ) as response:
+            if response.status_code == 304 and meta:
+                cached = self._open_data(meta)
+                if cached is not None:
+                    self._write_meta(key, {**meta, "validated": time.time()})
+                    self.revalidations += 1
+                    with contextlib.closing(cached):
+                        yield cached
+                    return
+
+            self.misses += 1
+            response.raw.decode_content = True
+            if not self._is_storable(response, ttl, store):
+                yield response
+                return
+
+            meta = {
+                "url": url,
+                "method": method,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_type": response.headers.get("Content-Type"),
+                "encoding": response.encoding,
+                "validated": time.time(),
+            }
+            try:
+                reader = _CachingReader(self, key, meta, response.raw)
+            except OSError as e:
+                log.warning("Can't write source cache to %s: %s", self.path, e)
+                yield response
+                return
+            with contextlib.closing(reader):
+                yield CachedResponse(reader, response.encoding, dict(response.headers), reader.path)
+
+    def fetch(self, url: str, *, ttl: float = 0, timeout: Optional[float] = 30) -> str:
+        """Store source in cache and return path of local copy
+
+        Used for readers, that can only read from a path. URL is returned
+        as is, if response was not stored.
+        """
+        with self.open(url, ttl=ttl, timeout=timeout, store=True) as response:
+            if not isinstance(response, CachedResponse):
+                return url
+            while response.raw.read(io.DEFAULT_BUFFER_SIZE):
+                pass
+            if isinstance(response.raw, _CachingReader) and not response.raw.stored:
+                # Response was too large to be stored.
+                return url
+            return str(response.path)
+
+    def _is_storable(self, response: requests.Response, ttl: float, store: bool) -> bool:
+        if response.status_code != 200:
+            return False
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return False
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.size:
+            return False
+        return store or ttl > 0 or "ETag" in response.headers or "Last-Modified" in response.headers
+
+    def _touch(self, key: str) -> None:
+        # Entry modification time is used to find least recently used entries.
+        with contextlib.suppress(OSError):
+            os.utime(self.path / f"{key}.json")
+
+
+def _scandir(path: pathlib.Path) -> Iterator[os.DirEntry]:
+    try:
+        yield from os.scandir(path)
+    except FileNotFoundError:
+        # Cache directory is created, when first entry is stored.
+        return
+
+
+_caches: Dict[str, SourceCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_source_cache(path: pathlib.Path, size: int) -> SourceCache:
+    """Get process wide source cache stored in given directory"""
+    key = str(path.resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = SourceCache(path, size)
+        cache.size = size
+        return cache
+
+
+@contextlib.contextmanager
+def open_source(
+    url: str,
+    *,
+    cache: Optional[SourceCache] = None,
+    ttl: float = 0,
+    timeout: Optional[float] = 30,
+) -> Iterator[Union[requests.Response, CachedResponse]]:
+    """Open source response body through cache, if cache is given"""
+    if cache is not None:
+        with cache.open(url, ttl=ttl, timeout=timeout) as response:
+            yield response
+    else:
+        with requests.get(url, timeout=timeout, stream=True) as response:
+            response.raw.decode_content = True
+            yield response
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import collections
+import itertools
 import math
-from typing import Any, Dict, Iterator
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator
 
 import dask
 import numpy as np
@@ -14,8 +19,12 @@ from spinta.backends.helpers import is_custom_id_prop
 from spinta.components import Context, Model, Property
 from spinta.core.ufuncs import Env, Expr
 from spinta.datasets.backends.dataframe.backends.memory.components import MemoryDaskBackend
-from spinta.datasets.backends.dataframe.components import DaskBackend
-from spinta.datasets.backends.dataframe.ufuncs.query.components import DaskDataFrameQueryBuilder
+from spinta.datasets.backends.dataframe.cache import get_source_cache
+from spinta.datasets.backends.dataframe.components import DaskBackend, RateLimiter
+from spinta.datasets.backends.dataframe.ufuncs.query.components import (
+    RESERVED_COUNT_PROP,
+    DaskDataFrameQueryBuilder,
+)
 from spinta.datasets.components import Resource
 from spinta.datasets.helpers import encode_composite_string_id, get_enum_filters, get_ref_filters
 from spinta.datasets.utils import iterparams
@@ -106,25 +115,7 @@ def _get_row_value(context: Context, row: Any, sel: Any, params: dict | None) ->
                         external=sel.prop.external.name,
                     )
         if enum_options := get_prop_enum(sel.prop):
-            env = Env(context)(this=sel.prop)
-            for enum_option in enum_options.values():
-                if isinstance(enum_option.prepare, Expr):
-                    # This is backward compatibility for older Dask versions, where empty fields returned as NaN.
-                    # If we do not want to support nan type this eventually should be moved to the dask reader part.
-                    if isinstance(val, float) and math.isnan(val):
-                        val = None
-                    processed = env.call(enum_option.prepare.name, val, *enum_option.prepare.args)
-                    if val != processed:
-                        val = processed
-                        break
-            if val is None:
-                pass
-            elif str(val) in enum_options:
-                item = enum_options[str(val)]
-                if item.prepare is not NA:
-                    val = item.prepare
-            else:
-                raise ValueNotInEnum(sel.prop, value=val)
+            val = _prepare_enum_value(context, sel.prop, enum_options, val)
 
         return val
     if isinstance(sel, tuple):
@@ -136,9 +127,140 @@ def _get_row_value(context: Context, row: Any, sel: Any, params: dict | None) ->
     return sel
 
 
+def _prepare_enum_value(context: Context, prop: Property, enum_options: dict, val: Any) -> Any:
+    env = Env(context)(this=prop)
+    for enum_option in enum_options.values():
+        if isinstance(enum_option.prepare, Expr):
+            # This is backward compatibility for older Dask versions, where empty fields returned as NaN.
+            # If we do not want to support nan type this eventually should be moved to the dask reader part.
+            if isinstance(val, float) and math.isnan(val):
+                val = None
+            processed = env.call(enum_option.prepare.name, val, *enum_option.prepare.args)
+            if val != processed:
+                val = processed
+                break
+    if val is None:
+        pass
+    elif str(val) in enum_options:
+        item = enum_options[str(val)]
+        if item.prepare is not NA:
+            val = item.prepare
+    else:
+        raise ValueNotInEnum(prop, value=val)
+    return val
+
+
+def _map_enum_values(context: Context, prop: Property, enum_options: dict, values: list) -> list:
+    # Enum is prepared once for each distinct value of a column.
+    prepared = {}
+    result = []
+    for val in values:
+        try:
+            # Type is part of the key, because `1 == 1.0 == True`.
+            key = (type(val), val)
+            if key not in prepared:
+                prepared[key] = _prepare_enum_value(context, prop, enum_options, val)
+            result.append(prepared[key])
+        except TypeError:
+            # Unhashable values, like lists or dicts.
+            result.append(_prepare_enum_value(context, prop, enum_options, val))
+    return result
+
+
+def _box_native(value: Any) -> Any:
+    # Same values as `Series.to_dict()` returns for rows of `DataFrame.iterrows()`.
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value)
+    if isinstance(value, np.timedelta64):
+        return pd.Timedelta(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA:
+        return None
+    return value
+
+
+class _Partition:
+    """Computed partition of a dask dataframe.
+
+    Values are boxed the same way as rows of `DataFrame.iterrows()`.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.values = df.values
+        self.columns = list(df.columns)
+        self._box = _box_native if self.values.dtype == object else None
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def has_column(self, name: str) -> bool:
+        return name in self.df.columns
+
+    def column(self, name: str) -> list:
+        values = self.values[:, self.df.columns.get_loc(name)]
+        if self._box:
+            return [self._box(v) for v in values]
+        return values.tolist()
+
+    def row(self, i: int) -> dict:
+        values = self.values[i]
+        if self._box:
+            values = (self._box(v) for v in values)
+        else:
+            values = values.tolist()
+        return dict(zip(self.columns, values))
+
+
+def _get_column_values(context: Context, df: _Partition, sel: Any) -> list | None:
+    """Get values of a selected column for all rows of a partition at once.
+
+    Returns None if selection can only be resolved row by row.
+    """
+    if isinstance(sel, Selected):
+        if isinstance(sel.prep, Expr):
+            return None
+        elif sel.prep is not NA:
+            values = _get_column_values(context, df, sel.prep)
+        elif df.has_column(sel.item):
+            values = df.column(sel.item)
+        else:
+            return None
+
+        if values is not None and (enum_options := get_prop_enum(sel.prop)):
+            values = _map_enum_values(context, sel.prop, enum_options, values)
+        return values
+
+    if isinstance(sel, (tuple, list, dict)):
+        columns = []
+        for v in sel.values() if isinstance(sel, dict) else sel:
+            values = _get_column_values(context, df, v)
+            if values is None:
+                return None
+            columns.append(values)
+        rows = zip(*columns) if columns else (() for _ in range(len(df)))
+        if isinstance(sel, dict):
+            return [dict(zip(sel, row)) for row in rows]
+        return [type(sel)(row) for row in rows]
+
+    return [sel] * len(df)
+
+
 @commands.load.register(Context, DaskBackend, dict)
 def load(context: Context, backend: DaskBackend, config: Dict[str, Any]):
-    pass
+    # Backend configuration takes precedence over global defaults.
+    defaults = context.get("config")
+    backend.concurrency = max(int(config.get("concurrency") or defaults.fetch_concurrency), 1)
+    rate_limit = config.get("rate_limit") or defaults.fetch_rate_limit
+    backend.rate_limiter = RateLimiter(float(rate_limit)) if rate_limit else None
+    backend.chunk_size = max(int(config.get("chunk_size") or defaults.fetch_chunk_size), 1)
+    if defaults.source_cache_size:
+        backend.source_cache = get_source_cache(
+            defaults.data_path / "sources",
+            int(defaults.source_cache_size * 1024 * 1024),
+        )
+    backend.cache_ttl = float(config.get("cache_ttl") or defaults.source_cache_ttl)
 
 
 @commands.prepare.register(Context, DaskBackend, Manifest)
@@ -245,6 +367,14 @@ def parametrize_bases(context: Context, model: Model, resource: Resource, resolv
         yield base
 
 
+def _merge_query(context: Context, model: Model, query: Expr) -> Expr:
+    query = merge_formulas(model.external.prepare, query)
+    query = merge_formulas(query, get_enum_filters(context, model))
+    if context.get("config").check_ref_filters:
+        query = merge_formulas(query, get_ref_filters(context, model))
+    return query
+
+
 def dask_get_all(
     context: Context,
     query: Expr,
@@ -257,33 +387,265 @@ def dask_get_all(
 ):
     params = params or {}
 
-    query = merge_formulas(model.external.prepare, query)
-    query = merge_formulas(query, get_enum_filters(context, model))
-    if context.get("config").check_ref_filters:
-        query = merge_formulas(query, get_ref_filters(context, model))
+    query = _merge_query(context, model, query)
     env = env.init(backend, df, params)
     expr = env.resolve(query)
     where = env.execute(expr)
     qry = env.build(where)
 
+    for df in _iter_partitions(qry, backend):
+        yield from _iter_rows(context, model, backend, env, df, extra_properties)
+
+
+def dask_get_all_chunks(
+    context: Context,
+    query: Expr,
+    chunks: Iterator[pd.DataFrame],
+    backend: DaskBackend,
+    model: Model,
+    env: DaskDataFrameQueryBuilder,
+    extra_properties: dict,
+    params: dict | None = None,
+):
+    """Get all rows from chunks of source rows
+
+    Query is applied to each chunk separately, so only one chunk is held in
+    memory at a time. `limit()`, `offset()` and `count()` are applied to rows
+    of all chunks. `distinct()` needs all rows, so then all chunks are read
+    into a dataframe with one partition per chunk.
+    """
+    params = params or {}
+
+    given = query
+    query = _merge_query(context, model, query)
+    chunks = iter(chunks)
+    builder = env
+    start = 0
+    total = 0
+    for chunk in chunks:
+        # Rows are indexed by their position in all chunks.
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        env = builder.init(backend, chunk, params)
+        expr = env.resolve(query)
+        where = env.execute(expr)
+
+        if env.dataframe is not chunk:
+            # Query has `distinct()`.
+            df = dask.dataframe.concat(
+                [dask.dataframe.from_pandas(c.reset_index(drop=True), npartitions=1) for c in [chunk, *chunks]]
+            )
+            yield from dask_get_all(context, given, df, backend, model, builder, extra_properties, params)
+            return
+
+        limit, offset, count = env.limit, env.offset, env.count
+        env.limit = env.offset = None
+        env.count = False
+        in_range = chunk.index >= (offset or 0)
+        if limit is not None:
+            in_range &= chunk.index < limit
+        in_range = pd.Series(in_range, index=chunk.index)
+        where = in_range if where is None else where & in_range
+        df = env.build(where)
+
+        if count:
+            total += len(df)
+        else:
+            yield from _iter_rows(context, model, backend, env, _Partition(df), extra_properties)
+
+        start += len(chunk)
+        if limit is not None and start >= limit:
+            break
+
+    if count:
+        df = pd.DataFrame({RESERVED_COUNT_PROP: [total]})
+        yield from _iter_rows(context, model, backend, env, _Partition(df), extra_properties)
+
+
+def _iter_rows(
+    context: Context,
+    model: Model,
+    backend: DaskBackend,
+    env: DaskDataFrameQueryBuilder,
+    df: _Partition,
+    extra_properties: dict,
+) -> Iterator[ObjectData]:
     env_selected = env.selected
     list_keys = extract_list_property_names(model, env_selected.keys())
-    for i, row in qry.iterrows():
-        row = row.to_dict()
+
+    # Selected values are computed for whole columns of a partition, only
+    # expressions are resolved row by row.
+    columns = {}
+    for key, sel in env_selected.items():
+        values = _get_column_values(context, df, sel)
+        if values is not None:
+            columns[key] = [_encode_composite_id(model, sel, val) for val in values]
+
+    for i in range(len(df)):
+        row = df.row(i) if len(columns) < len(env_selected) else None
         res = {
             "_type": model.model_type(),
         }
         for key, sel in env_selected.items():
-            val = _get_row_value(context, row, sel, env.params)
-            if sel.prop:
-                if is_custom_id_prop(sel.prop) and isinstance(val, list) and not isinstance(sel.prop.dtype, Base32):
-                    val = encode_composite_string_id(val, model.external.pkeys)
+            if key in columns:
+                val = columns[key][i]
+            else:
+                val = _get_row_value(context, row, sel, env.params)
+                val = _encode_composite_id(model, sel, val)
             res[key] = val
         res = flat_dicts_to_nested(res, list_keys=list_keys)
         res = commands.cast_backend_to_python(context, model, backend, res, extra_properties=extra_properties)
         yield res
 
 
+_CHUNKS_END = object()
+
+
+def _to_dataframe(rows: list[dict[str, Any]], meta: dict[str, str]) -> pd.DataFrame:
+    # Same as `dask.bag.Bag.to_dataframe()` does for each partition.
+    return pd.DataFrame(rows, columns=list(meta)).astype(meta, copy=False)
+
+
+def _read_source_chunks(
+    backend: DaskBackend,
+    source: Any,
+    read: Callable[[Any], Iterable[dict[str, Any]]],
+    meta: dict[str, str],
+) -> Iterator[pd.DataFrame]:
+    if backend.rate_limiter is not None:
+        backend.rate_limiter.wait()
+    rows = iter(read(source))
+    while chunk := list(itertools.islice(rows, backend.chunk_size)):
+        yield _to_dataframe(chunk, meta)
+
+
+def _put_chunk(chunks: queue.Queue, stop: threading.Event, chunk: Any) -> bool:
+    while not stop.is_set():
+        try:
+            chunks.put(chunk, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _put_source_chunks(
+    chunks: queue.Queue,
+    stop: threading.Event,
+    backend: DaskBackend,
+    source: Any,
+    read: Callable[[Any], Iterable[dict[str, Any]]],
+    meta: dict[str, str],
+) -> None:
+    try:
+        for chunk in _read_source_chunks(backend, source, read, meta):
+            if not _put_chunk(chunks, stop, chunk):
+                return
+    finally:
+        _put_chunk(chunks, stop, _CHUNKS_END)
+
+
+def iter_source_chunks(
+    backend: DaskBackend,
+    sources: Iterable[Any],
+    read: Callable[[Any], Iterable[dict[str, Any]]],
+    meta: dict[str, str],
+) -> Iterator[pd.DataFrame]:
+    """Read rows of sources in chunks of at most `backend.chunk_size` rows
+
+    Chunks are returned in source order. Up to `backend.concurrency` sources
+    are read at the same time in a thread pool, each source keeps at most a
+    couple of chunks ahead. At least one, possibly empty, chunk is returned.
+    """
+    empty = True
+    for chunk in _iter_source_chunks(backend, sources, read, meta):
+        empty = False
+        yield chunk
+    if empty:
+        yield _to_dataframe([], meta)
+
+
+def _iter_source_chunks(
+    backend: DaskBackend,
+    sources: Iterable[Any],
+    read: Callable[[Any], Iterable[dict[str, Any]]],
+    meta: dict[str, str],
+) -> Iterator[pd.DataFrame]:
+    sources = iter(sources)
+    if backend.concurrency <= 1:
+        for source in sources:
+            yield from _read_source_chunks(backend, source, read, meta)
+        return
+
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(backend.concurrency, thread_name_prefix="spinta-dask")
+    pending = collections.deque()
+
+    def submit(source: Any) -> None:
+        chunks = queue.Queue(maxsize=2)
+        future = pool.submit(_put_source_chunks, chunks, stop, backend, source, read, meta)
+        pending.append((chunks, future))
+
+    try:
+        for source in itertools.islice(sources, backend.concurrency):
+            submit(source)
+        while pending:
+            chunks, future = pending.popleft()
+            while (chunk := chunks.get()) is not _CHUNKS_END:
+                yield chunk
+            # Raise errors of reading a source.
+            future.result()
+            for source in itertools.islice(sources, 1):
+                submit(source)
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _compute_partition(df: dask.dataframe, i: int, backend: DaskBackend, **kwargs) -> pd.DataFrame:
+    if backend.rate_limiter is not None:
+        backend.rate_limiter.wait()
+    return df.get_partition(i).compute(**kwargs)
+
+
+def _iter_partitions(df: dask.dataframe, backend: DaskBackend) -> Iterator[_Partition]:
+    """Compute partitions one by one or concurrently, in partition order
+
+    Up to `backend.concurrency` partitions are computed ahead in a thread
+    pool. Partitions not yet computed are cancelled, when iteration stops
+    early, for example when client disconnects or `limit()` is reached.
+    """
+    if isinstance(df, pd.DataFrame):
+        yield _Partition(df)
+        return
+
+    if backend.concurrency <= 1 or df.npartitions <= 1:
+        for i in range(df.npartitions):
+            yield _Partition(_compute_partition(df, i, backend))
+        return
+
+    pool = ThreadPoolExecutor(backend.concurrency, thread_name_prefix="spinta-dask")
+    pending = collections.deque()
+    partitions = iter(range(df.npartitions))
+    try:
+        for i in itertools.islice(partitions, backend.concurrency):
+            # Each partition is computed in a single pool thread.
+            pending.append(pool.submit(_compute_partition, df, i, backend, scheduler="sync"))
+        while pending:
+            result = pending.popleft().result()
+            for i in itertools.islice(partitions, 1):
+                pending.append(pool.submit(_compute_partition, df, i, backend, scheduler="sync"))
+            yield _Partition(result)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _encode_composite_id(model: Model, sel: Any, val: Any) -> Any:
+    if isinstance(sel, Selected) and sel.prop:
+        if is_custom_id_prop(sel.prop) and isinstance(val, list) and not isinstance(sel.prop.dtype, Base32):
+            val = encode_composite_string_id(val, model.external.pkeys)
+    return val
+
+
 @commands.wait.register(Context, DaskBackend)
 def wait(context: Context, backend: DaskBackend, *, fail: bool = False) -> bool:
     return True
@@ -1,6 +1,27 @@
 import contextlib
+import threading
+import time
+from typing import Optional
 
-from spinta.datasets.components import ExternalBackend
+from spinta.datasets.backends.dataframe.cache import SourceCache
+from spinta.datasets.components import ExternalBackend, Resource
+
+
+class RateLimiter:
+    """Allow at most `rate` calls per second, shared between threads"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
 
 
 class DaskBackend(ExternalBackend):
@@ -8,6 +29,23 @@ class DaskBackend(ExternalBackend):
 
     query_builder_type = "dask"
 
+    # Number of partitions (one partition per parametrized source) fetched
+    # at the same time.
+    concurrency: int = 1
+    rate_limiter: Optional[RateLimiter] = None
+    # Maximum number of rows of a source read into a single partition.
+    chunk_size: int = 10000
+
+    # Cache of sources fetched over HTTP and default number of seconds a
+    # cached source is used without revalidation.
+    source_cache: Optional[SourceCache] = None
+    cache_ttl: float = 0
+
     @contextlib.contextmanager
     def begin(self):
         yield
+
+    def get_cache_ttl(self, resource: Resource) -> float:
+        if resource.cache_ttl is None:
+            return self.cache_ttl
+        return resource.cache_ttl
@@ -1,11 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import Any
-
-import pandas as pd
-from dask import delayed
-from dask.dataframe import DataFrame, from_delayed
+from typing import TYPE_CHECKING, Any
 
 from spinta.components import Model, Property
 from spinta.core.ufuncs import Env, Expr
@@ -15,6 +11,9 @@ from spinta.ufuncs.propertyresolver.components import PropertyResolver
 from spinta.ufuncs.querybuilder.components import Func, Selected
 from spinta.utils.schema import NA
 
+if TYPE_CHECKING:
+    from dask.dataframe import DataFrame
+
 RESERVED_COUNT_PROP = "__dask_count"
 
 
@@ -55,6 +54,11 @@ class DaskDataFrameQueryBuilder(Env):
             df = df[where]
 
         if self.count:
+            # Imported here, to not import pandas and dask on startup.
+            import pandas as pd
+            from dask import delayed
+            from dask.dataframe import from_delayed
+
             # To only return one row, we need to calculate the count first and then transform it back to dataframe
             # Otherwise iterrows will duplicate the result with the number of rows equal to count.
             # Dask allows delayed calculations which ar lazy.
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
 from functools import reduce
-from typing import Any, Dict, Iterator, List, Tuple
-
-from dask.dataframe import Series
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
 
 from spinta.backends.helpers import is_custom_id_prop, is_custom_revision_prop
 from spinta.components import Property
@@ -38,6 +36,9 @@ from spinta.ufuncs.querybuilder.helpers import process_literal_value
 from spinta.utils.data import take
 from spinta.utils.schema import NA
 
+if TYPE_CHECKING:
+    from dask.dataframe import Series
+
 
 @ufunc.resolver(DaskDataFrameQueryBuilder, Expr)
 def testlist(env: DaskDataFrameQueryBuilder, expr: Expr) -> tuple:
@@ -1,4 +1,4 @@
-from spinta.core.ufuncs import ufunc
+from spinta.core.ufuncs import Expr, ufunc
 from spinta.datasets.backends.dataframe.ufuncs.components import TabularResource
 from spinta.exceptions import UnknownBind
 
@@ -10,3 +10,14 @@ def tabular(env: TabularResource, **kwargs):
             env.seperator = value
         else:
             raise UnknownBind(name=key)
+
+
+@ufunc.resolver(TabularResource, Expr, name="and")
+def and_(env: TabularResource, expr: Expr):
+    expr.resolve(env)
+
+
+@ufunc.resolver(TabularResource)
+def cache(env: TabularResource, **kwargs):
+    # Source cache is configured when resource is linked.
+    pass
@@ -7,6 +7,7 @@ import sqlalchemy as sa
 from spinta import commands
 from spinta.components import Context
 from spinta.datasets.backends.sql.backends.sas.components import SAS
+from spinta.datasets.backends.sql.commands.load import load_schema_cache
 
 logger = logging.getLogger(__name__)
 
@@ -46,3 +47,5 @@ def load(context: Context, backend: SAS, config: Dict[str, Any]):
         if schema and hasattr(backend.engine.dialect, "default_schema_name"):
             backend.engine.dialect.default_schema_name = schema
             logger.debug(f"SAS backend: Set default_schema_name to '{schema}'")
+
+        load_schema_cache(context, backend)
@@ -59,7 +59,7 @@ class SAS(Sql):
             SQLAlchemy Table object
 
         Raises:
-            KeyError: If table not found in schema
+            sqlalchemy.exc.NoSuchTableError: If table not found in database
         """
         name = name or model.external.name
 
@@ -67,22 +67,10 @@ class SAS(Sql):
         effective_schema = self.dbschema or getattr(self.engine.dialect, "default_schema_name", None)
         key = f"{effective_schema}.{name}" if effective_schema else name
 
-        # Create table if not in cache
-        if key not in self.schema.tables:
+        # Reflect table if not in cache
+        table = self.tables.get(key)
+        if table is None or key in self._unchecked:
             if hasattr(self.engine.dialect, "default_schema_name"):
                 self.engine.dialect.default_schema_name = effective_schema
-            sa.Table(name, self.schema, autoload_with=self.engine, schema=effective_schema)
-
-        # Retrieve table with multiple fallback strategies
-        if key in self.schema.tables:
-            return self.schema.tables[key]
-
-        if name in self.schema.tables:
-            return self.schema.tables[name]
-
-        # Last resort: search by name
-        for table_obj in self.schema.tables.values():
-            if table_obj.name == name:
-                return table_obj
-
-        raise KeyError(f"Table '{name}' not found in schema")
+            table = self.reflect_table(key, model)
+        return table
@@ -1,3 +1,5 @@
+import hashlib
+import pathlib
 from typing import Any, Dict
 
 import sqlalchemy as sa
@@ -7,6 +9,18 @@ from spinta.components import Context
 from spinta.datasets.backends.sql.components import Sql
 
 
+def get_schema_cache_path(context: Context, backend: Sql) -> pathlib.Path:
+    config = context.get("config")
+    url = backend.engine.url.render_as_string(hide_password=True)
+    key = hashlib.sha256(f"{backend.type}\n{url}\n{backend.dbschema or ''}".encode()).hexdigest()
+    return config.data_path / "sqlschema" / f"{key}.json"
+
+
+def load_schema_cache(context: Context, backend: Sql) -> None:
+    if context.get("config").sql_schema_cache:
+        backend.load_schema_cache(get_schema_cache_path(context, backend))
+
+
 @commands.load.register(Context, Sql, dict)
 def load(context: Context, backend: Sql, config: Dict[str, Any]):
     dsn = config["dsn"]
@@ -18,3 +32,4 @@ def load(context: Context, backend: Sql, config: Dict[str, Any]):
         backend.engine = sa.create_engine(dsn, echo=False)
         backend.schema = sa.MetaData(backend.engine, schema=schema)
         backend.dbschema = schema
+        load_schema_cache(context, backend)
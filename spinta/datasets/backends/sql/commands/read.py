@@ -9,7 +9,7 @@ from spinta.backends.helpers import (
 from spinta.components import Context, Model, Property
 from spinta.core.ufuncs import Expr
 from spinta.datasets.backends.sql.components import Sql
-from spinta.datasets.backends.sql.helpers import build_row_result, merge_query_with_filters
+from spinta.datasets.backends.sql.helpers import build_row_result, build_row_results, merge_query_with_filters
 from spinta.datasets.helpers import decode_id_value
 from spinta.datasets.keymaps.components import KeyMap
 from spinta.datasets.utils import iterparams
@@ -50,11 +50,9 @@ def getall(
 
         is_page_enabled = env.page.page_.enabled
 
-        for row in conn.execute(qry):
-            res = build_row_result(
-                context, model, backend, row, env, result_builder_getter, extra_properties, is_page_enabled
-            )
-            yield res
+        yield from build_row_results(
+            context, model, backend, conn.execute(qry), env, result_builder_getter, extra_properties, is_page_enabled
+        )
 
 
 @commands.getone.register(Context, Model, Sql)
@@ -1,14 +1,122 @@
 import contextlib
+import json
+import logging
+import os
+import pathlib
+import threading
+import uuid
+from typing import Any, Dict, Optional
 
 import sqlalchemy as sa
+from sqlalchemy.engine import Dialect
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.types import TypeEngine
 
+import spinta
 from spinta import commands
 from spinta.backends.constants import BackendFeatures
 from spinta.components import Model, Property
 from spinta.datasets.components import ExternalBackend
 from spinta.exceptions import BackendUnavailable
 
+log = logging.getLogger(__name__)
+
+# Increase, when format of schema cache changes.
+SCHEMA_CACHE_VERSION = 1
+
+
+def _get_schema_cache_version() -> list:
+    # Type arguments can change between versions of code, so cached tables
+    # are only loaded with the same versions.
+    return [SCHEMA_CACHE_VERSION, spinta.__version__, sa.__version__]
+
+
+def _get_type_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _dump_type(type_: TypeEngine) -> Dict[str, Any]:
+    """Dump type class name, enum values and constructor arguments
+
+    Raises TypeError, if type can't be rebuilt from dumped data.
+    """
+    cls = type(type_)
+    args = {}
+    for name in sorted(sa.util.get_cls_kwargs(cls)):
+        if name.startswith("_") or not hasattr(type_, name):
+            continue
+        value = getattr(type_, name)
+        if isinstance(value, (list, tuple)) and all(isinstance(v, (str, int, float, bool)) for v in value):
+            value = list(value)
+        elif not isinstance(value, (TypeEngine, str, int, float, bool, type(None))):
+            raise TypeError(f"Can't store {name}={value!r} argument of {type_!r} type.")
+        args[name] = value
+
+    # Enum values of `Enum` and MySQL `SET` types are positional arguments.
+    values = getattr(type_, "enums", None) or getattr(type_, "values", None) or []
+    if not isinstance(values, (list, tuple)) or not all(isinstance(v, str) for v in values):
+        raise TypeError(f"Can't store values of {type_!r} type.")
+
+    # State, that is not given as constructor arguments, is lost.
+    if repr(cls(*values, **args)) != repr(type_):
+        raise TypeError(f"Can't rebuild {type_!r} type.")
+
+    return {
+        "type": _get_type_name(cls),
+        "values": list(values),
+        "args": {key: _dump_type(value) if isinstance(value, TypeEngine) else value for key, value in args.items()},
+    }
+
+
+def _load_type(dialect: Dialect, data: Dict[str, Any]) -> TypeEngine:
+    # Only types known to the dialect can be loaded, type names are never
+    # imported.
+    types = {_get_type_name(cls): cls for cls in dialect.ischema_names.values()}
+    cls = types.get(data["type"])
+    if cls is None:
+        raise TypeError(f"Unknown type {data['type']!r}.")
+    args = {
+        key: _load_type(dialect, value) if isinstance(value, dict) else value for key, value in data["args"].items()
+    }
+    return cls(*data["values"], **args)
+
+
+def _dump_table(table: sa.Table) -> Dict[str, Any]:
+    return {
+        "name": table.name,
+        "schema": table.schema,
+        "columns": [
+            {
+                "name": column.name,
+                "type": _dump_type(column.type),
+                "nullable": column.nullable,
+                "primary_key": column.primary_key,
+            }
+            for column in table.columns
+        ],
+    }
+
+
+def _load_table(metadata: sa.MetaData, dialect: Dialect, data: Dict[str, Any]) -> sa.Table:
+    columns = [
+        sa.Column(
+            column["name"],
+            _load_type(dialect, column["type"]),
+            nullable=column["nullable"],
+            primary_key=column["primary_key"],
+        )
+        for column in data["columns"]
+    ]
+    return sa.Table(data["name"], metadata, *columns, schema=data["schema"])
+
+
+def _has_columns(table: sa.Table, model: Model) -> bool:
+    return all(
+        prop.external.name in table.c
+        for prop in model.flatprops.values()
+        if prop.external and isinstance(prop.external.name, str) and prop.external.name
+    )
+
 
 class Sql(ExternalBackend):
     type: str = "sql"
@@ -16,11 +124,27 @@ class Sql(ExternalBackend):
     schema: sa.MetaData = None
     dbschema: str = None  # Database schema name
 
+    # JSON file, where columns of reflected tables are stored between
+    # restarts.
+    schema_cache: Optional[pathlib.Path] = None
+
     features = {BackendFeatures.PAGINATION}
 
     query_builder_type = "sql"
     result_builder_type = "sql"
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Fully reflected tables by table key.
+        self.tables: Dict[str, sa.Table] = {}
+        # Tables loaded from schema cache, that are not yet checked against
+        # model properties.
+        self._unchecked = set()
+        self._reflect_lock = threading.RLock()
+        # Schema cache is written once, when deferred reflection ends.
+        self._defer_save = 0
+        self._schema_changed = False
+
     @contextlib.contextmanager
     def transaction(self, write=False):
         raise NotImplementedError
@@ -52,16 +176,122 @@ class Sql(ExternalBackend):
         else:
             key = name
 
-        if key not in self.schema.tables:
-            schema = None
-            if "." in key:
-                split = key.split(".", 1)
-                schema = split[0]
-                name = split[1]
+        table = self.tables.get(key)
+        if table is None or key in self._unchecked:
+            table = self.reflect_table(key, model)
+        return table
+
+    def reflect_table(self, key: str, model: Model = None, *, refresh: bool = False) -> sa.Table:
+        """Reflect table from database, unless it is already reflected
+
+        Table loaded from schema cache is reflected again, if it does not have
+        columns of a given model, for example when a column was added to
+        database after schema cache was written.
+        """
+        with self._reflect_lock:
+            table = self.schema.tables.get(key)
+            if table is not None and key in self._unchecked and model is not None:
+                self._unchecked.discard(key)
+                refresh = refresh or not _has_columns(table, model)
+
+            if table is not None and refresh:
+                self.schema.remove(table)
+                table = None
+
+            if table is None:
+                schema = None
+                name = key
+                if "." in key:
+                    schema, name = key.split(".", 1)
+                table = sa.Table(name, self.schema, schema=schema, autoload_with=self.engine)
+                self._schema_changed = True
+                if not self._defer_save:
+                    self.save_schema_cache()
+
+            self.tables[key] = table
+            return table
+
+    @contextlib.contextmanager
+    def defer_schema_cache(self):
+        """Write schema cache once, after all tables are reflected"""
+        with self._reflect_lock:
+            self._defer_save += 1
+        try:
+            yield
+        finally:
+            with self._reflect_lock:
+                self._defer_save -= 1
+                if not self._defer_save and self._schema_changed:
+                    self.save_schema_cache()
+
+    def load_schema_cache(self, path: pathlib.Path) -> None:
+        """Load tables reflected by previous processes
+
+        Tables, that can't be loaded, are reflected again when used.
+        """
+        self.schema_cache = path
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            log.warning("Can't read schema cache %s of %r backend: %s", path, self.name, e)
+            return
+
+        if data.get("version") != _get_schema_cache_version():
+            return
+
+        with self._reflect_lock:
+            metadata = sa.MetaData(self.engine, schema=self.schema.schema)
+            for key, table in data["tables"].items():
+                try:
+                    _load_table(metadata, self.engine.dialect, table)
+                except Exception as e:
+                    log.warning("Can't load table %s from schema cache of %r backend: %s", key, self.name, e)
+            self.schema = metadata
+            self.tables = dict(metadata.tables)
+            self._unchecked = set(metadata.tables)
 
-            sa.Table(name, self.schema, schema=schema, autoload_with=self.engine)
+    def save_schema_cache(self) -> None:
+        if self.schema_cache is None:
+            return
+        with self._reflect_lock:
+            self._schema_changed = False
+            tables = {}
+            for key, table in self.schema.tables.items():
+                try:
+                    tables[key] = _dump_table(table)
+                except TypeError as e:
+                    # Table is not stored and will be reflected after restart.
+                    log.debug("Can't store table %s in schema cache of %r backend: %s", key, self.name, e)
+            try:
+                data = json.dumps(
+                    {
+                        "version": _get_schema_cache_version(),
+                        "tables": tables,
+                    }
+                )
+                self.schema_cache.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.schema_cache.with_name(f"{self.schema_cache.name}.{uuid.uuid4().hex}.tmp")
+                tmp.write_text(data)
+                os.replace(tmp, self.schema_cache)
+            except Exception as e:
+                log.warning("Can't write schema cache %s of %r backend: %s", self.schema_cache, self.name, e)
 
-        return self.schema.tables[key]
+    def refresh_schema(self) -> None:
+        """Reflect all previously reflected tables again"""
+        with self._reflect_lock:
+            keys = list(self.tables)
+            self.schema = sa.MetaData(self.engine, schema=self.schema.schema)
+            self.tables = {}
+            self._unchecked = set()
+            with self.defer_schema_cache():
+                for key in keys:
+                    try:
+                        self.reflect_table(key)
+                    except sa.exc.NoSuchTableError:
+                        log.warning("Table %s no longer exists in %r backend.", key, self.name)
+            self.save_schema_cache()
 
     def get_column(self, table: sa.Table, prop: Property, *, select=False, **kwargs) -> sa.Column:
         column = commands.get_column(self, prop, table=table, **kwargs)
@@ -1,4 +1,8 @@
-from typing import Any
+import logging
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import sqlalchemy as sa
 
 from spinta import commands
 from spinta.backends.helpers import is_custom_id_prop, is_custom_revision_prop
@@ -6,14 +10,65 @@ from spinta.components import Context, Model
 from spinta.core.ufuncs import Expr
 from spinta.datasets.backends.sql.components import Sql
 from spinta.datasets.backends.sql.ufuncs.query.components import SqlQueryBuilder
-from spinta.datasets.helpers import encode_composite_string_id, get_enum_filters, get_ref_filters
+from spinta.datasets.helpers import (
+    encode_composite_string_id,
+    get_enum_filters,
+    get_ref_filters,
+    prefetch_keymap_keys,
+)
+from spinta.manifests.components import Manifest
 from spinta.types.datatype import Base32
 from spinta.typing import ObjectData
 from spinta.ufuncs.helpers import merge_formulas
 from spinta.ufuncs.querybuilder.helpers import get_page_values
 from spinta.ufuncs.resultbuilder.helpers import ResultBuilderGetter, get_row_value
+from spinta.utils.itertools import chunks
 from spinta.utils.nestedstruct import extract_list_property_names, flat_dicts_to_nested
 
+log = logging.getLogger(__name__)
+
+
+def get_sql_models(context: Context, manifest: Manifest) -> Dict[str, Tuple[Sql, List[Model]]]:
+    """Group models with a table in an initialized sql backend by backend name"""
+    backends = {}
+    for model in commands.get_models(context, manifest).values():
+        backend = model.backend
+        if isinstance(backend, Sql) and backend.engine is not None and model.external and model.external.name:
+            backends.setdefault(backend.name, (backend, []))[1].append(model)
+    return backends
+
+
+def reflect_tables(backend: Sql, models: List[Model]) -> None:
+    """Reflect tables of given models, writing schema cache once"""
+    with backend.defer_schema_cache():
+        for model in models:
+            try:
+                backend.get_table(model)
+            except sa.exc.OperationalError as e:
+                log.warning("Can't reflect tables of %r backend: %s", backend.name, e)
+                return
+            except Exception as e:
+                log.warning("Can't reflect table of %r model: %s", model.name, e)
+
+
+def warm_up_schema(context: Context, manifest: Manifest) -> List[threading.Thread]:
+    """Reflect tables of sql backends in background threads
+
+    Tables are reflected on startup instead of on the first request to each
+    model. One thread is started for each backend.
+    """
+    threads = []
+    for backend, models in get_sql_models(context, manifest).values():
+        thread = threading.Thread(
+            target=reflect_tables,
+            args=(backend, models),
+            name=f"spinta-schema-{backend.name}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
 
 def merge_query_with_filters(context: Context, model: Model, request_query: Expr | None = None) -> Expr:
     query = merge_formulas(model.external.prepare, request_query)
@@ -23,6 +78,29 @@ def merge_query_with_filters(context: Context, model: Model, request_query: Expr
     return query
 
 
+# Number of rows, which keymap keys are encoded at once.
+KEYMAP_BATCH_SIZE = 1000
+
+
+def build_row_results(
+    context: Context,
+    model: Model,
+    backend: Sql,
+    rows: Iterable[Any],
+    env: SqlQueryBuilder,
+    result_builder_getter: ResultBuilderGetter,
+    extra_properties: dict | None = None,
+    include_page: bool = False,
+) -> Iterator[ObjectData]:
+    for batch in chunks(iter(rows), KEYMAP_BATCH_SIZE):
+        results = [
+            _build_raw_row_result(context, model, row, env, result_builder_getter, include_page) for row in batch
+        ]
+        prefetch_keymap_keys(context, model, backend, results)
+        for res in results:
+            yield commands.cast_backend_to_python(context, model, backend, res, extra_properties=extra_properties)
+
+
 def build_row_result(
     context: Context,
     model: Model,
@@ -33,6 +111,18 @@ def build_row_result(
     extra_properties: dict | None = None,
     include_page: bool = False,
 ) -> ObjectData:
+    res = _build_raw_row_result(context, model, row, env, result_builder_getter, include_page)
+    return commands.cast_backend_to_python(context, model, backend, res, extra_properties=extra_properties)
+
+
+def _build_raw_row_result(
+    context: Context,
+    model: Model,
+    row: Any,
+    env: SqlQueryBuilder,
+    result_builder_getter: ResultBuilderGetter,
+    include_page: bool = False,
+) -> dict:
     env_selected = env.selected
     list_keys = extract_list_property_names(model, env_selected.keys())
 
@@ -52,5 +142,4 @@ def build_row_result(
         res["_page"] = get_page_values(env, row)
 
     res["_type"] = model.model_type()
-    res = flat_dicts_to_nested(res, list_keys=list_keys)
-    return commands.cast_backend_to_python(context, model, backend, res, extra_properties=extra_properties)
+    return flat_dicts_to_nested(res, list_keys=list_keys)
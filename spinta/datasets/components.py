@@ -117,6 +117,9 @@ class Resource(External):
     params: List[Param]
     source_params: set
     source_type: str
+    # Number of seconds a cached source of this resource is used without
+    # revalidation, set with `cache(ttl: seconds)` in resource prepare.
+    cache_ttl: Optional[float] = None
 
     schema = {
         "type": {"type": "string"},
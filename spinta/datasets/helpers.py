@@ -7,12 +7,13 @@ from spinta import commands, exceptions
 from spinta.auth import authorized
 from spinta.backends import Backend
 from spinta.backends.constants import BackendOrigin
-from spinta.backends.helpers import check_if_model_primary_key_is_composite, load_backend
+from spinta.backends.helpers import check_if_model_primary_key_is_composite, is_custom_id_prop, load_backend
 from spinta.components import Context, Model, Namespace, Property, ScopeFormatterFunc
 from spinta.core.enums import Action
 from spinta.core.ufuncs import Expr, ShortExpr
 from spinta.datasets.backends.helpers import flatten_keymap_encoding_values
 from spinta.datasets.components import Resource
+from spinta.datasets.enums import ExternalIdPattern
 from spinta.datasets.keymaps.components import KeyMap
 from spinta.dimensions.enum.helpers import get_prop_enum
 from spinta.exceptions import GivenValueCountMissmatch, PropertyNotFound, ValuesForIdCantHaveSpecialSymbols
@@ -247,6 +248,41 @@ def extract_and_cast_properties_from_list(
     return result
 
 
+def prefetch_keymap_keys(
+    context: Context,
+    model: Model,
+    backend: Backend,
+    rows: List[dict],
+) -> None:
+    """Encode primary keys of many rows with a single keymap call.
+
+    Encoded keys end up in the keymap cache, so casting rows one by one later
+    does not query the keymap again.
+    """
+    if len(rows) < 2 or is_custom_id_prop(model.id_prop):
+        return
+
+    # Keys of models with an identifiable base are seeded by the base key.
+    if model.base and commands.identifiable(model.base):
+        return
+
+    id_key = ExternalIdPattern.ID_KEY.value
+    pk_data = [row[id_key][id_key] for row in rows if isinstance(row.get(id_key), dict) and row[id_key].get(id_key)]
+    if not pk_data:
+        return
+
+    keymap: KeyMap = context.get(f"keymap.{model.keymap.name}")
+    if not keymap.cache_size:
+        return
+
+    values = []
+    for data in pk_data:
+        value = process_data_for_pkey(context=context, backend=backend, model=model, keymap=keymap, data=data)
+        if value is not None:
+            values.append(value)
+    keymap.encode_many(model.model_type(), values)
+
+
 def process_data_for_pkey(
     context: Context,
     backend: Backend,
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, ContextManager, List, Optional
 
 from spinta.components import Component
 
 
 class KeyMap(Component):
     name: str = None
+    # Number of recently used mappings kept in memory for each key
+    cache_size: int = 0
 
     def encode(self, name: str, value: Any, primary_key: Optional[str] = None) -> Optional[str]:
         """From external to internal."""
@@ -18,6 +21,14 @@ class KeyMap(Component):
         """From internal to external."""
         raise NotImplementedError
 
+    def encode_many(self, name: str, values: List[Any]) -> List[Optional[str]]:
+        """Same as `encode`, but for many values at once, keys are returned in the same order."""
+        return [self.encode(name, value) for value in values]
+
+    def decode_many(self, name: str, keys: List[str]) -> List[object]:
+        """Same as `decode`, but for many keys at once, values are returned in the same order."""
+        return [self.decode(name, key) for key in keys]
+
     def contains(self, name: str, value: Any) -> bool:
         raise NotImplementedError
 
@@ -34,6 +45,15 @@ class KeyMap(Component):
         """Check if data inside keymap exists if do not - import."""
         raise NotImplementedError
 
+    def synchronize_many(self, data: List[KeymapSyncData]):
+        """Same as `synchronize`, but for many rows at once."""
+        for row in data:
+            self.synchronize(row)
+
+    def transaction(self) -> ContextManager:
+        """Writes made inside are committed at once, if keymap supports it."""
+        return contextlib.nullcontext()
+
     def validate_data(self, name: str):
         raise NotImplementedError
 
@@ -1,4 +1,6 @@
-from typing import Any, Generator
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Generator, Optional
 
 
 def prepare_keymap_values(value: Any) -> Any | list[Any]:
@@ -17,3 +19,72 @@ def _extract_items_from_source(source: Any) -> Generator[Any, None, None]:
             yield from _extract_items_from_source(item)
     else:
         yield source
+
+
+class KeymapCache:
+    """Bounded LRU cache of serialized value <-> key mappings.
+
+    Each keymap name gets its own cache of at most `size` entries in each
+    direction. `size` of 0 disables caching.
+
+    Cache is process-wide: keymap copies, made for each request, share the
+    cache of the keymap they were copied from.
+
+    Keymap can be synchronized by another process, for example with
+    `spinta keymap sync`, so keymaps pass state of their sync data to
+    `validate` each time they are opened and the cache is cleared, when
+    it changes.
+    """
+
+    def __init__(self, size: int = 0):
+        self.size = size
+        self._generation: Any = None
+        self._keys: Dict[str, OrderedDict] = {}  # name -> {value: key}
+        self._values: Dict[str, OrderedDict] = {}  # name -> {key: value}
+        self._lock = threading.Lock()
+
+    def get_key(self, name: str, value: str) -> Optional[str]:
+        return self._get(self._keys, name, value)
+
+    def get_value(self, name: str, key: str) -> Optional[str]:
+        return self._get(self._values, name, key)
+
+    def set(self, name: str, value: str, key: str) -> None:
+        if not self.size:
+            return
+        with self._lock:
+            self._set(self._keys, name, value, key)
+            self._set(self._values, name, key, value)
+
+    def validate(self, generation: Any) -> None:
+        with self._lock:
+            if generation != self._generation:
+                self._keys.clear()
+                self._values.clear()
+                self._generation = generation
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._keys.clear()
+                self._values.clear()
+            else:
+                self._keys.pop(name, None)
+                self._values.pop(name, None)
+
+    def _get(self, cache: Dict[str, OrderedDict], name: str, item: str) -> Optional[str]:
+        if not self.size:
+            return None
+        with self._lock:
+            entries = cache.get(name)
+            if entries is None or item not in entries:
+                return None
+            entries.move_to_end(item)
+            return entries[item]
+
+    def _set(self, cache: Dict[str, OrderedDict], name: str, item: str, result: str) -> None:
+        entries = cache.setdefault(name, OrderedDict())
+        entries[item] = result
+        entries.move_to_end(item)
+        if len(entries) > self.size:
+            entries.popitem(last=False)
@@ -2,9 +2,8 @@ import datetime
 import json
 import uuid
 from collections import Counter
-from collections.abc import Generator
 from copy import copy
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from redis import Redis
 from typer import echo
@@ -13,20 +12,24 @@ from spinta import commands
 from spinta.components import Context
 from spinta.core.config import RawConfig
 from spinta.datasets.keymaps.components import KeyMap, KeymapSyncData
+from spinta.datasets.keymaps.helpers import KeymapCache
 from spinta.exceptions import KeymapDuplicateMapping, KeyMapGivenKeyMissmatch
 
 
 class RedisKeyMap(KeyMap):
     dsn: Optional[str] = None
     duplicate_warn_only: bool = False
-    sync_transaction_size: Optional[int] = None
 
-    def __init__(self, dsn: Optional[str] = None):
+    def __init__(self, dsn: Optional[str] = None, cache_size: int = 0):
         self.dsn = dsn
+        self.cache_size = cache_size
+        self.cache = KeymapCache(cache_size)
 
     def __enter__(self):
         assert self.dsn is not None
         self.redis = Redis.from_url(self.dsn, decode_responses=True)
+        if self.cache_size:
+            self.cache.validate(self._get_sync_generation())
         return self
 
     def __exit__(self, *exc):
@@ -34,7 +37,8 @@ class RedisKeyMap(KeyMap):
 
     def copy(self) -> "RedisKeyMap":
         copied = copy(self)
-        # Reset any context manager variables
+        # Reset any context manager variables, cache is shared between copies,
+        # so that it outlives a request.
         copied.redis = None
         return copied
 
@@ -62,8 +66,9 @@ class RedisKeyMap(KeyMap):
         value_table_name = self._get_value_table_name(name)
         key_table_name = self._get_key_table_name(name)
 
-        current_key = self.redis.hget(value_table_name, serialized)
+        current_key = self.cache.get_key(name, serialized) or self.redis.hget(value_table_name, serialized)
         if current_key:
+            self.cache.set(name, serialized, current_key)
             if primary_key is None:
                 return current_key
             if current_key != primary_key:
@@ -73,16 +78,68 @@ class RedisKeyMap(KeyMap):
         key = primary_key or str(uuid.uuid4())
         self.redis.hset(value_table_name, serialized, key)
         self.redis.hset(key_table_name, key, serialized)
+        self.cache.set(name, serialized, key)
         return key
 
+    def encode_many(self, name: str, values: List[Any]) -> List[Optional[str]]:
+        serialized = [json.dumps(value, sort_keys=True) if value is not None else None for value in values]
+
+        keys = {}
+        lookup = []
+        for item in dict.fromkeys(s for s in serialized if s is not None):
+            key = self.cache.get_key(name, item)
+            if key is None:
+                lookup.append(item)
+            else:
+                keys[item] = key
+
+        missing = {}
+        if lookup:
+            for item, key in zip(lookup, self.redis.hmget(self._get_value_table_name(name), lookup)):
+                if key:
+                    keys[item] = key
+                else:
+                    missing[item] = str(uuid.uuid4())
+
+        if missing:
+            pipeline = self.redis.pipeline(transaction=True)
+            pipeline.hset(self._get_value_table_name(name), mapping=missing)
+            pipeline.hset(self._get_key_table_name(name), mapping={key: item for item, key in missing.items()})
+            pipeline.execute()
+            keys.update(missing)
+
+        for item, key in keys.items():
+            self.cache.set(name, item, key)
+
+        return [keys[item] if item is not None else None for item in serialized]
+
     def decode(self, name: str, key: str) -> Optional[object]:
-        serialized = self.redis.hget(self._get_key_table_name(name), key)
+        serialized = self.cache.get_value(name, key) or self.redis.hget(self._get_key_table_name(name), key)
         return json.loads(serialized) if serialized is not None else None
 
+    def decode_many(self, name: str, keys: List[str]) -> List[Optional[object]]:
+        values = {}
+        lookup = []
+        for key in dict.fromkeys(keys):
+            serialized = self.cache.get_value(name, key)
+            if serialized is None:
+                lookup.append(key)
+            else:
+                values[key] = serialized
+
+        if lookup:
+            for key, serialized in zip(lookup, self.redis.hmget(self._get_key_table_name(name), lookup)):
+                if serialized is not None:
+                    values[key] = serialized
+
+        return [json.loads(values[key]) if key in values else None for key in keys]
+
     def contains(self, name: str, value: Any) -> bool:
         if value is None:
             return False
         serialized = json.dumps(value, sort_keys=True)
+        if self.cache.get_key(name, serialized) is not None:
+            return True
         return self.redis.hexists(self._get_value_table_name(name), serialized)
 
     def has_synced_before(self) -> bool:
@@ -93,6 +150,10 @@ class RedisKeyMap(KeyMap):
             return json.loads(last_sync_record).get("cid")
         return None
 
+    def _get_sync_generation(self) -> tuple:
+        # Sync data is updated each time synchronized changes are written.
+        return tuple(sorted(self.redis.hgetall(self._get_sync_table_name()).items()))
+
     def update_sync_data(self, name: str, cid: Any, time: datetime.datetime) -> None:
         data = json.dumps(
             {
@@ -103,30 +164,43 @@ class RedisKeyMap(KeyMap):
         self.redis.hset(self._get_sync_table_name(), key=name, value=data)
 
     def synchronize(self, data: KeymapSyncData) -> None:
-        name = data.name
-        key = data.identifier
-        redirect = data.redirect
-        value = data.value
-        modified_at = data.data.get("_created")
-
-        metadata_table_name = self._get_metadata_table_name(name)
-
-        if value:
-            value_table_name = self._get_value_table_name(name)
-            key_table_name = self._get_key_table_name(name)
-
-            serialized_value = json.dumps(value, sort_keys=True)
-
-            self.redis.hset(value_table_name, serialized_value, key)
-            self.redis.hset(key_table_name, key, serialized_value)
-        existing_metadata = self.redis.hget(metadata_table_name, key)
-        metadata = json.loads(existing_metadata) if existing_metadata else {}
-        if modified_at:
-            metadata["modified_at"] = json.dumps(modified_at)
-        if redirect:
-            metadata["redirect"] = json.dumps(redirect)
-        if metadata:
-            self.redis.hset(metadata_table_name, key, json.dumps(metadata, sort_keys=True))
+        self.synchronize_many([data])
+
+    def synchronize_many(self, data: List[KeymapSyncData]) -> None:
+        # Existing metadata of all rows is read at once, and all changes are
+        # written with a single pipeline.
+        metadata_keys = {}
+        for row in data:
+            metadata_keys.setdefault(row.name, {})[row.identifier] = None
+        metadata = {}
+        for name, keys in metadata_keys.items():
+            # Synchronization can change or redirect existing mappings.
+            self.cache.invalidate(name)
+            keys = list(keys)
+            for key, existing in zip(keys, self.redis.hmget(self._get_metadata_table_name(name), keys)):
+                metadata[name, key] = json.loads(existing) if existing else {}
+
+        pipeline = self.redis.pipeline(transaction=True)
+        for row in data:
+            name = row.name
+            key = row.identifier
+            redirect = row.redirect
+            value = row.value
+            modified_at = row.data.get("_created")
+
+            if value:
+                serialized_value = json.dumps(value, sort_keys=True)
+                pipeline.hset(self._get_value_table_name(name), serialized_value, key)
+                pipeline.hset(self._get_key_table_name(name), key, serialized_value)
+
+            row_metadata = metadata[name, key]
+            if modified_at:
+                row_metadata["modified_at"] = json.dumps(modified_at)
+            if redirect:
+                row_metadata["redirect"] = json.dumps(redirect)
+            if row_metadata:
+                pipeline.hset(self._get_metadata_table_name(name), key, json.dumps(row_metadata, sort_keys=True))
+        pipeline.execute()
 
     def validate_data(self, name: str) -> None:
         value_table_name = self._get_value_table_name(name)
@@ -155,9 +229,10 @@ class RedisKeyMap(KeyMap):
 def configure(context: Context, keymap: RedisKeyMap) -> None:
     rc: RawConfig = context.get("rc")
 
-    keymap.sync_transaction_size = rc.get("keymaps", keymap.name, "sync_transaction_size", default=10000, cast=int)
     keymap.duplicate_warn_only = rc.get("keymaps", keymap.name, "duplicate_warn_only", default=False, cast=bool)
     keymap.dsn = rc.get("keymaps", keymap.name, "dsn", required=True)
+    keymap.cache_size = rc.get("keymaps", keymap.name, "cache_size", default=10000, cast=int)
+    keymap.cache = KeymapCache(keymap.cache_size)
 
 
 @commands.prepare.register(Context, RedisKeyMap)
@@ -167,23 +242,3 @@ def prepare(context: Context, keymap: RedisKeyMap, **kwargs) -> None:
         keymap.redis.ping()
     except Exception as e:
         raise RuntimeError(f"Failed to connect to Redis at {keymap.dsn}: {e}")
-
-
-@commands.sync.register(Context, RedisKeyMap)
-def sync(context: Context, keymap: RedisKeyMap, *, data: Generator[KeymapSyncData]) -> None:
-    transaction_size = keymap.sync_transaction_size
-    pipeline = keymap.redis.pipeline(transaction=True)
-    count = 0
-
-    try:
-        for row in data:
-            keymap.synchronize(row)
-            count += 1
-            if transaction_size and count >= transaction_size:
-                pipeline.execute()
-                pipeline = keymap.redis.pipeline(transaction=True)
-                count = 0
-            yield row
-    finally:
-        if count > 0:
-            pipeline.execute()
@@ -1,11 +1,11 @@
 import datetime
 import decimal
 import hashlib
+import itertools
 import json
 import uuid
-from collections.abc import Generator
 from copy import copy
-from typing import Any, Optional
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
 from uuid import UUID
 
 import msgpack
@@ -22,31 +22,38 @@ from spinta.cli.helpers.upgrade.registry import upgrade_script_registry
 from spinta.components import Config, Context
 from spinta.core.config import RawConfig
 from spinta.datasets.keymaps.components import KeyMap, KeymapSyncData
-from spinta.datasets.keymaps.helpers import prepare_keymap_values
+from spinta.datasets.keymaps.helpers import KeymapCache, prepare_keymap_values
 from spinta.exceptions import KeymapDuplicateMapping, KeyMapGivenKeyMissmatch, KeymapMigrationRequired
+from spinta.utils.itertools import chunks
 from spinta.utils.json import fix_data_for_json
 
+# Max number of values looked up with a single `IN (...)` query.
+LOOKUP_BATCH_SIZE = 500
+
 
 class SqlAlchemyKeyMap(KeyMap):
     dsn: str = None
 
     migration_table_name: str = "_migrations"
     sync_table_name: str = "_synchronize"
-    sync_transaction_size: int = None
 
     # On duplicate validation warn only, instead of raise error
     duplicate_warn_only: bool = False
 
-    def __init__(self, dsn: str = None):
+    def __init__(self, dsn: str = None, cache_size: int = 0):
         self.dsn = dsn
         self.engine = None
         self.metadata = None
         self.conn = None
+        self.cache_size = cache_size
+        self.cache = KeymapCache(cache_size)
 
     def __enter__(self):
         assert self.dsn is not None
         assert self.conn is None
         self.conn = self.engine.connect()
+        if self.cache_size:
+            self.cache.validate(self._get_sync_generation())
         return self
 
     def __exit__(self, *exc):
@@ -55,7 +62,8 @@ class SqlAlchemyKeyMap(KeyMap):
 
     def copy(self) -> "SqlAlchemyKeyMap":
         copied = copy(self)
-        # Reset any context manager variables
+        # Reset any context manager variables, cache is shared between copies,
+        # so that it outlives a request.
         copied.conn = None
         return copied
 
@@ -71,13 +79,17 @@ class SqlAlchemyKeyMap(KeyMap):
             return None
 
         prepared_value = prepare_value(value)
-        table = self.get_table(name)
-        current_key = self.conn.execute(
-            sa.select([table.c.key])
-            .where(sa.and_(table.c.value == prepared_value, table.c.redirect.is_(None)))
-            .order_by(table.c.modified_at.desc())
-            .limit(1)
-        ).scalar()
+        current_key = self.cache.get_key(name, prepared_value)
+        if current_key is None:
+            table = self.get_table(name)
+            current_key = self.conn.execute(
+                sa.select([table.c.key])
+                .where(sa.and_(table.c.value == prepared_value, table.c.redirect.is_(None)))
+                .order_by(table.c.modified_at.desc())
+                .limit(1)
+            ).scalar()
+            if current_key is not None:
+                self.cache.set(name, prepared_value, current_key)
 
         # Key was found in the table and no primary was given
         if current_key is not None and primary_key is None:
@@ -96,30 +108,103 @@ class SqlAlchemyKeyMap(KeyMap):
         if current_key is None:
             current_key = str(uuid.uuid4())
 
-        self.conn.execute(
-            table.insert(),
-            {
-                "key": current_key,
-                "value": prepared_value,
-                "redirect": None,
-                "modified_at": datetime.datetime.now(),
-            },
-        )
+        self._insert_keys(name, {prepared_value: current_key})
         return current_key
 
+    def encode_many(self, name: str, values: List[Any]) -> List[Optional[str]]:
+        prepared_values = [prepare_value(value) if _valid_keymap_value(value) else None for value in values]
+        keys = self._lookup_keys(name, {value for value in prepared_values if value is not None})
+
+        missing = {}
+        for prepared_value in prepared_values:
+            if prepared_value is not None and prepared_value not in keys and prepared_value not in missing:
+                missing[prepared_value] = str(uuid.uuid4())
+        if missing:
+            self._insert_keys(name, missing)
+            keys.update(missing)
+
+        return [keys[value] if value is not None else None for value in prepared_values]
+
     def decode(self, name: str, key: str) -> object:
-        table = self.get_table(name)
-        query = sa.select([table.c.value]).where(table.c.key == key)
-        value = self.conn.execute(query).scalar()
+        value = self.cache.get_value(name, key)
+        if value is None:
+            table = self.get_table(name)
+            query = sa.select([table.c.value]).where(table.c.key == key)
+            value = self.conn.execute(query).scalar()
         return json.loads(value)
 
+    def decode_many(self, name: str, keys: List[str]) -> List[object]:
+        values = {}
+        missing = []
+        for key in set(keys):
+            value = self.cache.get_value(name, key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+
+        if missing:
+            table = self.get_table(name)
+            for batch in chunks(iter(missing), LOOKUP_BATCH_SIZE):
+                query = sa.select([table.c.key, table.c.value]).where(table.c.key.in_(batch))
+                for row in self.conn.execute(query):
+                    values[row[table.c.key]] = row[table.c.value]
+
+        return [json.loads(values[key]) if key in values else None for key in keys]
+
+    def _lookup_keys(self, name: str, prepared_values: set) -> Dict[str, str]:
+        keys = {}
+        missing = []
+        for prepared_value in prepared_values:
+            key = self.cache.get_key(name, prepared_value)
+            if key is None:
+                missing.append(prepared_value)
+            else:
+                keys[prepared_value] = key
+
+        if missing:
+            table = self.get_table(name)
+            for batch in chunks(iter(missing), LOOKUP_BATCH_SIZE):
+                # Same as in `encode`, most recently modified key wins.
+                query = (
+                    sa.select([table.c.key, table.c.value])
+                    .where(sa.and_(table.c.value.in_(batch), table.c.redirect.is_(None)))
+                    .order_by(table.c.modified_at.asc())
+                )
+                found = {row[table.c.value]: row[table.c.key] for row in self.conn.execute(query)}
+                for prepared_value, key in found.items():
+                    self.cache.set(name, prepared_value, key)
+                keys.update(found)
+        return keys
+
+    def _insert_keys(self, name: str, keys: Dict[str, str]) -> None:
+        table = self.get_table(name)
+        modified_at = datetime.datetime.now()
+        self.conn.execute(
+            table.insert(),
+            [
+                {
+                    "key": key,
+                    "value": prepared_value,
+                    "redirect": None,
+                    "modified_at": modified_at,
+                }
+                for prepared_value, key in keys.items()
+            ],
+        )
+        for prepared_value, key in keys.items():
+            self.cache.set(name, prepared_value, key)
+
     def contains(self, name: str, value: Any) -> bool:
         valid_value = _valid_keymap_value(value)
         if not valid_value:
             return False
 
-        table = self.get_table(name)
         prepared_value = prepare_value(value)
+        if self.cache.get_key(name, prepared_value) is not None:
+            return True
+
+        table = self.get_table(name)
         query = sa.select([sa.func.count()]).where(table.c.value == prepared_value)
         return self.conn.execute(query).scalar() > 0
 
@@ -129,6 +214,12 @@ class SqlAlchemyKeyMap(KeyMap):
         value = self.conn.execute(query).scalar()
         return value
 
+    def _get_sync_generation(self) -> tuple:
+        # Sync data is updated each time synchronized changes are committed.
+        table = self.get_table(self.sync_table_name)
+        query = sa.select([sa.func.count(table.c.model), sa.func.max(table.c.updated)])
+        return tuple(self.conn.execute(query).one())
+
     def update_sync_data(self, name: str, cid: Any, time: datetime.datetime):
         table = self.get_table(self.sync_table_name)
         query = insert(table).values(model=name, cid=cid, updated=time)
@@ -136,6 +227,9 @@ class SqlAlchemyKeyMap(KeyMap):
         self.conn.execute(query)
 
     def synchronize(self, data: KeymapSyncData):
+        # Synchronization can change or redirect existing mappings.
+        self.cache.invalidate(data.name)
+
         # TODO Backwards compatibility, should remove, when models without primary key are reworked
         if not data.identifiable:
             self.__legacy_synchronize(data)
@@ -146,9 +240,7 @@ class SqlAlchemyKeyMap(KeyMap):
         redirect = data.redirect
         value_ = data.value
         prepared_value = prepare_value(value_)
-        modified = data.data.get("_created")
-        if modified is not None:
-            modified = datetime.datetime.fromisoformat(modified)
+        modified = _get_modified_at(data)
 
         # Redirect id to another
         if redirect is not None:
@@ -193,9 +285,7 @@ class SqlAlchemyKeyMap(KeyMap):
         id_ = data.identifier
         redirect = data.redirect
         value_ = data.value
-        modified = data.data.get("_created")
-        if modified is not None:
-            modified = datetime.datetime.fromisoformat(modified)
+        modified = _get_modified_at(data)
 
         if redirect is not None:
             return
@@ -225,6 +315,54 @@ class SqlAlchemyKeyMap(KeyMap):
             query = insert(table).values(key=id_, value=prepared_value, redirect=redirect, modified_at=modified)
             self.conn.execute(query)
 
+    def synchronize_many(self, data: List[KeymapSyncData]):
+        # Consecutive rows of the same kind are written with a single
+        # executemany call, keeping the order of changes.
+        for (kind, name), group in itertools.groupby(data, key=_get_sync_kind):
+            group = list(group)
+            if kind == "legacy":
+                for row in group:
+                    self.synchronize(row)
+                continue
+
+            self.cache.invalidate(name)
+            table = self.get_table(name)
+            if kind == "redirect":
+                query = (
+                    table.update()
+                    .where(table.c.key == sa.bindparam("_key"))
+                    .values(redirect=sa.bindparam("_redirect"), modified_at=sa.bindparam("_modified_at"))
+                )
+                params = [
+                    {"_key": row.identifier, "_redirect": row.redirect, "_modified_at": _get_modified_at(row)}
+                    for row in group
+                ]
+            else:
+                query = insert(table)
+                query = query.on_conflict_do_update(
+                    index_elements=[table.c.key],
+                    set_={
+                        "value": query.excluded.value,
+                        "redirect": None,
+                        "modified_at": query.excluded.modified_at,
+                    },
+                )
+                params = [
+                    {
+                        "key": row.identifier,
+                        "value": prepare_value(row.value),
+                        "redirect": None,
+                        "modified_at": _get_modified_at(row),
+                    }
+                    for row in group
+                    if _valid_keymap_value(row.value)
+                ]
+            if params:
+                self.conn.execute(query, params)
+
+    def transaction(self) -> ContextManager:
+        return self.conn.begin()
+
     def has_synced_before(self) -> bool:
         table = self.get_table(self.sync_table_name)
         count = self.conn.execute(sa.func.count(table.c.model)).scalar()
@@ -312,6 +450,22 @@ class SqlAlchemyKeyMap(KeyMap):
         return table
 
 
+def _get_sync_kind(data: KeymapSyncData) -> Tuple[str, str]:
+    # TODO Backwards compatibility, should remove, when models without primary key are reworked
+    if not data.identifiable:
+        return "legacy", data.name
+    if data.redirect is not None:
+        return "redirect", data.name
+    return "upsert", data.name
+
+
+def _get_modified_at(data: KeymapSyncData) -> Optional[datetime.datetime]:
+    modified = data.data.get("_created")
+    if modified is not None:
+        modified = datetime.datetime.fromisoformat(modified)
+    return modified
+
+
 def _valid_keymap_value(value: object) -> bool:
     if value is None:
         return False
@@ -373,14 +527,14 @@ def configure(context: Context, keymap: SqlAlchemyKeyMap):
     rc: RawConfig = context.get("rc")
     config: Config = context.get("config")
     dsn = rc.get("keymaps", keymap.name, "dsn", required=True)
-    sync_transaction_size = rc.get("keymaps", keymap.name, "sync_transaction_size", default=10000, cast=int)
     ensure_data_dir(config.data_path)
     dsn = dsn.format(data_dir=config.data_path)
     if dsn.startswith("sqlite:///"):
         dsn = dsn.replace("sqlite:///", "sqlite+spinta:///")
-    keymap.sync_transaction_size = sync_transaction_size
     keymap.dsn = dsn
     keymap.duplicate_warn_only = rc.get("keymaps", keymap.name, "duplicate_warn_only", cast=bool, default=False)
+    keymap.cache_size = rc.get("keymaps", keymap.name, "cache_size", default=10000, cast=int)
+    keymap.cache = KeymapCache(keymap.cache_size)
 
 
 @commands.prepare.register(Context, SqlAlchemyKeyMap)
@@ -395,26 +549,6 @@ def prepare(context: Context, keymap: SqlAlchemyKeyMap, **kwargs):
         validate_migrations(context, keymap)
 
 
-@commands.sync.register(Context, SqlAlchemyKeyMap)
-def sync(context: Context, keymap: SqlAlchemyKeyMap, *, data: Generator[KeymapSyncData]):
-    transaction_size = keymap.sync_transaction_size
-    transaction = None
-    try:
-        transaction = keymap.conn.begin()
-        for i, row in enumerate(data):
-            if transaction_size is not None and i % transaction_size == 0 and i != 0:
-                if transaction.is_active:
-                    transaction.commit()
-
-                transaction = keymap.conn.begin()
-
-            keymap.synchronize(row)
-            yield row
-    finally:
-        if transaction is not None and transaction.is_active:
-            transaction.commit()
-
-
 def validate_migrations(context: Context, keymap: SqlAlchemyKeyMap):
     config = context.get("config")
     if config.upgrade_mode:
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import datetime
 from collections.abc import Generator
-from typing import Iterable, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List
 
 import tqdm
 
-from spinta import commands
 from spinta.auth import authorized
 from spinta.cli.helpers.errors import ErrorCounter
 from spinta.cli.helpers.message import cli_message
@@ -25,7 +25,7 @@ def _build_changelog_url(server: str, model: str, offset_cid: int, limit: int) -
     return url
 
 
-def _fetch_changelog_data(
+def _fetch_changelog_pages(
     config: Config,
     model: Model,
     client,
@@ -37,36 +37,37 @@ def _fetch_changelog_data(
     delay_range: tuple[float],
     *,
     progress_bar: tqdm.tqdm = None,
-):
+) -> Iterator[List[dict]]:
     limit = config.sync_page_size
-    offset = offset_cid
-    while True:
+
+    def fetch(offset: int):
         url = _build_changelog_url(server=server, model=model.model_type(), offset_cid=offset, limit=limit)
-        status_code, resp = get_request_with_retries(
+        return get_request_with_retries(
             client, url, error_counter=error_counter, timeout=timeout, retries=retries, delay_range=delay_range
         )
-        if status_code != 200:
-            cli_message(
-                f'ERROR: Failed to fetch changelog data for model {model.model_type()}. Using "{server}" url.',
-                progress_bar,
-            )
-            break
 
-        data = resp.get("_data")
-        if not data:
-            break
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, offset_cid)
+        while future is not None:
+            status_code, resp = future.result()
+            future = None
+            if status_code != 200:
+                cli_message(
+                    f'ERROR: Failed to fetch changelog data for model {model.model_type()}. Using "{server}" url.',
+                    progress_bar,
+                )
+                break
 
-        cid = offset
-        i = 0
-        for i, row in enumerate(data, start=1):
-            cid = row["_cid"]
-            yield row
+            data = resp.get("_data")
+            if not data:
+                break
 
-        # Do not iterate further if limit was not reached
-        if i < limit:
-            break
+            # Do not iterate further if limit was not reached, otherwise fetch
+            # next page, while current one is being processed.
+            if len(data) >= limit:
+                future = executor.submit(fetch, data[-1]["_cid"])
 
-        offset = cid
+            yield data
 
 
 def _cid_offset(keymap: KeyMap, model_keymaps: list, reset_cid: bool) -> int:
@@ -91,10 +92,12 @@ def process_keymap_data(
     keymap: KeyMap, model: Model, data: Iterable, primary_keys: list[Property], counters: dict, dry_run: bool
 ) -> Generator[KeymapSyncData]:
     identifiable = is_model_identifiable(model)
+    # Values of rows, that might not be written to the keymap yet.
+    pending = {}
     for row in data:
         action = action_from_op(model, row)
         if action in (Action.INSERT, Action.UPSERT):
-            yield from sync_model_insert(
+            items = sync_model_insert(
                 model=model,
                 row=row,
                 primary_keys=primary_keys,
@@ -103,22 +106,30 @@ def process_keymap_data(
                 identifiable=identifiable,
             )
         elif action in (Action.UPDATE, Action.PATCH):
-            yield from sync_model_update(
+            items = sync_model_update(
                 keymap=keymap,
                 model=model,
                 row=row,
                 counters=counters,
                 dry_run=dry_run,
                 identifiable=identifiable,
+                pending=pending,
             )
         elif action is Action.MOVE:
-            yield from sync_model_move(
+            items = sync_model_move(
                 model=model,
                 row=row,
                 counters=counters,
                 dry_run=dry_run,
                 identifiable=identifiable,
             )
+        else:
+            continue
+
+        for item in items:
+            if item.redirect is None:
+                pending[item.name, item.identifier] = item.value
+            yield item
 
 
 def sync_model_insert(
@@ -153,10 +164,21 @@ def sync_model_insert(
                 counters["_total"].update(1)
 
 
-def sync_model_update(keymap: KeyMap, model: Model, identifiable: bool, row: dict, counters: dict, dry_run: bool):
+def sync_model_update(
+    keymap: KeyMap,
+    model: Model,
+    identifiable: bool,
+    row: dict,
+    counters: dict,
+    dry_run: bool,
+    pending: dict | None = None,
+):
     id_ = row["_id"]
     for km, props in keymaps_affected_by_change(row, model).items():
-        decoded = keymap.decode(km, id_)
+        if pending and (km, id_) in pending:
+            decoded = pending[km, id_]
+        else:
+            decoded = keymap.decode(km, id_)
         remapped = remap_decoded_values(decoded, props)
         for key in remapped.keys():
             if key in row:
@@ -261,7 +283,7 @@ def sync_keymap(
             # Get min cid (in case new model was added, or models are out of sync)
             offset_cid = _cid_offset(keymap=keymap, model_keymaps=model_keymaps, reset_cid=reset_cid)
 
-            data = _fetch_changelog_data(
+            pages = _fetch_changelog_pages(
                 config=config,
                 model=model,
                 client=client,
@@ -274,13 +296,25 @@ def sync_keymap(
                 progress_bar=counters.get(model.model_type()) or main_bar,
             )
 
-            data = process_keymap_data(
-                keymap=keymap, model=model, data=data, primary_keys=primary_keys, counters=counters, dry_run=dry_run
-            )
-            data = commands.sync(context, keymap, data=data)
             try:
-                for row in data:
-                    offset_cid = row.data["_cid"]
+                for page in pages:
+                    data = process_keymap_data(
+                        keymap=keymap,
+                        model=model,
+                        data=page,
+                        primary_keys=primary_keys,
+                        counters=counters,
+                        dry_run=dry_run,
+                    )
+                    data = list(data)
+                    if not dry_run:
+                        # Whole page is committed at once, together with last
+                        # synced cid, so sync can be resumed from next page.
+                        with keymap.transaction():
+                            keymap.synchronize_many(data)
+                            for keymap_name in model_keymaps:
+                                keymap.update_sync_data(keymap_name, page[-1]["_cid"], datetime.datetime.now())
+                        offset_cid = page[-1]["_cid"]
 
                 for key in model_keymaps:
                     keymap.validate_data(key)
@@ -330,12 +364,5 @@ def _extract_row_data_from_keys(row: dict, keys: List[Property]) -> dict:
     return result
 
 
-@commands.sync.register(Context, KeyMap)
-def sync(context: Context, keymap: KeyMap, *, data: Generator[KeymapSyncData]):
-    for row in data:
-        keymap.synchronize(row)
-        yield row
-
-
 def is_model_identifiable(model: Model):
     return model.external and not model.external.unknown_primary_key
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 import collections
+import importlib
 import inspect
 import pathlib
-from typing import Any, Callable, Dict, List, Tuple, TypeVar, cast
+import sys
+import threading
+import types as builtin_types
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, cast
 
 from multipledispatch.dispatcher import Dispatcher, str_signature
+from multipledispatch.utils import expand_tuples
 
 F = TypeVar("F", bound=Callable[[], Any])
 
+# Type referenced by module and qualified name, without importing it.
+TypeRef = Tuple[str, str]
+
 _commands: Dict[str, Command] = {}
+_pending_lock = threading.RLock()
 
 
 def command(
@@ -24,6 +33,7 @@ def command(
             raise Exception(f"{_name!r} is already defined.")
         _commands[_name] = Command(_name)
         _commands[_name].schema = schema or {}
+        _commands[_name].module = func.__module__
         return _commands[_name]
 
     return cast(Command, _)
@@ -31,6 +41,18 @@ def command(
 
 class Command(Dispatcher):
     schema: dict
+    module: str = None  # module, where command is defined
+
+    # Module names by registered signatures.
+    sources: Dict[Tuple[type, ...], str]
+
+    # Signatures registered by not yet imported modules, see `add_pending`.
+    pending: Dict[str, List[Tuple[TypeRef, ...]]]
+
+    def __init__(self, name, doc=None):
+        super().__init__(name, doc)
+        self.sources = {}
+        self.pending = {}
 
     def register(
         self,
@@ -39,11 +61,19 @@ class Command(Dispatcher):
     ) -> Callable[[F], Command]:
         def _(func: F) -> Command:
             types = signature_types or tuple(_find_func_types(func))
+            module = sys._getframe(1).f_globals.get("__name__")
+            for signature in expand_tuples(types):
+                self.sources[tuple(signature)] = module
             self.add(types, func)
             return self
 
         return cast(Command, _)
 
+    def dispatch_iter(self, *types):
+        if self.pending:
+            _import_pending(self, types)
+        return super().dispatch_iter(*types)
+
     def __getitem__(self, types):
         types = types if isinstance(types, tuple) else (types,)
         func = self.dispatch(*types)
@@ -60,6 +90,9 @@ class Command(Dispatcher):
         else:
             func = None
 
+        if self.pending:
+            _import_pending(self)
+
         base = pathlib.Path().resolve()
         arg_names = _extend_duplicate_names(self.ordering)
         print("---")
@@ -69,6 +102,79 @@ class Command(Dispatcher):
             _print_method(base, func_, self.name, arg_names, args, mark)
 
 
+def get_type_ref(type_: type) -> Optional[TypeRef]:
+    """Get reference of a type, if type can be found by it"""
+    if not isinstance(type_, type):
+        return None
+    ref = (type_.__module__, type_.__qualname__)
+    if _resolve_type_ref(ref) is type_:
+        return ref
+    # Builtin types like NoneType can only be found in `types` module.
+    for name, value in vars(builtin_types).items():
+        if value is type_:
+            return ("types", name)
+    return None
+
+
+def _resolve_type_ref(ref: TypeRef) -> Optional[type]:
+    module, qualname = ref
+    # Types of not yet imported modules are not resolved, because there can't
+    # be any instances of them.
+    obj = sys.modules.get(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name, None)
+    return obj if isinstance(obj, type) else None
+
+
+def add_pending(
+    module: str,
+    name: str,
+    signatures: Iterable[Tuple[TypeRef, ...]],
+) -> bool:
+    """Add signatures of a command registered by a not yet imported module
+
+    Module is imported on first dispatch, that might match one of given
+    signatures. Returns False if command is not defined.
+    """
+    if name not in _commands:
+        return False
+    with _pending_lock:
+        pending = _commands[name].pending.setdefault(module, [])
+        for signature in signatures:
+            signature = tuple(tuple(ref) for ref in signature)
+            if signature not in pending:
+                pending.append(signature)
+    return True
+
+
+def _import_pending(command: Command, types: Tuple[type, ...] = None) -> None:
+    with _pending_lock:
+        modules = [
+            module
+            for module, signatures in command.pending.items()
+            if (
+                types is None
+                or module in sys.modules
+                or any(_matches_type_refs(signature, types) for signature in signatures)
+            )
+        ]
+        for module in modules:
+            importlib.import_module(module)
+            # All signatures of imported module are registered now.
+            for command_ in _commands.values():
+                command_.pending.pop(module, None)
+
+
+def _matches_type_refs(signature: Tuple[TypeRef, ...], types: Tuple[type, ...]) -> bool:
+    if len(signature) != len(types):
+        return False
+    for ref, type_ in zip(signature, types):
+        cls = _resolve_type_ref(ref)
+        if cls is None or not issubclass(type_, cls):
+            return False
+    return True
+
+
 def _extend_duplicate_names(argslist: List[Tuple[type]]) -> Dict[type, str]:
     argnames = collections.defaultdict(set)
     for args in argslist:
@@ -3,13 +3,12 @@ import sys
 from typing import Optional
 
 from starlette.requests import Request
-from starlette.responses import StreamingResponse
 
 from spinta import commands
 from spinta.components import Context, Model, UrlParams
 from spinta.core.enums import Action
 from spinta.formats.ascii.components import Ascii
-from spinta.utils.response import aiter, peek_and_stream
+from spinta.utils.response import StreamingResponse, aiter, peek_and_stream
 
 
 @commands.render.register(Context, Request, Model, Ascii)
@@ -3,7 +3,7 @@ import pathlib
 from typing import Any, Dict, Iterator
 
 from starlette.requests import Request
-from starlette.responses import Response, StreamingResponse
+from starlette.responses import Response
 
 from spinta import commands
 from spinta.components import Context, Model, UrlParams
@@ -15,7 +15,7 @@ from spinta.manifests.tabular.components import ManifestRow
 from spinta.manifests.tabular.constants import DATASET
 from spinta.manifests.tabular.helpers import datasets_to_tabular, write_csv
 from spinta.utils.nestedstruct import flatten, sepgetter
-from spinta.utils.response import aiter
+from spinta.utils.response import StreamingResponse, aiter
 
 
 @commands.render.register(Context, Request, Model, Csv)
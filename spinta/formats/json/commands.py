@@ -1,14 +1,15 @@
 from typing import Any, Dict, Optional
 
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.responses import JSONResponse, Response
 
 from spinta import commands
-from spinta.components import Context, Node, UrlParams
+from spinta.accesslog import log_body
+from spinta.components import Config, Context, Node, UrlParams
 from spinta.core.enums import Action
 from spinta.formats.json.components import Json
 from spinta.types.text.components import Text
-from spinta.utils.response import aiter, peek_and_stream
+from spinta.utils.response import StreamingResponse, aiter, buffer_stream, peek_and_stream
 
 
 @commands.render.register(Context, Request, Node, Json)
@@ -50,8 +51,11 @@ def _render(
         # In python dict is also an iterable, but here we want a true iterable,
         # a list or a generator of dicts.
         assert not isinstance(data, dict), data
+        config: Config = context.get("config")
+        stream = buffer_stream(peek_and_stream(fmt(data)), config.response_buffer_size)
+        stream = log_body(context, stream, config.response_buffer_size)
         return StreamingResponse(
-            aiter(peek_and_stream(fmt(data))),
+            aiter(stream),
             status_code=status_code,
             media_type=fmt.content_type,
             headers=headers,
@@ -59,7 +63,8 @@ def _render(
     elif action == Action.DELETE:
         return Response(None, status_code=status_code, headers=headers)
     else:
-        return JSONResponse(fmt.data(data), status_code=status_code, headers=headers)
+        data = {k: v for k, v in data.items() if k != "_page"}
+        return JSONResponse(data, status_code=status_code, headers=headers)
 
 
 @commands.prepare_dtype_for_response.register(Context, Json, Text, dict)
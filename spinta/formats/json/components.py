@@ -16,18 +16,18 @@ class Json(Format):
 
     def __call__(self, data):
         page = None
-        yield f'{{"{self.container_name}":['
+        yield f'{{"{self.container_name}":['.encode()
         for i, row in enumerate(data):
-            if "_page" in row and row["_page"] is not None:
-                page = row["_page"]
-            sep = "," if i > 0 else ""
-            yield sep + json.dumps(self.data(row), default=encoder, ensure_ascii=False)
-        yield "]}" if page is None else "],"
+            # Row is not used after it is encoded, so `_page` is removed in
+            # place, instead of copying the whole row.
+            row_page = row.pop("_page", None)
+            if row_page is not None:
+                page = row_page
+            sep = b"," if i > 0 else b""
+            yield sep + json.dumps(row, default=encoder, ensure_ascii=False).encode()
+        yield b"]}" if page is None else b"],"
         if page is not None:
-            yield f'"_page":{{"next":"{page}"}}}}'
-
-    def data(self, data: dict) -> dict:
-        return {k: v for k, v in data.items() if k != "_page"}
+            yield f'"_page":{{"next":"{page}"}}}}'.encode()
 
 
 def encoder(o):
@@ -1,14 +1,14 @@
 from typing import Any, Dict, Optional
 
 from starlette.requests import Request
-from starlette.responses import StreamingResponse
 
 from spinta import commands
-from spinta.components import Context, Model, Node, UrlParams
+from spinta.accesslog import log_body
+from spinta.components import Config, Context, Model, Node, UrlParams
 from spinta.core.enums import Action
 from spinta.formats.jsonlines.components import JsonLines
 from spinta.types.text.components import Text
-from spinta.utils.response import aiter, peek_and_stream
+from spinta.utils.response import StreamingResponse, aiter, buffer_stream, peek_and_stream
 
 
 @commands.render.register(Context, Request, Model, JsonLines)
@@ -24,7 +24,7 @@ def render(
     status_code: int = 200,
     headers: Optional[dict] = None,
 ):
-    return _render(fmt, data, status_code, headers)
+    return _render(context, fmt, data, status_code, headers)
 
 
 @commands.render.register(Context, Request, Node, JsonLines)
@@ -40,13 +40,14 @@ def render(
     status_code: int = 200,
     headers: Optional[dict] = None,
 ):
-    return _render(fmt, data, status_code, headers)
+    return _render(context, fmt, data, status_code, headers)
 
 
-def _render(fmt: JsonLines, data, status_code: int, headers: dict):
-    return StreamingResponse(
-        aiter(peek_and_stream(fmt(data))), status_code=status_code, media_type=fmt.content_type, headers=headers
-    )
+def _render(context: Context, fmt: JsonLines, data, status_code: int, headers: dict):
+    config: Config = context.get("config")
+    stream = buffer_stream(peek_and_stream(fmt(data)), config.response_buffer_size)
+    stream = log_body(context, stream, config.response_buffer_size)
+    return StreamingResponse(aiter(stream), status_code=status_code, media_type=fmt.content_type, headers=headers)
 
 
 @commands.prepare_dtype_for_response.register(Context, JsonLines, Text, dict)
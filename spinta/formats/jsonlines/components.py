@@ -16,14 +16,13 @@ class JsonLines(Format):
         memory = next(data, None)
 
         for row in data:
-            yield json.dumps({k: v for k, v in memory.items() if k != "_page"}, ensure_ascii=False) + "\n"
+            # Row is not used after it is encoded, so `_page` is removed in
+            # place, instead of copying the whole row.
+            memory.pop("_page", None)
+            yield json.dumps(memory, ensure_ascii=False).encode() + b"\n"
             memory = row
 
         if memory is not None:
-            last_row = {}
-            for k, v in memory.items():
-                if k == "_page":
-                    last_row[k] = {"next": v}
-                else:
-                    last_row[k] = v
-            yield json.dumps(last_row, ensure_ascii=False) + "\n"
+            if "_page" in memory:
+                memory["_page"] = {"next": memory["_page"]}
+            yield json.dumps(memory, ensure_ascii=False).encode() + b"\n"
@@ -1,21 +1,26 @@
-import io
 import pathlib
+import tempfile
 from typing import Any, Dict, Iterator
 
 from starlette.requests import Request
-from starlette.responses import Response, StreamingResponse
+from starlette.responses import Response
 
 from spinta import commands
 from spinta.components import Context, Model, UrlParams
 from spinta.core.enums import Action
 from spinta.formats.helpers import get_model_tabular_header
 from spinta.formats.xlsx.components import Xlsx
+from spinta.formats.xlsx.helpers import stream_xlsx
 from spinta.manifests.components import Manifest
 from spinta.manifests.tabular.components import ManifestRow
 from spinta.manifests.tabular.constants import DATASET
 from spinta.manifests.tabular.helpers import datasets_to_tabular, write_xlsx
 from spinta.utils.nestedstruct import flatten, sepgetter
-from spinta.utils.response import aiter
+from spinta.utils.response import StreamingResponse, aiter
+
+# Manifest workbooks larger than this are spooled to a temporary file.
+XLSX_SPOOL_SIZE = 10 * 1024 * 1024
+XLSX_CHUNK_SIZE = 64 * 1024
 
 
 @commands.render.register(Context, Request, Model, Xlsx)
@@ -37,7 +42,7 @@ def render(
     rows = flatten(data, sepgetter(model))
     cols = get_model_tabular_header(context, model, action, params)
     return StreamingResponse(
-        aiter(_render_xlsx(rows, cols)),
+        aiter(stream_xlsx(rows, cols)),
         status_code=status_code,
         media_type=fmt.content_type,
         headers=headers,
@@ -72,8 +77,8 @@ def render(
 
 
 def _render_xlsx(rows: Iterator[ManifestRow], cols: list):
-    stream = io.BytesIO()
-    write_xlsx(stream, rows, cols)
-    stream.seek(0)
-    for row in stream.readlines():
-        yield row
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE) as stream:
+        write_xlsx(stream, rows, cols)
+        stream.seek(0)
+        while chunk := stream.read(XLSX_CHUNK_SIZE):
+            yield chunk
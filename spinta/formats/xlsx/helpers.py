@@ -0,0 +1,207 @@
+import datetime
+import decimal
+import math
+import re
+import zipfile
+from typing import Any, Dict, Iterator, List
+from xml.sax.saxutils import escape
+
+# Maximum number of rows in a single sheet, including header row.
+XLSX_MAX_ROWS = 1_048_576
+# Maximum number of characters in a single cell.
+XLSX_MAX_STRING = 32_767
+
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    # Sheets are added while rows are written, so all other xml files are
+    # worksheets and [Content_Types].xml can be written first.
+    '<Default Extension="xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font>'
+    "</fonts>"
+    '<fills count="2">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    "</fills>"
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    "</cellXfs>"
+    "</styleSheet>"
+)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    "</sheetView></sheetViews>"
+    "<sheetData>"
+)
+
+_SHEET_END = "</sheetData></worksheet>"
+
+
+class _Sink:
+    """Write only file object collecting written zip file bytes"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        name = chr(ord("A") + rem) + name
+    return name
+
+
+def _string_cell(ref: str, value: str, style: str = "") -> str:
+    value = _ILLEGAL_XML_CHARS.sub("", value[:XLSX_MAX_STRING])
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+
+
+def _cell(ref: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        if isinstance(value, int) or math.isfinite(value):
+            return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime.date, datetime.time)):
+        value = value.isoformat()
+    return _string_cell(ref, str(value))
+
+
+def _header(cols: List[str], refs: List[str]) -> str:
+    cells = "".join(_string_cell(f"{ref}1", str(col), ' s="1"') for ref, col in zip(refs, cols))
+    return f'<row r="1">{cells}</row>'
+
+
+def _workbook(sheets: int) -> str:
+    items = "".join(f'<sheet name="Sheet{i}" sheetId="{i}" r:id="rId{i}"/>' for i in range(1, sheets + 1))
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f"<sheets>{items}</sheets>"
+        "</workbook>"
+    )
+
+
+def _workbook_rels(sheets: int) -> str:
+    items = "".join(
+        f'<Relationship Id="rId{i}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, sheets + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{items}<Relationship Id="rId{sheets + 1}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        "</Relationships>"
+    )
+
+
+def stream_xlsx(
+    rows: Iterator[Dict[str, Any]],
+    cols: List[str],
+    *,
+    max_rows: int = XLSX_MAX_ROWS,
+) -> Iterator[bytes]:
+    """Write rows to an xlsx file and yield file bytes as they are written
+
+    Each sheet is compressed and written out row by row, so memory use does
+    not depend on number of rows. When a sheet reaches `max_rows` rows
+    (including the header row), remaining rows are written to a new sheet.
+
+    Size of a sheet is not known in advance and can exceed 2 GiB, so sheets are
+    always written in ZIP64 format.
+    """
+    sink = _Sink()
+    refs = [_column_name(i) for i in range(len(cols))]
+    header = _header(cols, refs)
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+        yield sink.pop()
+
+        sheets = 0
+        sheet = None
+        n = max_rows
+        try:
+            for row in rows:
+                if n >= max_rows:
+                    if sheet is not None:
+                        sheet.write(_SHEET_END.encode())
+                        sheet.close()
+                    sheets += 1
+                    sheet = zf.open(f"xl/worksheets/sheet{sheets}.xml", "w", force_zip64=True)
+                    sheet.write((_SHEET_START + header).encode())
+                    n = 1
+                n += 1
+                cells = "".join(_cell(f"{ref}{n}", row[col]) for ref, col in zip(refs, cols))
+                sheet.write(f'<row r="{n}">{cells}</row>'.encode())
+                if sink.chunks:
+                    yield sink.pop()
+
+            if sheet is None:
+                # Empty result still has a sheet with a header.
+                sheets += 1
+                sheet = zf.open(f"xl/worksheets/sheet{sheets}.xml", "w", force_zip64=True)
+                sheet.write((_SHEET_START + header).encode())
+            sheet.write(_SHEET_END.encode())
+        finally:
+            if sheet is not None:
+                sheet.close()
+
+        zf.writestr("xl/workbook.xml", _workbook(sheets))
+        zf.writestr("xl/_rels/workbook.xml.rels", _workbook_rels(sheets))
+    yield sink.pop()
@@ -0,0 +1,632 @@
+"""Bulk reflection of database catalogs
+
+SQLAlchemy `Inspector` reads columns, keys and comments table by table, which
+takes several catalog queries for each table. `CatalogInspector` reads them
+for all tables of a schema with a few set-based queries and keeps results for
+the lifetime of the inspector.
+"""
+
+import dataclasses
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import mssql, mysql, oracle, postgresql, sqlite
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.types import TypeEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class SchemaCatalog:
+    # Same structures as returned by `Inspector` methods, by table name.
+    columns: Dict[str, List[Dict[str, Any]]] = dataclasses.field(default_factory=dict)
+    pk: Dict[str, Dict[str, Any]] = dataclasses.field(default_factory=dict)
+    fkeys: Dict[str, List[Dict[str, Any]]] = dataclasses.field(default_factory=dict)
+    # None, if database does not support table comments.
+    comments: Optional[Dict[str, Optional[str]]] = None
+
+
+class CatalogInspector:
+    """Inspector, that reads catalog of a whole schema at once
+
+    Columns, primary keys, foreign keys and comments are read with set-based
+    catalog queries for PostgreSQL, Oracle, MSSQL, MySQL/MariaDB and SQLite.
+    For other databases, or if catalog queries fail, schema is read table by
+    table with `Inspector`. Other `Inspector` methods are used as is.
+
+    Unlike `Inspector`, catalog queries always set `referred_schema` of
+    foreign keys, also when referred table is in `search_path` of PostgreSQL.
+    """
+
+    def __init__(self, engine: Engine, *, bulk: bool = True, workers: int = 1):
+        self.engine = engine
+        self.insp = sa.inspect(engine)
+        self.reader = _get_reader(engine.dialect) if bulk else None
+        self.workers = workers
+        self._schemas: Dict[Optional[str], SchemaCatalog] = {}
+        self._locks: Dict[Optional[str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        return getattr(self.insp, name)
+
+    def prefetch(self, schemas: List[str]) -> None:
+        """Read catalogs of given schemas, several schemas at the same time"""
+        if self.workers <= 1 or len(schemas) <= 1 or self.engine.dialect.name == "sqlite":
+            # Each thread gets its own connection to in-memory SQLite database.
+            for schema in schemas:
+                self.get_schema(schema)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(self.get_schema, schemas))
+
+    def get_schema(self, schema: Optional[str]) -> SchemaCatalog:
+        schema = schema or self.insp.default_schema_name
+        with self._lock:
+            lock = self._locks.setdefault(schema, threading.Lock())
+        with lock:
+            if schema not in self._schemas:
+                self._schemas[schema] = self._read_schema(schema)
+            return self._schemas[schema]
+
+    def _read_schema(self, schema: str) -> SchemaCatalog:
+        if self.reader is not None:
+            try:
+                with self.engine.connect() as conn:
+                    return self.reader(conn, self.engine.dialect, schema)
+            except sa.exc.DBAPIError as e:
+                logger.warning(f"Can't read catalog of schema {schema!r} at once, reading table by table: {e}")
+        return _read_tables(self.engine, schema)
+
+    def get_columns(self, table: str, schema: Optional[str] = None, **kw) -> List[Dict[str, Any]]:
+        columns = self.get_schema(schema).columns
+        if table in columns:
+            return columns[table]
+        return self.insp.get_columns(table, schema=schema, **kw)
+
+    def get_pk_constraint(self, table: str, schema: Optional[str] = None, **kw) -> Dict[str, Any]:
+        catalog = self.get_schema(schema)
+        if table in catalog.columns:
+            return catalog.pk.get(table, {"name": None, "constrained_columns": []})
+        return self.insp.get_pk_constraint(table, schema=schema, **kw)
+
+    def get_foreign_keys(self, table: str, schema: Optional[str] = None, **kw) -> List[Dict[str, Any]]:
+        catalog = self.get_schema(schema)
+        if table in catalog.columns:
+            return catalog.fkeys.get(table, [])
+        return self.insp.get_foreign_keys(table, schema=schema, **kw)
+
+    def get_table_comment(self, table: str, schema: Optional[str] = None, **kw) -> Dict[str, Any]:
+        comments = self.get_schema(schema).comments
+        if comments is not None and table in comments:
+            return {"text": comments[table]}
+        return self.insp.get_table_comment(table, schema=schema, **kw)
+
+
+def _read_tables(engine: Engine, schema: Optional[str]) -> SchemaCatalog:
+    # Each thread uses its own inspector, because inspector cache is not
+    # thread safe.
+    insp = sa.inspect(engine)
+    tables = list(insp.get_table_names(schema=schema))
+    for name in ("get_view_names", "get_materialized_view_names"):
+        if callable(getattr(insp, name, None)):
+            tables += getattr(insp, name)(schema=schema)
+
+    catalog = SchemaCatalog(comments={})
+    for table in tables:
+        # SQLite dialect sorts cached columns in place, when reading primary
+        # keys, so columns are read before keys.
+        catalog.columns[table] = list(insp.get_columns(table, schema=schema))
+    for table in tables:
+        catalog.pk[table] = insp.get_pk_constraint(table, schema=schema)
+        catalog.fkeys[table] = insp.get_foreign_keys(table, schema=schema)
+        if catalog.comments is not None:
+            try:
+                catalog.comments[table] = insp.get_table_comment(table, schema=schema).get("text")
+            except NotImplementedError:
+                catalog.comments = None
+    return catalog
+
+
+def _get_type(dialect: Dialect, name: str) -> TypeEngine:
+    cls = dialect.ischema_names.get(name)
+    if cls is None:
+        logger.warning(f"Did not recognize type {name!r}.")
+        return sa.types.NULLTYPE
+    return cls()
+
+
+def _add_column(catalog: SchemaCatalog, table: str, name: str, type_: TypeEngine, nullable, comment) -> None:
+    catalog.columns.setdefault(table, []).append(
+        {
+            "name": name,
+            "type": type_,
+            "nullable": bool(nullable),
+            "comment": comment or None,
+        }
+    )
+
+
+def _add_key(catalog: SchemaCatalog, row) -> None:
+    """Add a column of primary or foreign key
+
+    Rows of the same key must follow each other, ordered by column position.
+    """
+    if row.referred_table is None:
+        pk = catalog.pk.setdefault(row.table_name, {"name": row.name, "constrained_columns": []})
+        pk["constrained_columns"].append(row.column_name)
+        return
+
+    fkeys = catalog.fkeys.setdefault(row.table_name, [])
+    if not fkeys or fkeys[-1]["name"] != row.name:
+        fkeys.append(
+            {
+                "name": row.name,
+                "constrained_columns": [],
+                "referred_schema": row.referred_schema,
+                "referred_table": row.referred_table,
+                "referred_columns": [],
+                "options": {},
+            }
+        )
+    fkeys[-1]["constrained_columns"].append(row.column_name)
+    fkeys[-1]["referred_columns"].append(row.referred_column)
+
+
+def _get_postgresql_type(dialect: Dialect, type_: str) -> TypeEngine:
+    dimensions = type_.count("[]")
+    name = re.sub(r"\(.*?\)", "", type_.replace("[]", "")).strip()
+    if name.startswith("interval"):
+        name = "interval"
+    column_type = _get_type(dialect, name)
+    if dimensions:
+        column_type = postgresql.ARRAY(column_type, dimensions=dimensions)
+    return column_type
+
+
+def _read_postgresql(conn: Connection, dialect: Dialect, schema: str) -> SchemaCatalog:
+    catalog = SchemaCatalog(comments={})
+    params = {"schema": schema}
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            c.relname AS table_name,
+            obj_description(c.oid, 'pg_class') AS comment
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+        """),
+        params,
+    )
+    for row in rows:
+        catalog.comments[row.table_name] = row.comment
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            c.relname AS table_name,
+            a.attname AS column_name,
+            CASE t.typtype
+                WHEN 'd' THEN format_type(t.typbasetype, t.typtypmod)
+                ELSE format_type(a.atttypid, a.atttypmod)
+            END AS type,
+            t.typtype,
+            NOT a.attnotnull AS nullable,
+            col_description(c.oid, a.attnum) AS comment
+        FROM pg_catalog.pg_attribute a
+        JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_catalog.pg_type t ON t.oid = a.atttypid
+        WHERE
+            n.nspname = :schema AND
+            c.relkind IN ('r', 'p', 'v', 'm', 'f') AND
+            a.attnum > 0 AND
+            NOT a.attisdropped
+        ORDER BY c.relname, a.attnum
+        """),
+        params,
+    )
+    for row in rows:
+        if row.typtype == "e":
+            column_type = postgresql.ENUM(name=row.type)
+        else:
+            column_type = _get_postgresql_type(dialect, row.type)
+        _add_column(catalog, row.table_name, row.column_name, column_type, row.nullable, row.comment)
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            c.relname AS table_name,
+            con.conname AS name,
+            a.attname AS column_name,
+            rn.nspname AS referred_schema,
+            rc.relname AS referred_table,
+            ra.attname AS referred_column
+        FROM pg_catalog.pg_constraint con
+        JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        CROSS JOIN LATERAL unnest(con.conkey, con.confkey) WITH ORDINALITY AS k(attnum, rattnum, ord)
+        JOIN pg_catalog.pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+        LEFT JOIN pg_catalog.pg_class rc ON rc.oid = con.confrelid
+        LEFT JOIN pg_catalog.pg_namespace rn ON rn.oid = rc.relnamespace
+        LEFT JOIN pg_catalog.pg_attribute ra ON ra.attrelid = con.confrelid AND ra.attnum = k.rattnum
+        WHERE n.nspname = :schema AND con.contype IN ('p', 'f')
+        ORDER BY c.relname, con.conname, k.ord
+        """),
+        params,
+    )
+    for row in rows:
+        _add_key(catalog, row)
+
+    return catalog
+
+
+def _get_oracle_type(dialect: Dialect, row) -> TypeEngine:
+    if row.data_type == "NUMBER":
+        if row.data_precision is None and row.data_scale == 0:
+            return oracle.INTEGER()
+        return oracle.NUMBER(row.data_precision, row.data_scale)
+    if "WITH LOCAL TIME ZONE" in row.data_type:
+        return oracle.TIMESTAMP()
+    return _get_type(dialect, re.sub(r"\(\d+\)", "", row.data_type))
+
+
+def _read_oracle(conn: Connection, dialect: Dialect, schema: str) -> SchemaCatalog:
+    catalog = SchemaCatalog(comments={})
+    params = {"owner": dialect.denormalize_name(schema)}
+    name = dialect.normalize_name
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT table_name, comments
+        FROM all_tab_comments
+        WHERE owner = :owner
+        """),
+        params,
+    )
+    for row in rows:
+        catalog.comments[name(row.table_name)] = row.comments
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            col.table_name,
+            col.column_name,
+            col.data_type,
+            col.data_precision,
+            col.data_scale,
+            col.nullable,
+            com.comments
+        FROM all_tab_columns col
+        LEFT JOIN all_col_comments com
+            ON com.owner = col.owner
+            AND com.table_name = col.table_name
+            AND com.column_name = col.column_name
+        WHERE col.owner = :owner
+        ORDER BY col.table_name, col.column_id
+        """),
+        params,
+    )
+    for row in rows:
+        _add_column(
+            catalog,
+            name(row.table_name),
+            name(row.column_name),
+            _get_oracle_type(dialect, row),
+            row.nullable == "Y",
+            row.comments,
+        )
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            c.table_name,
+            c.constraint_name AS name,
+            cc.column_name,
+            r.owner AS referred_schema,
+            r.table_name AS referred_table,
+            rc.column_name AS referred_column
+        FROM all_constraints c
+        JOIN all_cons_columns cc
+            ON cc.owner = c.owner
+            AND cc.constraint_name = c.constraint_name
+            AND cc.table_name = c.table_name
+        LEFT JOIN all_constraints r
+            ON r.owner = c.r_owner
+            AND r.constraint_name = c.r_constraint_name
+        LEFT JOIN all_cons_columns rc
+            ON rc.owner = r.owner
+            AND rc.constraint_name = r.constraint_name
+            AND rc.position = cc.position
+        WHERE c.owner = :owner AND c.constraint_type IN ('P', 'R')
+        ORDER BY c.table_name, c.constraint_name, cc.position
+        """),
+        params,
+    )
+    for row in rows:
+        _add_key(
+            catalog,
+            _Row(
+                table_name=name(row.table_name),
+                name=name(row.name),
+                column_name=name(row.column_name),
+                referred_schema=row.referred_schema and name(row.referred_schema),
+                referred_table=row.referred_table and name(row.referred_table),
+                referred_column=row.referred_column and name(row.referred_column),
+            ),
+        )
+
+    return catalog
+
+
+def _read_mssql(conn: Connection, dialect: Dialect, schema: str) -> SchemaCatalog:
+    catalog = SchemaCatalog(comments={})
+    params = {"schema": schema}
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            o.name AS table_name,
+            CAST(ep.value AS NVARCHAR(MAX)) AS comment
+        FROM sys.objects o
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        LEFT JOIN sys.extended_properties ep
+            ON ep.class = 1
+            AND ep.major_id = o.object_id
+            AND ep.minor_id = 0
+            AND ep.name = 'MS_Description'
+        WHERE s.name = :schema AND o.type IN ('U', 'V')
+        """),
+        params,
+    )
+    for row in rows:
+        catalog.comments[row.table_name] = row.comment
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            o.name AS table_name,
+            c.name AS column_name,
+            CASE
+                WHEN t.is_user_defined = 1 AND t.is_assembly_type = 0
+                THEN TYPE_NAME(c.system_type_id)
+                ELSE t.name
+            END AS type,
+            c.is_nullable AS nullable,
+            CAST(ep.value AS NVARCHAR(MAX)) AS comment
+        FROM sys.columns c
+        JOIN sys.objects o ON o.object_id = c.object_id
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        JOIN sys.types t ON t.user_type_id = c.user_type_id
+        LEFT JOIN sys.extended_properties ep
+            ON ep.class = 1
+            AND ep.major_id = c.object_id
+            AND ep.minor_id = c.column_id
+            AND ep.name = 'MS_Description'
+        WHERE s.name = :schema AND o.type IN ('U', 'V')
+        ORDER BY o.name, c.column_id
+        """),
+        params,
+    )
+    for row in rows:
+        column_type = _get_type(dialect, row.type)
+        _add_column(catalog, row.table_name, row.column_name, column_type, row.nullable, row.comment)
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            o.name AS table_name,
+            k.name AS name,
+            c.name AS column_name,
+            NULL AS referred_schema,
+            NULL AS referred_table,
+            NULL AS referred_column,
+            ic.key_ordinal AS position
+        FROM sys.key_constraints k
+        JOIN sys.objects o ON o.object_id = k.parent_object_id
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        JOIN sys.index_columns ic ON ic.object_id = k.parent_object_id AND ic.index_id = k.unique_index_id
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE s.name = :schema AND k.type = 'PK'
+        UNION ALL
+        SELECT
+            o.name AS table_name,
+            fk.name AS name,
+            c.name AS column_name,
+            rs.name AS referred_schema,
+            ro.name AS referred_table,
+            rc.name AS referred_column,
+            fkc.constraint_column_id AS position
+        FROM sys.foreign_keys fk
+        JOIN sys.objects o ON o.object_id = fk.parent_object_id
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        JOIN sys.foreign_key_columns fkc ON fkc.constraint_object_id = fk.object_id
+        JOIN sys.columns c ON c.object_id = fkc.parent_object_id AND c.column_id = fkc.parent_column_id
+        JOIN sys.objects ro ON ro.object_id = fkc.referenced_object_id
+        JOIN sys.schemas rs ON rs.schema_id = ro.schema_id
+        JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+        WHERE s.name = :schema
+        ORDER BY table_name, name, position
+        """),
+        params,
+    )
+    for row in rows:
+        _add_key(catalog, row)
+
+    return catalog
+
+
+def _read_mysql(conn: Connection, dialect: Dialect, schema: str) -> SchemaCatalog:
+    catalog = SchemaCatalog(comments={})
+    params = {"schema": schema}
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT TABLE_NAME AS table_name, TABLE_TYPE AS table_type, TABLE_COMMENT AS comment
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = :schema
+        """),
+        params,
+    )
+    for row in rows:
+        # Views have 'VIEW' as a comment.
+        catalog.comments[row.table_name] = row.comment if row.table_type == "BASE TABLE" else None
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            TABLE_NAME AS table_name,
+            COLUMN_NAME AS column_name,
+            DATA_TYPE AS type,
+            IS_NULLABLE AS nullable,
+            COLUMN_COMMENT AS comment
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = :schema
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """),
+        params,
+    )
+    for row in rows:
+        column_type = _get_type(dialect, row.type.lower())
+        _add_column(catalog, row.table_name, row.column_name, column_type, row.nullable == "YES", row.comment)
+
+    rows = conn.execute(
+        sa.text("""
+        SELECT
+            TABLE_NAME AS table_name,
+            CONSTRAINT_NAME AS name,
+            COLUMN_NAME AS column_name,
+            REFERENCED_TABLE_SCHEMA AS referred_schema,
+            REFERENCED_TABLE_NAME AS referred_table,
+            REFERENCED_COLUMN_NAME AS referred_column
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE
+            TABLE_SCHEMA = :schema AND
+            (CONSTRAINT_NAME = 'PRIMARY' OR REFERENCED_TABLE_NAME IS NOT NULL)
+        ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
+        """),
+        params,
+    )
+    for row in rows:
+        _add_key(catalog, row)
+
+    return catalog
+
+
+def _read_sqlite(conn: Connection, dialect: Dialect, schema: str) -> SchemaCatalog:
+    # SQLite does not support comments.
+    catalog = SchemaCatalog()
+    params = {"schema": schema}
+    master = f"{dialect.identifier_preparer.quote_identifier(schema)}.sqlite_master"
+    if dialect.server_version_info >= (3, 31):
+        # Computed columns are hidden in `table_info`.
+        columns = "pragma_table_xinfo(m.name, :schema) p"
+        hidden = "p.hidden"
+    else:
+        columns = "pragma_table_info(m.name, :schema) p"
+        hidden = "0"
+
+    rows = conn.execute(
+        sa.text(f"""
+        SELECT
+            m.name AS table_name,
+            p.name AS column_name,
+            p.type,
+            p."notnull",
+            p.pk,
+            {hidden} AS hidden
+        FROM {master} m
+        JOIN {columns}
+        WHERE m.type IN ('table', 'view')
+        ORDER BY m.name, p.cid
+        """),
+        params,
+    )
+    pk = {}
+    for row in rows:
+        if row.hidden == 1:
+            continue
+        type_ = row.type.upper()
+        if row.hidden:
+            # Type of a computed column is "INTEGER GENERATED ALWAYS".
+            type_ = re.sub("GENERATED|ALWAYS", "", type_).strip()
+        column_type = dialect._resolve_type_affinity(type_)
+        _add_column(catalog, row.table_name, row.column_name, column_type, not row.notnull, None)
+        if row.pk:
+            pk.setdefault(row.table_name, []).append((row.pk, row.column_name))
+    for table, columns in pk.items():
+        catalog.pk[table] = {"name": None, "constrained_columns": [c for _, c in sorted(columns)]}
+
+    rows = conn.execute(
+        sa.text(f"""
+        SELECT m.name AS table_name, f.id, f."table" AS referred_table, f."from", f."to"
+        FROM {master} m
+        JOIN pragma_foreign_key_list(m.name, :schema) f
+        WHERE m.type = 'table'
+        ORDER BY m.name, f.id, f.seq
+        """),
+        params,
+    )
+    for row in rows:
+        referred_column = row.to
+        if referred_column is None:
+            # Foreign key refers to primary key of referred table.
+            fkeys = catalog.fkeys.get(row.table_name)
+            position = len(fkeys[-1]["constrained_columns"]) if fkeys and fkeys[-1]["name"] == row.id else 0
+            referred_pk = catalog.pk.get(row.referred_table, {"constrained_columns": []})["constrained_columns"]
+            referred_column = referred_pk[position] if position < len(referred_pk) else None
+        _add_key(
+            catalog,
+            _Row(
+                table_name=row.table_name,
+                name=row.id,
+                column_name=row._mapping["from"],
+                referred_schema=schema,
+                referred_table=row.referred_table,
+                referred_column=referred_column,
+            ),
+        )
+    for table, fkeys in catalog.fkeys.items():
+        # SQLite foreign keys are not named and the same foreign key can be
+        # declared more than once.
+        unique = {}
+        for fk in fkeys:
+            fk["name"] = None
+            key = (tuple(fk["constrained_columns"]), fk["referred_table"], tuple(fk["referred_columns"]))
+            unique.setdefault(key, fk)
+        catalog.fkeys[table] = list(unique.values())
+
+    return catalog
+
+
+@dataclasses.dataclass
+class _Row:
+    table_name: str
+    name: Any
+    column_name: str
+    referred_schema: Optional[str]
+    referred_table: Optional[str]
+    referred_column: Optional[str]
+
+
+_READERS: List[tuple] = [
+    (postgresql.dialect, _read_postgresql),
+    (oracle.dialect, _read_oracle),
+    (mssql.dialect, _read_mssql),
+    # Also MariaDB.
+    (mysql.dialect, _read_mysql),
+    (sqlite.dialect, _read_sqlite),
+]
+
+
+def _get_reader(dialect: Dialect) -> Optional[Callable[[Connection, Dialect, str], SchemaCatalog]]:
+    for cls, reader in _READERS:
+        if isinstance(dialect, cls):
+            return reader
+    return None
@@ -7,7 +7,6 @@ import cachetools
 import sqlalchemy as sa
 from geoalchemy2.types import Geometry
 from sqlalchemy.dialects import mssql, mysql, oracle, postgresql, sqlite
-from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.sql.sqltypes import _Binary
 from sqlalchemy.types import TypeEngine
 
@@ -17,6 +16,7 @@ from spinta.core.ufuncs import asttoexpr
 from spinta.datasets.backends.sql.backends.oracle.helpers import SDO_GEOMETRY
 from spinta.datasets.backends.sql.ufuncs.components import Engine, SqlResource
 from spinta.exceptions import UnexpectedFormulaResult
+from spinta.manifests.sql.catalog import CatalogInspector
 from spinta.manifests.tabular.constants import DataTypeEnum
 from spinta.utils.imports import full_class_name
 from spinta.utils.naming import Deduplicator, to_dataset_name, to_model_name, to_property_name
@@ -44,15 +44,15 @@ def read_schema(context: Context, path: str, prepare: str = None, dataset_name:
 
     url = sa.engine.make_url(path)
     dataset = dataset_name if dataset_name else to_dataset_name(url.database) if url.database else "dataset1"
-    insp = sa.inspect(engine)
+    config = context.get("config")
+    insp = CatalogInspector(engine, bulk=config.inspect_bulk, workers=config.inspect_workers)
     default_schema = schema or insp.default_schema_name
 
     schema_mapper: dict[str, _SchemaMapping] = {}
     schemas = insp.get_schema_names() if schema is None else [schema]
+    schemas = [schema for schema in schemas if not is_internal_schema(engine, schema)]
+    insp.prefetch(schemas)
     for schema in schemas:
-        if is_internal_schema(engine, schema):
-            continue
-
         include_schema_in_name = schema != default_schema
         ds = (dataset + "/" + schema) if include_schema_in_name else dataset
         table_mapping = _create_mapping(insp, insp.get_table_names(schema=schema), schema, ds)
@@ -140,7 +140,7 @@ class _SchemaMapping:
         raise KeyError(table)
 
 
-def _create_mapping(insp: Inspector, tables: list, schema: str, dataset: str) -> _Mapping:
+def _create_mapping(insp: CatalogInspector, tables: list, schema: str, dataset: str) -> _Mapping:
     dedup_model = Deduplicator("{}")
     mapping: _Mapping = {}
     for table in sorted(tables):
@@ -161,7 +161,7 @@ def _create_mapping(insp: Inspector, tables: list, schema: str, dataset: str) ->
 
 
 def _get_primary_key(
-    insp: Inspector,
+    insp: CatalogInspector,
     table: str,
     schema: str,
     mapping: dict[str, _SchemaMapping],
@@ -170,7 +170,7 @@ def _get_primary_key(
     return [mapping[schema].get_table(table).props[col] for col in pk["constrained_columns"]]
 
 
-def _get_table_comment(insp: Inspector, schema: str, table: str) -> str:
+def _get_table_comment(insp: CatalogInspector, schema: str, table: str) -> str:
     try:
         return insp.get_table_comment(table, schema=schema).get("text")
     except NotImplementedError:
@@ -178,7 +178,7 @@ def _get_table_comment(insp: Inspector, schema: str, table: str) -> str:
 
 
 def _read_props(
-    insp: Inspector,
+    insp: CatalogInspector,
     table: str,
     schema: str,
     mapping: dict[str, _SchemaMapping],
@@ -289,7 +289,7 @@ class _Ref(NamedTuple):
 
 
 def _get_fkeys(
-    insp: Inspector,
+    insp: CatalogInspector,
     table: str,
     schema: str,
     mapping: dict[str, _SchemaMapping],
@@ -343,7 +343,7 @@ def _create_dataset_for_schema(
     prepare: str,
     url: object,
     schema_mapper: dict[str, _SchemaMapping],
-    insp: Inspector,
+    insp: CatalogInspector,
     include_schema_in_name: bool,
 ):
     yield (
@@ -287,6 +287,9 @@ def create_rc(
             },
             # tests/config/clients/3388ea36-4a4f-4821-900a-b574c8829d52.yml
             "default_auth_client": "3388ea36-4a4f-4821-900a-b574c8829d52",
+            # Tables of SQL backends are loaded from schema cache, like in
+            # production.
+            "sql_schema_cache": True,
         }
     )
 
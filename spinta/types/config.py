@@ -32,7 +32,7 @@ def load(context: Context, config: Config) -> Config:
     # Load commands.
     config.commands = {}
     for scope in rc.keys("commands"):
-        if scope == "modules":
+        if scope in ("modules", "index"):
             continue
         config.commands[scope] = {}
         for name in rc.keys("commands", scope):
@@ -116,6 +116,17 @@ def load(context: Context, config: Config) -> Config:
     config.front_page_warning = str(front_page_warning) if front_page_warning else ""
     config.max_api_file_size = rc.get("max_file_size", default=100)
     config.max_error_count_on_insert = rc.get("max_error_count_on_insert", default=100)
+    config.write_batch_size = rc.get("write_batch_size", default=1, cast=int)
+    config.response_buffer_size = rc.get("response_buffer_size", default=65536, cast=int)
+    config.fetch_concurrency = rc.get("fetch_concurrency", default=1, cast=int)
+    config.fetch_rate_limit = rc.get("fetch_rate_limit", default=None)
+    config.fetch_chunk_size = rc.get("fetch_chunk_size", default=10000, cast=int)
+    config.source_cache_size = rc.get("source_cache_size", default=1024, cast=float)
+    config.source_cache_ttl = rc.get("source_cache_ttl", default=0, cast=float)
+    config.sql_schema_cache = rc.get("sql_schema_cache", default=True, cast=asbool)
+    config.sql_schema_warmup = rc.get("sql_schema_warmup", default=True, cast=asbool)
+    config.inspect_bulk = rc.get("inspect_bulk", default=True, cast=asbool)
+    config.inspect_workers = rc.get("inspect_workers", default=4, cast=int)
     config.ensure_backends = rc.get("ensure_backends", default=True)
     if config.root is not None:
         config.root = config.root.strip().strip("/")
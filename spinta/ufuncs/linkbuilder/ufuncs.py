@@ -1,8 +1,9 @@
 import logging
 
-from spinta.core.ufuncs import Bind, ufunc
+from spinta.core.ufuncs import Bind, Expr, ufunc
+from spinta.datasets.backends.dataframe.components import DaskBackend
 from spinta.datasets.backends.wsdl.components import WsdlBackend
-from spinta.exceptions import InvalidSource, InvalidValue
+from spinta.exceptions import InvalidSource, InvalidValue, UnknownBind
 from spinta.ufuncs.linkbuilder.components import LinkBuilder
 
 log = logging.getLogger(__name__)
@@ -36,3 +37,21 @@ def wsdl(env: LinkBuilder, parent_resource_backend: WsdlBackend) -> None:
         raise InvalidSource(env.resource, error=error_msg)
 
     backend.wsdl_backend = parent_resource_backend
+
+
+@ufunc.resolver(LinkBuilder, Expr, name="and")
+def and_(env: LinkBuilder, expr: Expr) -> None:
+    expr.resolve(env)
+
+
+@ufunc.resolver(LinkBuilder)
+def cache(env: LinkBuilder, **kwargs) -> None:
+    backend = env.resource.backend
+    if not isinstance(backend, DaskBackend):
+        raise InvalidValue(message=f"cache() can not be used with {backend.type} resource.")
+
+    for key, value in kwargs.items():
+        if key == "ttl":
+            env.resource.cache_ttl = float(value)
+        else:
+            raise UnknownBind(name=key)
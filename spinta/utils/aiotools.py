@@ -87,3 +87,19 @@ async def achain(iterables: list, it: AsyncIterator[T]) -> AsyncIterator[T]:
 
     async for x in it:
         yield x
+
+
+async def achunks(
+    it: AsyncIterator[T],
+    size: int,
+    flush: Optional[Callable[[T], bool]] = None,
+) -> AsyncIterator[List[T]]:
+    # If `flush(x)` is true, chunk ends with `x`, even if chunk is not full.
+    chunk = []
+    async for x in it:
+        chunk.append(x)
+        if len(chunk) >= size or (flush and flush(x)):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import itertools
 import json
+import threading
 import time
 from datetime import timezone
 from email.utils import format_datetime, parsedate_to_datetime
 from io import TextIOWrapper
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, cast
 from urllib.error import HTTPError
 
+import anyio
 import requests
+import starlette.responses
 import tqdm
 from starlette.datastructures import UploadFile
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import Send
 
 from spinta import commands, exceptions
 from spinta.api.inspect import inspect_api
@@ -262,9 +267,113 @@ def peek_and_stream(stream):
     return _iter()
 
 
-async def aiter(stream):
-    for data in stream:
-        yield data
+def buffer_stream(stream: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Join small byte chunks into chunks of at least `size` bytes
+
+    Each chunk is sent to the client as a separate message, so sending many
+    small chunks is expensive. If `size` is 0, chunks are passed as is.
+    """
+    if size <= 0:
+        yield from stream
+        return
+    buffer = bytearray()
+    for chunk in stream:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+# Number of items, that can be read ahead from a synchronous stream, before
+# they are sent to the client.
+STREAM_BUFFER_SIZE = 100
+
+_STREAM_END = object()
+
+
+async def aiter(stream: Iterable[Any], buffer_size: int = STREAM_BUFFER_SIZE) -> AsyncIterator[Any]:
+    """Iterate over a synchronous stream without blocking the event loop
+
+    Data streams are read from backends using blocking calls, so stream is
+    iterated in a separate producer thread and items are passed to the event
+    loop via a queue. Producer reads at most `buffer_size` items ahead. When
+    iteration is stopped (for example, client disconnects), producer stops and
+    the stream is closed in the producer thread. Iteration ends only after
+    producer is done, because stream might use resources (like a database
+    connection), that are released after iteration.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    slots = threading.Semaphore(buffer_size)
+    stopped = threading.Event()
+    done = asyncio.Event()
+
+    def put(item: Any, error: Optional[BaseException] = None) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+        except RuntimeError:
+            # Event loop is already closed.
+            stopped.set()
+
+    def produce() -> None:
+        it = iter(stream)
+        try:
+            while True:
+                slots.acquire()
+                if stopped.is_set():
+                    break
+                item = next(it, _STREAM_END)
+                put(item)
+                if item is _STREAM_END:
+                    break
+        except BaseException as e:
+            put(_STREAM_END, e)
+        finally:
+            try:
+                if hasattr(it, "close"):
+                    it.close()
+            finally:
+                try:
+                    loop.call_soon_threadsafe(done.set)
+                except RuntimeError:
+                    # Event loop is already closed.
+                    pass
+
+    threading.Thread(target=produce, name="spinta-stream", daemon=True).start()
+    try:
+        while True:
+            item, error = await queue.get()
+            slots.release()
+            if error is not None:
+                raise error
+            if item is _STREAM_END:
+                break
+            yield item
+    finally:
+        stopped.set()
+        # Wake up producer, if it is waiting for a free slot.
+        slots.release()
+        await done.wait()
+
+
+class StreamingResponse(starlette.responses.StreamingResponse):
+    """Streaming response, that closes body iterator, when streaming stops
+
+    Starlette does not close body iterator, when streaming is stopped (for
+    example, client disconnects), it is closed later by garbage collector,
+    after request context is already closed. Here body iterator is closed
+    before response is done, even if request was cancelled.
+    """
+
+    async def stream_response(self, send: Send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            if hasattr(self.body_iterator, "aclose"):
+                with anyio.CancelScope(shield=True):
+                    await self.body_iterator.aclose()
 
 
 async def get_request_data(node: Node, request: Request):
@@ -412,3 +521,53 @@ def validate_cache_control_request(context: Context, request: Request) -> object
         if last_modified_dt <= since_dt:
             return Response(status_code=304, headers=cache_control)
     return None
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def get_byte_range(request: Request, size: int, etag: str) -> Optional[Tuple[int, int]]:
+    """Get byte range requested with `Range` header
+
+    Returns `(start, end)` with `end` excluded, or None if full content of
+    `size` bytes must be sent. Only a single bytes range is supported, multiple
+    or malformed ranges are ignored. Range is also ignored if `If-Range` does
+    not match `etag`. Raises RangeNotSatisfiable if requested range is outside
+    of content.
+    """
+    value = request.headers.get("range")
+    if value is None:
+        return None
+
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range not in (etag, f'"{etag}"'):
+        return None
+
+    unit, sep, spec = value.partition("=")
+    if not sep or unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first.isdigit() or last.isdigit()):
+        return None
+    if first and last and not (first.isdigit() and last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range, last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size
+
+    start = int(first)
+    if last:
+        end = int(last) + 1
+        if end <= start:
+            return None
+    else:
+        end = size
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size)
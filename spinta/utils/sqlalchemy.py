@@ -33,6 +33,13 @@ class SQLiteDialect_spinta(SQLiteDialect_pysqlite):
             from sqlite3 import dbapi2 as sqlite
         return sqlite
 
+    def create_connect_args(self, url):
+        args, kwargs = super().create_connect_args(url)
+        # Connection is never used by multiple threads at once, but streamed
+        # responses are started in one thread and continued in another.
+        kwargs.setdefault("check_same_thread", False)
+        return args, kwargs
+
 
 registry.register("sqlite.spinta", __name__, "SQLiteDialect_spinta")
 
@@ -86,3 +86,24 @@ def test_read_mode(postgresql, pos, size, data):
         with DatabaseFile(conn, table, f.size, f.blocks, f.bsize, mode="r") as f:
             assert f.seek(pos) == pos
             assert f.read(size) == data
+
+
+@pytest.mark.parametrize(
+    "start,end,chunks",
+    [
+        (0, None, [b"abc", b"def", b"ghi"]),
+        (1, 5, [b"bc", b"de"]),
+        (3, 6, [b"def"]),
+        (7, 100, [b"hi"]),
+        (9, None, []),
+    ],
+)
+def test_iter_range(start, end, chunks):
+    engine, table = _db()
+
+    with engine.connect() as conn:
+        with DatabaseFile(conn, table, mode="w", bsize=3) as f:
+            f.write(b"abcdefghi")
+
+        with DatabaseFile(conn, table, f.size, f.blocks, f.bsize, mode="r") as f:
+            assert list(f.iter_range(start, end)) == chunks
@@ -1,14 +1,17 @@
 import textwrap
 import uuid
 
+import pytest
 import sqlalchemy as sa
 import sqlparse
 from sqlalchemy.sql import Select
 
 from spinta import commands, spyna
 from spinta.auth import AdminToken
+from spinta.backends.postgresql.ufuncs.query.cache import QueryCache, build_query
 from spinta.core.config import RawConfig
 from spinta.core.ufuncs import asttoexpr
+from spinta.exceptions import EmptyStringSearch
 from spinta.testing.manifest import load_manifest_and_context
 from spinta.testing.utils import create_empty_backend
 from spinta.ufuncs.loadbuilder.helpers import page_contains_unsupported_keys
@@ -1000,3 +1003,142 @@ def test_denorm_nested_advanced(rc: RawConfig):
     LEFT OUTER JOIN example."Planet" AS "Planet_1" ON example."City"."country.planet.id" = "Planet_1".id
     """
     )
+
+
+def _build_cached(rc: RawConfig, manifest: str, model_name: str, queries: list) -> tuple:
+    context, manifest = load_manifest_and_context(rc, manifest)
+    context.set("auth.token", AdminToken())
+    backend = create_empty_backend(context, "postgresql", "default")
+    backend.schema = sa.MetaData()
+    backend.tables = {}
+    backend.query_cache = QueryCache(10)
+    commands.prepare(context, backend, manifest)
+    model = commands.get_model(context, manifest, model_name)
+    result = []
+    for query, page_mapping in queries:
+        query = asttoexpr(spyna.parse(query))
+        if page_mapping:
+            page = commands.create_page(model.page)
+            for key, value in page_mapping.items():
+                page.update_value(key, model.properties.get(key), value)
+            query = add_page_expr(query, page)
+        compiled = build_query(context, backend, model, query, None)
+        result.append((_qry(compiled.query), compiled.query.compile().params))
+    return result, backend.query_cache.stats()
+
+
+def test_query_cache(rc: RawConfig):
+    result, stats = _build_cached(
+        rc,
+        """
+    d | r | b | m | property | type    | ref  | access
+    example                  |         |      |
+      |   |   | City         |         | name |
+      |   |   |   | name     | string  |      | open
+      |   |   |   | size     | integer |      | open
+    """,
+        "example/City",
+        [
+            ('name="Vilnius"&size>1', {"name": "A"}),
+            ('name="Kaunas"&size>2', {"name": "B"}),
+            ('name="Alytus"&size>3', {"name": "C"}),
+        ],
+    )
+    assert stats == {"size": 1, "hits": 1, "misses": 2}
+    assert result[0][0] == result[2][0]
+    assert result[2] == (
+        """
+    SELECT example."City".name,
+           example."City"._id,
+           example."City".size,
+           example."City"._revision
+    FROM example."City"
+    WHERE example."City".name = :name_1
+      AND example."City".size > :size_1
+      AND (example."City".name > :name_2
+           OR example."City".name IS NULL)
+    ORDER BY example."City".name ASC,
+             example."City"._id ASC
+    LIMIT :param_1
+    """,
+        {"name_1": "Alytus", "size_1": 3, "name_2": "C", "param_1": 100000},
+    )
+
+
+def test_query_cache_same_literals(rc: RawConfig):
+    # Cached query is used only after it was built with different literals.
+    result, stats = _build_cached(
+        rc,
+        """
+    d | r | b | m | property | type    | ref  | access
+    example                  |         |      |
+      |   |   | City         |         | name |
+      |   |   |   | name     | string  |      | open
+    """,
+        "example/City",
+        [
+            ('name="Vilnius"', None),
+            ('name="Vilnius"', None),
+            ('name="Kaunas"', None),
+            ('name="Alytus"', None),
+        ],
+    )
+    assert stats == {"size": 1, "hits": 1, "misses": 3}
+    assert [params for _, params in result] == [
+        {"name_1": "Vilnius"},
+        {"name_1": "Vilnius"},
+        {"name_1": "Kaunas"},
+        {"name_1": "Alytus"},
+    ]
+
+
+def test_query_cache_derived_literal(rc: RawConfig):
+    # Literals, that are not used as bind parameters can't be replaced.
+    result, stats = _build_cached(
+        rc,
+        """
+    d | r | b | m | property | type    | ref  | access
+    example                  |         |      |
+      |   |   | City         |         | name |
+      |   |   |   | name     | string  |      | open
+    """,
+        "example/City",
+        [
+            ("limit(1)", None),
+            ("limit(2)", None),
+            ("limit(3)", None),
+        ],
+    )
+    assert stats == {"size": 1, "hits": 0, "misses": 3}
+    assert [params for _, params in result] == [
+        {"param_1": 1},
+        {"param_1": 2},
+        {"param_1": 3},
+    ]
+
+
+@pytest.mark.parametrize("op", ["contains", "startswith"])
+def test_query_cache_empty_string(rc: RawConfig, op: str):
+    # Empty search string is validated even if the same query is cached.
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    d | r | b | m | property | type    | ref  | access
+    example                  |         |      |
+      |   |   | City         |         | name |
+      |   |   |   | name     | string  |      | open
+    """,
+    )
+    context.set("auth.token", AdminToken())
+    backend = create_empty_backend(context, "postgresql", "default")
+    backend.schema = sa.MetaData()
+    backend.tables = {}
+    backend.query_cache = QueryCache(10)
+    commands.prepare(context, backend, manifest)
+    model = commands.get_model(context, manifest, "example/City")
+    for value in ["Vil", "Kau", "Aly"]:
+        build_query(context, backend, model, asttoexpr(spyna.parse(f'{op}(name, "{value}")')), None)
+    assert backend.query_cache.stats() == {"size": 1, "hits": 1, "misses": 2}
+
+    with pytest.raises(EmptyStringSearch):
+        build_query(context, backend, model, asttoexpr(spyna.parse(f'{op}(name, "")')), None)
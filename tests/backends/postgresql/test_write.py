@@ -0,0 +1,417 @@
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from _pytest.fixtures import FixtureRequest
+
+from spinta import commands
+from spinta.backends.constants import TableType
+from spinta.backends.helpers import get_table_identifier
+from spinta.backends.postgresql.commands.write import _write_chunk
+from spinta.backends.postgresql.components import PostgreSQL, WriteTransaction
+from spinta.components import Context, DataItem, Model
+from spinta.core.config import RawConfig
+from spinta.core.enums import Action
+from spinta.testing.client import create_test_client
+from spinta.testing.data import listdata
+from spinta.testing.manifest import bootstrap_manifest, load_manifest_and_context
+from spinta.testing.utils import get_error_codes
+
+MANIFEST = """
+d | r | b | m | property | type    | ref | access
+datasets/write/batch     |         |     |
+  |   |   | City         |         |     |
+  |   |   |   | name     | string  |     | open
+  |   |   |   | code     | integer |     | open
+  |   |   | Country      |         |     |
+  |   |   |   | name     | string  |     | open
+  |   |   |   | code     | integer |     | open
+"""
+
+
+def test_write_batch(
+    rc: RawConfig,
+    postgresql: str,
+    tmp_path: Path,
+    request: FixtureRequest,
+):
+    rc = rc.fork({"write_batch_size": 2})
+    context = bootstrap_manifest(rc, MANIFEST, backend=postgresql, tmp_path=tmp_path, request=request)
+    model = "datasets/write/batch/City"
+    app = create_test_client(context)
+    app.authmodel(model, ["insert", "patch", "delete", "getall", "changes"])
+
+    vln = "a5127db3-4459-4a67-af70-781243fe3418"
+    kau = "b5127db3-4459-4a67-af70-781243fe3418"
+    klp = "c5127db3-4459-4a67-af70-781243fe3418"
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "insert", "_type": model, "_id": vln, "name": "Vilnius", "code": 1},
+                {"_op": "insert", "_type": model, "_id": kau, "name": "Kaunas"},
+                {"_op": "insert", "_type": model, "_id": klp, "name": "Klaipėda", "code": 3},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+    revs = {row["_id"]: row["_revision"] for row in resp.json()["_data"]}
+
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "patch", "_type": model, "_where": f"eq(_id, '{vln}')", "_revision": revs[vln], "code": 10},
+                {"_op": "patch", "_type": model, "_where": f"eq(_id, '{kau}')", "_revision": revs[kau], "code": 20},
+                {
+                    "_op": "patch",
+                    "_type": model,
+                    "_where": f"eq(_id, '{klp}')",
+                    "_revision": revs[klp],
+                    "name": "Klaipeda",
+                },
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+    revs = {row["_id"]: row["_revision"] for row in resp.json()["_data"]}
+
+    resp = app.get(model)
+    assert listdata(resp, "_id", "name", "code", full=True) == [
+        {"_id": vln, "name": "Vilnius", "code": 10},
+        {"_id": kau, "name": "Kaunas", "code": 20},
+        {"_id": klp, "name": "Klaipeda", "code": 3},
+    ]
+
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "delete", "_type": model, "_where": f"eq(_id, '{vln}')"},
+                {"_op": "delete", "_type": model, "_where": f"eq(_id, '{kau}')"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+
+    resp = app.get(model)
+    assert listdata(resp, "_id", "name", "code", full=True) == [
+        {"_id": klp, "name": "Klaipeda", "code": 3},
+    ]
+
+    resp = app.get(f"{model}/:changes")
+    assert listdata(resp, "_cid", "_op", "_id", full=True) == [
+        {"_cid": 1, "_op": "insert", "_id": vln},
+        {"_cid": 2, "_op": "insert", "_id": kau},
+        {"_cid": 3, "_op": "insert", "_id": klp},
+        {"_cid": 4, "_op": "patch", "_id": vln},
+        {"_cid": 5, "_op": "patch", "_id": kau},
+        {"_cid": 6, "_op": "patch", "_id": klp},
+        {"_cid": 7, "_op": "delete", "_id": vln},
+        {"_cid": 8, "_op": "delete", "_id": kau},
+    ]
+
+
+def test_write_batch_error(
+    rc: RawConfig,
+    postgresql: str,
+    tmp_path: Path,
+    request: FixtureRequest,
+):
+    rc = rc.fork({"write_batch_size": 10})
+    context = bootstrap_manifest(rc, MANIFEST, backend=postgresql, tmp_path=tmp_path, request=request)
+    model = "datasets/write/batch/City"
+    app = create_test_client(context)
+    app.authmodel(model, ["insert", "getall"])
+
+    vln = "a5127db3-4459-4a67-af70-781243fe3418"
+    kau = "b5127db3-4459-4a67-af70-781243fe3418"
+    resp = app.post(model, json={"_id": vln, "name": "Vilnius"})
+    assert resp.status_code == 201
+
+    # Whole batch fails because of duplicate _id, then rows are written one
+    # by one to find the failing row.
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "insert", "_type": model, "_id": kau, "name": "Kaunas"},
+                {"_op": "insert", "_type": model, "_id": vln, "name": "Vilnius"},
+            ]
+        },
+    )
+    assert resp.status_code == 400
+    assert get_error_codes(resp.json()) == ["UniqueConstraint"]
+
+    resp = app.get(model)
+    assert listdata(resp, "_id", "name", full=True) == [
+        {"_id": vln, "name": "Vilnius"},
+    ]
+
+
+def test_write_batch_read_existing_data(
+    rc: RawConfig,
+    postgresql: str,
+    tmp_path: Path,
+    request: FixtureRequest,
+):
+    rc = rc.fork({"write_batch_size": 10})
+    context = bootstrap_manifest(rc, MANIFEST, backend=postgresql, tmp_path=tmp_path, request=request)
+    model = "datasets/write/batch/City"
+    app = create_test_client(context)
+    app.authmodel(model, ["insert", "patch", "upsert", "getall"])
+
+    vln = "a5127db3-4459-4a67-af70-781243fe3418"
+    kau = "b5127db3-4459-4a67-af70-781243fe3418"
+    klp = "c5127db3-4459-4a67-af70-781243fe3418"
+    resp = app.post(model, json={"_id": vln, "name": "Vilnius", "code": 1})
+    assert resp.status_code == 201
+    rev = resp.json()["_revision"]
+    resp = app.post(model, json={"_id": kau, "name": "Kaunas", "code": 2})
+    assert resp.status_code == 201
+
+    # Existing rows of all data items are read with a single query.
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "patch", "_type": model, "_where": f"eq(_id, '{vln}')", "_revision": rev, "code": 10},
+                {"_op": "upsert", "_type": model, "_where": "name='Kaunas'", "name": "Kaunas", "code": 20},
+                {"_op": "upsert", "_type": model, "_where": "name='Klaipėda'", "_id": klp, "name": "Klaipėda"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+    revs = {row["_id"]: row["_revision"] for row in resp.json()["_data"]}
+
+    resp = app.get(model)
+    assert listdata(resp, "_id", "name", "code", full=True) == [
+        {"_id": vln, "name": "Vilnius", "code": 10},
+        {"_id": kau, "name": "Kaunas", "code": 20},
+        {"_id": klp, "name": "Klaipėda", "code": None},
+    ]
+
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "patch", "_type": model, "_where": f"eq(_id, '{kau}')", "_revision": revs[kau], "code": 2},
+                {
+                    "_op": "patch",
+                    "_type": model,
+                    "_where": "eq(_id, 'd5127db3-4459-4a67-af70-781243fe3418')",
+                    "code": 4,
+                },
+            ]
+        },
+    )
+    assert resp.status_code == 404
+    assert get_error_codes(resp.json()) == ["ItemDoesNotExist"]
+
+
+def test_write_batch_same_object_twice(
+    rc: RawConfig,
+    postgresql: str,
+    tmp_path: Path,
+    request: FixtureRequest,
+):
+    rc = rc.fork({"write_batch_size": 10})
+    context = bootstrap_manifest(rc, MANIFEST, backend=postgresql, tmp_path=tmp_path, request=request)
+    model = "datasets/write/batch/City"
+    app = create_test_client(context)
+    app.authmodel(model, ["insert", "patch", "upsert", "getall", "changes"])
+
+    vln = "a5127db3-4459-4a67-af70-781243fe3418"
+    kau = "b5127db3-4459-4a67-af70-781243fe3418"
+    resp = app.post(model, json={"_id": vln, "name": "Vilnius", "code": 1})
+    assert resp.status_code == 201
+
+    # Second change of the same object must see first change, even if both
+    # changes are in the same batch.
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "patch", "_type": model, "_where": f"eq(_id, '{vln}')", "code": 10},
+                {"_op": "patch", "_type": model, "_where": f"eq(_id, '{vln}')", "code": 11},
+                {"_op": "upsert", "_type": model, "_where": "name='Kaunas'", "_id": kau, "name": "Kaunas"},
+                {"_op": "upsert", "_type": model, "_where": "name='Kaunas'", "name": "Kaunas", "code": 20},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+
+    resp = app.get(model)
+    assert listdata(resp, "_id", "name", "code", full=True) == [
+        {"_id": vln, "name": "Vilnius", "code": 11},
+        {"_id": kau, "name": "Kaunas", "code": 20},
+    ]
+
+    resp = app.get(f"{model}/:changes")
+    assert listdata(resp, "_cid", "_op", "_id", full=True) == [
+        {"_cid": 1, "_op": "insert", "_id": vln},
+        {"_cid": 2, "_op": "patch", "_id": vln},
+        {"_cid": 3, "_op": "patch", "_id": vln},
+        {"_cid": 4, "_op": "insert", "_id": kau},
+        {"_cid": 5, "_op": "patch", "_id": kau},
+    ]
+
+
+def test_write_batch_read_existing_data_many_models(
+    rc: RawConfig,
+    postgresql: str,
+    tmp_path: Path,
+    request: FixtureRequest,
+):
+    rc = rc.fork({"write_batch_size": 10})
+    context = bootstrap_manifest(rc, MANIFEST, backend=postgresql, tmp_path=tmp_path, request=request)
+    city = "datasets/write/batch/City"
+    country = "datasets/write/batch/Country"
+    app = create_test_client(context)
+    app.authmodel(city, ["insert", "upsert", "getall"])
+    app.authmodel(country, ["insert", "upsert", "getall"])
+
+    vln = "a5127db3-4459-4a67-af70-781243fe3418"
+    kau = "b5127db3-4459-4a67-af70-781243fe3418"
+    lt = "c5127db3-4459-4a67-af70-781243fe3418"
+    lv = "d5127db3-4459-4a67-af70-781243fe3418"
+    for model, _id, name, code in [
+        (city, vln, "Vilnius", 1),
+        (city, kau, "Kaunas", 2),
+        (country, lt, "Lietuva", 1),
+        (country, lv, "Latvija", 2),
+    ]:
+        resp = app.post(model, json={"_id": _id, "name": name, "code": code})
+        assert resp.status_code == 201
+
+    # Same lookups of different models are read separately and string values
+    # match integer properties.
+    resp = app.post(
+        "/",
+        json={
+            "_data": [
+                {"_op": "upsert", "_type": city, "_where": "code='1'", "name": "VILNIUS", "code": 1},
+                {"_op": "upsert", "_type": city, "_where": "code=2", "name": "KAUNAS", "code": 2},
+                {"_op": "upsert", "_type": country, "_where": "code=1", "name": "LIETUVA", "code": 1},
+                {"_op": "upsert", "_type": country, "_where": "code='2'", "name": "LATVIJA", "code": 2},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+
+    resp = app.get(city)
+    assert listdata(resp, "_id", "name", full=True) == [
+        {"_id": vln, "name": "VILNIUS"},
+        {"_id": kau, "name": "KAUNAS"},
+    ]
+    resp = app.get(country)
+    assert listdata(resp, "_id", "name", full=True) == [
+        {"_id": lt, "name": "LIETUVA"},
+        {"_id": lv, "name": "LATVIJA"},
+    ]
+
+
+def test_write_chunk_restores_patches():
+    engine = sa.create_engine("sqlite://")
+    chunk = [DataItem(), DataItem()]
+    for i, data in enumerate(chunk):
+        data.patch = {"_id": str(i), "file": {"_id": "a.txt", "_content": b"A"}}
+
+    def write() -> bool:
+        # Like file `before_write`, which replaces content with file blocks.
+        for data in chunk:
+            del data.patch["file"]["_content"]
+            data.patch["file"]["_blocks"] = ["block"]
+        connection.execute(sa.text("SELECT * FROM missing"))
+        return True
+
+    with engine.connect() as connection:
+        assert _write_chunk(connection, chunk, write) is False
+
+    assert [data.patch for data in chunk] == [
+        {"_id": "0", "file": {"_id": "a.txt", "_content": b"A"}},
+        {"_id": "1", "file": {"_id": "a.txt", "_content": b"A"}},
+    ]
+
+
+class _ChangelogConnection:
+    def __init__(self, log: list):
+        self.log = log
+
+    def execute(self, qry, entries: list):
+        self.log.append(("write", [(entry["_rid"], entry["action"], entry["data"]) for entry in entries]))
+
+
+async def _create_changelog_entries(context: Context, model: Model, items: list) -> list:
+    log = []
+    backend = PostgreSQL()
+    table = sa.Table("changelog", sa.MetaData(), *(sa.Column(name) for name in ["_txn", "_rid", "datetime", "action"]))
+    backend.tables = {get_table_identifier(model, TableType.CHANGELOG).logical_qualified_name: table}
+    context = context.fork("changelog")
+    context.set("transaction", WriteTransaction(_ChangelogConnection(log), "txn"))
+
+    async def dstream():
+        for _id, patch, flush in items:
+            data = DataItem(model, action=Action.INSERT, payload={"_id": _id})
+            data.patch = {"_id": _id, "_revision": "rev", **patch} if patch is not None else {}
+            data.flush = flush
+            log.append(("read", _id))
+            yield data
+
+    async for data in commands.create_changelog_entry(context, model, backend, dstream=dstream()):
+        log.append(("yield", data.payload["_id"]))
+    return log
+
+
+@pytest.mark.asyncio
+async def test_create_changelog_entry_batches(rc: RawConfig):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    m | property | type   | access
+    City         |        |
+      | name     | string | open
+    """,
+    )
+    model = commands.get_model(context, manifest, "City")
+    items = [
+        ("a", {"name": "Vilnius"}, False),
+        ("b", {"name": "Kaunas"}, False),
+        ("c", {"name": "Alytus"}, True),
+        ("d", {"name": "Šiauliai"}, False),
+        # Unchanged data item does not have a changelog entry.
+        ("e", None, False),
+        ("f", {"name": "Utena"}, False),
+    ]
+
+    context.get("config").write_batch_size = 2
+    log = await _create_changelog_entries(context, model, items)
+    assert log == [
+        ("read", "a"),
+        ("read", "b"),
+        # Buffer is full.
+        ("write", [("a", "insert", {"name": "Vilnius"}), ("b", "insert", {"name": "Kaunas"})]),
+        ("yield", "a"),
+        ("yield", "b"),
+        ("read", "c"),
+        # Data item asks to flush the buffer.
+        ("write", [("c", "insert", {"name": "Alytus"})]),
+        ("yield", "c"),
+        ("read", "d"),
+        ("read", "e"),
+        ("write", [("d", "insert", {"name": "Šiauliai"})]),
+        ("yield", "d"),
+        ("yield", "e"),
+        ("read", "f"),
+        # End of stream.
+        ("write", [("f", "insert", {"name": "Utena"})]),
+        ("yield", "f"),
+    ]
+
+    # Entries are written in the same order, as when they are written one by
+    # one, so they get the same change ids.
+    context.get("config").write_batch_size = 1
+    single = await _create_changelog_entries(context, model, items)
+    assert [entry for kind, entries in single if kind == "write" for entry in entries] == [
+        entry for kind, entries in log if kind == "write" for entry in entries
+    ]
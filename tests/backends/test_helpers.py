@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+from spinta import commands
+from spinta.auth import AdminToken
+from spinta.backends.helpers import get_select_prop_names, get_select_tree, get_serialization_plan
+from spinta.core.config import RawConfig
+from spinta.core.enums import Action
+from spinta.formats.html.components import Html
+from spinta.formats.json.components import Json
+from spinta.testing.manifest import load_manifest_and_context
+
+
+@pytest.mark.parametrize(
+    "select",
+    [
+        None,
+        ["name"],
+        ["name", "created"],
+    ],
+)
+def test_serialization_plan(rc: RawConfig, select):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    d | r | b | m | property | type     | ref | access
+    example                  |          |     |
+      |   |   | City         |          |     |
+      |   |   |   | name     | string   |     | open
+      |   |   |   | created  | datetime |     | open
+      |   |   |   | size     | integer  |     | open
+    """,
+    )
+    context.set("auth.token", AdminToken())
+    model = commands.get_model(context, manifest, "example/City")
+    fmt = Json()
+    action = Action.GETALL
+    select_tree = get_select_tree(context, action, select)
+    prop_names = get_select_prop_names(
+        context, model, model.properties, action, select_tree, include_denorm_props=False
+    )
+    rows = [
+        {
+            "_type": "example/City",
+            "_id": "1",
+            "name": "Vilnius",
+            "created": datetime.datetime(2024, 1, 1),
+            "size": 1,
+        },
+        {
+            "_type": "example/City",
+            "_id": "2",
+            "name": "Kaunas",
+            "_page": "page",
+        },
+    ]
+
+    plan = get_serialization_plan(context, model, fmt, action, select_tree, prop_names)
+    assert plan is get_serialization_plan(context, model, fmt, action, select_tree, prop_names)
+    for row in rows:
+        expected = commands.prepare_data_for_response(
+            context,
+            model,
+            fmt,
+            row,
+            action=action,
+            select=select_tree,
+            prop_names=prop_names,
+        )
+        assert plan(context, row) == expected
+
+
+def test_serialization_plan_overridden(rc: RawConfig):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    d | r | b | m | property | type   | ref | access
+    example                  |        |     |
+      |   |   | City         |        |     |
+      |   |   |   | name     | string |     | open
+    """,
+    )
+    model = commands.get_model(context, manifest, "example/City")
+    select_tree = get_select_tree(context, Action.GETALL, None)
+    assert get_serialization_plan(context, model, Html(), Action.GETALL, select_tree, ["name"]) is None
@@ -698,9 +698,7 @@ def test_keymap_sync_with_transaction_batches(
             """
     create_tabular_manifest(context, tmp_path / "manifest.csv", striptable(table))
     localrc = create_rc(rc, tmp_path, geodb)
-    localrc = localrc.fork(
-        {"sync_page_size": 3, "keymaps": {"default": {"type": "sqlalchemy", "sync_transaction_size": 4}}}
-    )
+    localrc = localrc.fork({"sync_page_size": 3, "keymaps": {"default": {"type": "sqlalchemy"}}})
     remote = configure_remote_server(cli, localrc, rc, tmp_path, responses, remove_source=False)
     request.addfinalizer(remote.app.context.wipe_all)
 
@@ -3,9 +3,12 @@ from pathlib import Path
 from unittest.mock import ANY
 
 import pytest
+from pytest import MonkeyPatch
 
 from spinta.core.config import RawConfig
 from spinta.core.enums import Mode
+from spinta.datasets.backends.dataframe.backends.json.commands.read import _JsonReader
+from spinta.datasets.backends.dataframe.commands import read as dataframe_read
 from spinta.exceptions import PartialIncorrectProperty
 from spinta.testing.client import create_test_client
 from spinta.testing.data import listdata
@@ -342,6 +345,86 @@ def test_json_read_blank_node_multi_level(rc: RawConfig, tmp_path: Path):
     ]
 
 
+def test_json_read_parent_values_after_nested(rc: RawConfig, tmp_path: Path):
+    json_manifest = {
+        "planet": {
+            "countries": [
+                {"code": "lt", "name": "Lietuva"},
+                {"code": "lv", "name": "Latvija"},
+            ],
+            "name": "Earth",
+        },
+        "id": 0,
+    }
+
+    path = tmp_path / "countries.json"
+    path.write_text(json.dumps(json_manifest))
+
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+        d | r | m          | property | type      | ref  | source
+           example/json               |           |      |
+             | resource               | dask/json |      | {path}
+                                      |           |      |
+             |   | Country |          |           | code | planet.countries
+             |   |         | name     | string    |      | name
+             |   |         | code     | string    |      | code
+             |   |         | planet   | string    |      | ..name
+             |   |         | id       | integer   |      | ...id
+        """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/json/Country", ["getall"])
+
+    resp = app.get("/example/json/Country")
+    assert listdata(resp, sort=False) == [
+        ("lt", 0, "Lietuva", "Earth"),
+        ("lv", 0, "Latvija", "Earth"),
+    ]
+
+
+def test_json_read_in_small_chunks(rc: RawConfig, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_JsonReader, "chunk_size", 3)
+    json_manifest = {
+        "id": 12345,
+        "countries": [
+            {"code": "lt", "name": "Lietuva", "skip": [{"a": "]}"}, 1.5e3]},
+            {"code": "lv", "name": 'Lat"vija', "location": {"lat": 2.25}},
+        ],
+    }
+
+    path = tmp_path / "countries.json"
+    path.write_text(json.dumps(json_manifest))
+
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+        d | r | m          | property | type      | ref  | source
+           example/json               |           |      |
+             | resource               | dask/json |      | {path}
+                                      |           |      |
+             |   | Country |          |           | code | countries
+             |   |         | name     | string    |      | name
+             |   |         | code     | string    |      | code
+             |   |         | lat      | number    |      | location.lat
+             |   |         | id       | integer   |      | ..id
+        """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/json/Country", ["getall"])
+
+    resp = app.get("/example/json/Country")
+    assert listdata(resp, sort=False) == [
+        ("lt", 12345, None, "Lietuva"),
+        ("lv", 12345, 2.25, 'Lat"vija'),
+    ]
+
+
 def test_json_read_ref_level_3(rc: RawConfig, tmp_path: Path):
     json_manifest = {
         "countries": [
@@ -1431,3 +1514,54 @@ def test_json_composite_ref_four_levels_composite_2_level(rc: RawConfig, tmp_pat
             },
         },
     ]
+
+
+def test_json_read_chunks(rc: RawConfig, tmp_path: Path, monkeypatch: MonkeyPatch):
+    path = tmp_path / "countries.json"
+    path.write_text(json.dumps({"countries": [{"code": f"c{i}"} for i in range(5)]}))
+
+    partitions = []
+    iter_rows = dataframe_read._iter_rows
+
+    def _iter_rows(context, model, backend, env, df, extra_properties):
+        partitions.append(len(df))
+        return iter_rows(context, model, backend, env, df, extra_properties)
+
+    monkeypatch.setattr(dataframe_read, "_iter_rows", _iter_rows)
+
+    rc = rc.fork({"fetch_chunk_size": 2})
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property | type      | ref  | source    | access
+    example/json             |           |      |           |
+      | json                 | dask/json |      | {path}    |
+      |   |   | Country      |           | code | countries |
+      |   |   |   | code     | string    |      | code      | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/json/Country", ["getall", "search"])
+
+    # Source rows are read into partitions of at most 2 rows.
+    resp = app.get("/example/json/Country")
+    assert listdata(resp, sort=False) == ["c0", "c1", "c2", "c3", "c4"]
+    assert partitions == [2, 2, 1]
+
+    # Limit is applied to rows of all partitions, remaining rows are not read.
+    partitions.clear()
+    resp = app.get("/example/json/Country?limit(3)")
+    assert listdata(resp, sort=False) == ["c0", "c1", "c2"]
+    assert partitions == [2, 1]
+
+    partitions.clear()
+    resp = app.get('/example/json/Country?code="c3"')
+    assert listdata(resp, sort=False) == ["c3"]
+    assert partitions == [0, 1, 0]
+
+    partitions.clear()
+    resp = app.get("/example/json/Country?count()")
+    assert listdata(resp) == [5]
+    assert partitions == [1]
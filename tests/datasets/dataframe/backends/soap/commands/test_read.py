@@ -101,7 +101,7 @@ def test_soap_read_calls_soap_operation_with_empty_request_body(rc: RawConfig, m
     app.authmodel("/example/City/", ["getall"])
     app.get("/example/City/")
 
-    soap_data_mock.assert_called_with(source, backend=ANY, extra_headers={}, soap_request_body={}, source="/")
+    soap_data_mock.assert_called_with(source, backend=ANY, extra_headers={}, soap_request_body={}, source="/", ttl=0)
 
 
 def test_soap_read_calls_soap_operation_with_default_request_body_values(rc: RawConfig, mocker: MockerFixture) -> None:
@@ -126,7 +126,7 @@ def test_soap_read_calls_soap_operation_with_default_request_body_values(rc: Raw
         "request_model/param2": "default_val",
     }
     soap_data_mock.assert_called_with(
-        source, backend=ANY, extra_headers={}, soap_request_body=expected_soap_request, source="/"
+        source, backend=ANY, extra_headers={}, soap_request_body=expected_soap_request, source="/", ttl=0
     )
 
 
@@ -152,7 +152,7 @@ def test_soap_read_calls_soap_operation_with_request_body_values_from_url(rc: Ra
         "request_model/param2": "bar",
     }
     soap_data_mock.assert_called_with(
-        source, backend=ANY, extra_headers={}, soap_request_body=expected_soap_request, source="/"
+        source, backend=ANY, extra_headers={}, soap_request_body=expected_soap_request, source="/", ttl=0
     )
 
 
@@ -233,6 +233,46 @@ def test_soap_read(rc: RawConfig, responses: RequestsMock) -> None:
     ]
 
 
+def test_soap_read_cache_ttl(rc: RawConfig, responses: RequestsMock) -> None:
+    endpoint_url = "http://example.com/city"
+    soap_response = """
+        <ns0:Envelope xmlns:ns0="http://schemas.xmlsoap.org/soap/envelope/" xmlns:ns1="city_app">
+            <ns0:Body>
+                <ns1:CityOutputResponse>
+                    <ns1:CityOutput>
+                        <ns1:id>100</ns1:id>
+                        <ns1:name>Name One</ns1:name>
+                    </ns1:CityOutput>
+                </ns1:CityOutputResponse>
+            </ns0:Body>
+        </ns0:Envelope>
+    """
+    responses.add(POST, endpoint_url, status=200, content_type="text/plain; charset=utf-8", body=soap_response)
+
+    context, manifest = prepare_manifest(
+        rc,
+        """
+        d | r | b | m | property | type    | ref | source                                          | access | prepare
+        example                  | dataset |     |                                                 |        |
+          | wsdl_resource        | wsdl    |     | tests/datasets/backends/wsdl/data/wsdl.xml      |        |
+          | soap_resource        | soap    |     | CityService.CityPort.CityPortType.CityOperation |        | wsdl(wsdl_resource) & cache(ttl: 60)
+          |   |   | City         |         | id  | /                                               | open   |
+          |   |   |   | id       | integer |     | id                                              |        |
+          |   |   |   | name     | string  |     | name                                            |        |
+        """,
+        mode=Mode.external,
+    )
+
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("/example/City/", ["getall"])
+
+    for _ in range(2):
+        response = app.get("/example/City/")
+        assert listdata(response, "id", "name", sort=False) == [(100, "Name One")]
+    assert len(responses.calls) == 1
+
+
 def test_soap_read_with_default_soap_request_params(rc: RawConfig, responses: RequestsMock) -> None:
     endpoint_url = "http://example.com/city"
     soap_response = """
@@ -1,12 +1,20 @@
+import io
 import json
 from pathlib import Path
 from unittest.mock import ANY
 
 import pytest
-from responses import POST, RequestsMock
+from pytest import MonkeyPatch
+from responses import GET, POST, RequestsMock
 
 from spinta.core.config import RawConfig
 from spinta.core.enums import Mode
+from spinta.datasets.backends.dataframe.backends.xml.commands.read import (
+    _get_stream_tags,
+    _iter_xml_elements,
+    _parse_xml,
+)
+from spinta.datasets.backends.dataframe.commands import read as dataframe_read
 from spinta.exceptions import PartialIncorrectProperty, SourceOrPrepareNotAllowed
 from spinta.testing.client import create_test_client
 from spinta.testing.data import listdata
@@ -1888,3 +1896,119 @@ def test_composite_ref_four_levels_composite_2_level(rc: RawConfig, tmp_path: Pa
             },
         },
     ]
+
+
+def test_xml_read_url(rc: RawConfig, responses: RequestsMock):
+    responses.add(
+        GET,
+        "https://example.com/cities.xml",
+        status=200,
+        content_type="application/xml",
+        body="""
+        <cities>
+            <city><name>Vilnius</name></city>
+            <city><name>Kaunas</name></city>
+        </cities>
+        """,
+    )
+
+    context, manifest = prepare_manifest(
+        rc,
+        """
+    d | r | b | m | property | type     | ref  | source                           | access
+    example/xml              |          |      |                                  |
+      | xml                  | dask/xml |      | https://example.com/cities.xml   |
+      |   |   | City         |          | name | /cities/city                     |
+      |   |   |   | name     | string   |      | name                             | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/xml/City", ["getall"])
+
+    resp = app.get("/example/xml/City")
+    assert listdata(resp, sort=False) == ["Vilnius", "Kaunas"]
+
+
+@pytest.mark.parametrize(
+    "source, props, streamed",
+    [
+        ("/cities/city", {"name": "name"}, True),
+        ("/cities/x:city", {"name": "name"}, True),
+        ("/cities/*", {"name": "@name"}, True),
+        ("//city", {"name": "name"}, False),
+        ("/cities/city[1]", {"name": "name"}, False),
+        ("/cities/city", {"name": "../name"}, False),
+        ("/cities/city", {"name": "/cities/name"}, False),
+        ("/cities/y:city", {"name": "name"}, False),
+    ],
+)
+def test_xml_stream_tags(source: str, props: dict, streamed: bool):
+    model_props = {key: {"source": value, "pkeys": []} for key, value in props.items()}
+    tags = _get_stream_tags(source, model_props, {"x": "https://example.com/"})
+    assert (tags is not None) == streamed
+
+
+def test_xml_parse_clears_processed_elements():
+    xml = b"""
+        <cities>
+            <meta><count>3</count></meta>
+            <city><name>Vilnius</name></city>
+            <city><name>Kaunas</name></city>
+            <city><name>Ryga</name></city>
+        </cities>
+        trailing content
+    """
+    # Only last processed element is kept before a matched element.
+    previous = []
+    for elem in _iter_xml_elements(io.BytesIO(xml), ["cities", "city"]):
+        previous.append(len(list(elem.itersiblings(preceding=True))))
+    assert previous == [1, 1, 1]
+
+    model_props = {"name": {"source": "name", "pkeys": []}}
+    assert list(_parse_xml(io.BytesIO(xml), "cities/city", model_props)) == [
+        {"name": "Vilnius"},
+        {"name": "Kaunas"},
+        {"name": "Ryga"},
+    ]
+
+
+def test_xml_read_chunks(rc: RawConfig, tmp_path: Path, monkeypatch: MonkeyPatch):
+    cities = "".join(f"<city><code>c{i}</code></city>" for i in range(5))
+    path = tmp_path / "cities.xml"
+    path.write_text(f"<cities>{cities}</cities>")
+
+    partitions = []
+    iter_rows = dataframe_read._iter_rows
+
+    def _iter_rows(context, model, backend, env, df, extra_properties):
+        partitions.append(len(df))
+        return iter_rows(context, model, backend, env, df, extra_properties)
+
+    monkeypatch.setattr(dataframe_read, "_iter_rows", _iter_rows)
+
+    rc = rc.fork({"fetch_chunk_size": 2})
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property | type     | ref  | source       | access
+    example/xml              |          |      |              |
+      | xml                  | dask/xml |      | {path}       |
+      |   |   | City         |          | code | /cities/city |
+      |   |   |   | code     | string   |      | code         | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/xml/City", ["getall", "search"])
+
+    resp = app.get("/example/xml/City")
+    assert listdata(resp, sort=False) == ["c0", "c1", "c2", "c3", "c4"]
+    assert partitions == [2, 2, 1]
+
+    partitions.clear()
+    resp = app.get("/example/xml/City?limit(1)")
+    assert listdata(resp, sort=False) == ["c0"]
+    assert partitions == [1]
@@ -0,0 +1,173 @@
+import pathlib
+import time
+
+from responses import GET, RequestsMock, matchers
+
+from spinta.core.config import RawConfig
+from spinta.core.enums import Mode
+from spinta.datasets.backends.dataframe.cache import SourceCache
+from spinta.testing.client import create_test_client
+from spinta.testing.data import listdata
+from spinta.testing.manifest import prepare_manifest
+
+URL = "https://example.com/cities.json"
+
+
+def _read(cache: SourceCache, url: str = URL, **kwargs) -> bytes:
+    with cache.open(url, **kwargs) as response:
+        return response.raw.read()
+
+
+def test_source_cache_revalidate_etag(tmp_path: pathlib.Path, responses: RequestsMock):
+    cache = SourceCache(tmp_path, 1024)
+    responses.add(GET, URL, body=b"data", headers={"ETag": '"1"'})
+    responses.add(
+        GET,
+        URL,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"1"'})],
+    )
+
+    assert _read(cache) == b"data"
+    assert _read(cache) == b"data"
+    assert len(responses.calls) == 2
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 4 + (tmp_path / next(tmp_path.glob("*.json")).name).stat().st_size,
+        "hits": 0,
+        "revalidations": 1,
+        "misses": 1,
+    }
+
+
+def test_source_cache_ttl(tmp_path: pathlib.Path, responses: RequestsMock):
+    cache = SourceCache(tmp_path, 1024)
+    responses.add(GET, URL, body=b"data")
+
+    assert _read(cache, ttl=60) == b"data"
+    assert _read(cache, ttl=60) == b"data"
+    assert len(responses.calls) == 1
+    assert cache.hits == 1
+
+
+def test_source_cache_not_stored_without_validators(tmp_path: pathlib.Path, responses: RequestsMock):
+    cache = SourceCache(tmp_path, 1024)
+    responses.add(GET, URL, body=b"data")
+    responses.add(GET, URL, body=b"new")
+
+    assert _read(cache) == b"data"
+    assert _read(cache) == b"new"
+    assert cache.stats()["entries"] == 0
+
+
+def test_source_cache_not_stored_if_not_read(tmp_path: pathlib.Path, responses: RequestsMock):
+    cache = SourceCache(tmp_path, 1024 * 1024)
+    responses.add(GET, URL, body=b"x" * (128 * 1024), headers={"ETag": '"1"'})
+
+    with cache.open(URL) as response:
+        response.raw.read(10)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_source_cache_evict(tmp_path: pathlib.Path, responses: RequestsMock):
+    cache = SourceCache(tmp_path, 5000)
+    for i in range(3):
+        responses.add(GET, f"{URL}?page={i}", body=b"x" * 2000)
+
+    for i in [0, 1, 0, 2]:
+        _read(cache, f"{URL}?page={i}", ttl=60)
+        time.sleep(0.01)
+
+    # Least recently used page 1 is removed.
+    assert cache.stats()["bytes"] <= 5000
+    assert cache.stats()["entries"] == 2
+    _read(cache, f"{URL}?page=0", ttl=60)
+    _read(cache, f"{URL}?page=2", ttl=60)
+    assert cache.hits == 3
+    assert len(responses.calls) == 3
+
+
+def test_json_read_url_cache_ttl(rc: RawConfig, responses: RequestsMock):
+    url = "https://example.com/cache/cities.json"
+    responses.add(GET, url, json={"cities": [{"name": "Vilnius"}, {"name": "Kaunas"}]})
+
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property | type      | ref  | source  | prepare         | access
+    example/json             |           |      |         |                 |
+      | json                 | dask/json |      | {url}   | cache(ttl: 60)  |
+      |   |   | City         |           | name | cities  |                 |
+      |   |   |   | name     | string    |      | name    |                 | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/json/City", ["getall"])
+
+    for _ in range(2):
+        resp = app.get("/example/json/City")
+        assert listdata(resp, sort=False) == ["Vilnius", "Kaunas"]
+    assert len(responses.calls) == 1
+
+
+def test_csv_read_url_cache_ttl(rc: RawConfig, responses: RequestsMock):
+    url = "https://example.com/cache/cities.csv"
+    responses.add(GET, url, body="name;country\nVilnius;lt\nRyga;lv\n")
+
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property | type     | ref  | source  | prepare                             | access
+    example/csv              |          |      |         |                                     |
+      | csv                  | dask/csv |      | {url}   | tabular(sep: ";") & cache(ttl: 60)  |
+      |   |   | City         |          | name | cities  |                                     |
+      |   |   |   | name     | string   |      | name    |                                     | open
+      |   |   |   | country  | string   |      | country |                                     | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/csv/City", ["getall"])
+
+    for _ in range(2):
+        resp = app.get("/example/csv/City")
+        assert listdata(resp, "name", "country", sort=False) == [("Vilnius", "lt"), ("Ryga", "lv")]
+    assert len(responses.calls) == 1
+
+
+def test_cache_ttl_per_resource(rc: RawConfig, responses: RequestsMock):
+    cities = "https://example.com/shared/cities.json"
+    countries = "https://example.com/shared/countries.json"
+    responses.add(GET, cities, json={"cities": [{"name": "Vilnius"}]})
+    responses.add(GET, countries, json={"countries": [{"name": "Lithuania"}]})
+
+    rc = rc.fork({"backends": {"shared": {"type": "dask/json", "dsn": ""}}})
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property | type   | ref    | source      | prepare        | access
+    example/json             |        |        |             |                |
+      | cities               |        | shared | {cities}    | cache(ttl: 60) |
+      |   |   | City         |        | name   | cities      |                |
+      |   |   |   | name     | string |        | name        |                | open
+      | countries            |        | shared | {countries} |                |
+      |   |   | Country      |        | name   | countries   |                |
+      |   |   |   | name     | string |        | name        |                | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/json", ["getall"])
+
+    for _ in range(2):
+        assert listdata(app.get("/example/json/City")) == ["Vilnius"]
+        assert listdata(app.get("/example/json/Country")) == ["Lithuania"]
+
+    # Both resources share the same backend, but only `cities` is cached.
+    calls = [call.request.url for call in responses.calls]
+    assert calls.count(cities) == 1
+    assert calls.count(countries) == 2
@@ -1,13 +1,23 @@
 import json
+import threading
+import time
 from pathlib import Path
+from typing import Any
 
+import dask.bag
+import numpy as np
+import pandas as pd
 import pytest
 from fsspec import AbstractFileSystem
 from fsspec.implementations.memory import MemoryFileSystem
+from pytest import MonkeyPatch
 
 from spinta import commands
 from spinta.core.config import RawConfig
 from spinta.core.enums import Mode
+from spinta.datasets.backends.dataframe.commands import read as dataframe_read
+from spinta.datasets.backends.dataframe.commands.read import _iter_partitions, _Partition, iter_source_chunks
+from spinta.datasets.backends.dataframe.components import DaskBackend, RateLimiter
 from spinta.testing.client import create_test_client
 from spinta.testing.data import listdata
 from spinta.testing.manifest import prepare_manifest
@@ -194,6 +204,209 @@ def test_csv_read_parametrize_simple_iterate_pages(rc: RawConfig, tmp_path: Path
     ]
 
 
+def test_csv_read_parametrize_concurrently(rc: RawConfig, tmp_path: Path):
+    page_count = 10
+    for i in range(1, page_count):
+        current_page_file = tmp_path / f"page{i - 1}.csv"
+        csv_manifest = f"name,next\nPage {i},{f'{i}.csv' if i != page_count - 1 else ''}"
+        current_page_file.write_text(csv_manifest)
+
+    rc = rc.fork({"fetch_concurrency": 4})
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property    | type     | ref  | source                  | prepare | access
+    example/csv                 |          |      |                         |         |
+      | resource                | dask/csv |      | {tmp_path}/{{}}{{path}} |         |
+      |   |   |                 | param    | path | 0.csv                   |         |
+      |   |   |                 |          |      | Page                    | read().next |
+      |   |   | Page            |          | name | page                    |         |
+      |   |   |   | name        | string   |      | name                    |         | open
+      |   |   |   | next        | uri      |      | next                    |         | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/csv/Page", ["getall"])
+
+    resp = app.get("/example/csv/Page")
+    assert listdata(resp, "name", sort=False) == [f"Page {i}" for i in range(1, page_count)]
+
+
+def _slow_partitions(calls: list, count: int):
+    def fetch(i: int):
+        calls.append(i)
+        # Later partitions are computed faster.
+        time.sleep((count - i) * 0.01)
+        return [{"value": i}]
+
+    meta = pd.DataFrame({"value": pd.Series(dtype=int)})
+    return dask.bag.from_sequence(range(count), partition_size=1).map(fetch).flatten().to_dataframe(meta=meta)
+
+
+def test_iter_partitions_concurrently():
+    calls = []
+    backend = DaskBackend()
+    backend.concurrency = 3
+    df = _slow_partitions(calls, 6)
+    values = [v for part in _iter_partitions(df, backend) for v in part.df["value"]]
+    assert values == [0, 1, 2, 3, 4, 5]
+    assert sorted(calls) == [0, 1, 2, 3, 4, 5]
+
+
+def test_iter_partitions_cancel_on_close():
+    calls = []
+    backend = DaskBackend()
+    backend.concurrency = 2
+    df = _slow_partitions(calls, 6)
+    partitions = _iter_partitions(df, backend)
+    assert list(next(partitions).df["value"]) == [0]
+    partitions.close()
+    time.sleep(0.1)
+    # Only partitions submitted ahead could have been started.
+    assert sorted(calls)[:2] == [0, 1]
+    assert max(calls) <= 2
+
+
+def _read_numbers(source: tuple) -> list:
+    start, count = source
+    # Later sources are read faster.
+    time.sleep((10 - start // 10) * 0.01)
+    return [{"value": start + i} for i in range(count)]
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_iter_source_chunks(concurrency: int):
+    backend = DaskBackend()
+    backend.concurrency = concurrency
+    backend.chunk_size = 2
+    sources = [(0, 5), (10, 0), (20, 2), (30, 1)]
+    chunks = list(iter_source_chunks(backend, sources, _read_numbers, {"value": "object"}))
+    assert [list(chunk["value"]) for chunk in chunks] == [[0, 1], [2, 3], [4], [20, 21], [30]]
+
+
+def test_iter_source_chunks_empty():
+    backend = DaskBackend()
+    chunks = list(iter_source_chunks(backend, [], _read_numbers, {"value": "object"}))
+    assert [list(chunk.columns) for chunk in chunks] == [["value"]]
+    assert [len(chunk) for chunk in chunks] == [0]
+
+
+def _typed(row: dict) -> dict:
+    # NaN is not equal to itself.
+    return {k: (type(v), repr(v)) for k, v in row.items()}
+
+
+@pytest.mark.parametrize(
+    "df",
+    [
+        pd.DataFrame(
+            {
+                "value": pd.Series(
+                    [
+                        np.int64(1),
+                        np.float64(1.5),
+                        np.bool_(True),
+                        np.datetime64("2020-01-01"),
+                        np.timedelta64(1, "s"),
+                        pd.NA,
+                        None,
+                        float("nan"),
+                        "a",
+                        [1, 2],
+                    ],
+                    dtype=object,
+                ),
+                "number": range(10),
+            }
+        ),
+        pd.DataFrame({"value": [1.5, float("nan")], "number": [1.0, 2.0]}),
+        pd.DataFrame({"value": [1, 2], "number": [3, 4]}),
+    ],
+)
+def test_partition_values_same_as_rows(df: pd.DataFrame):
+    partition = _Partition(df)
+    rows = [row.to_dict() for i, row in df.iterrows()]
+    assert [_typed(partition.row(i)) for i in range(len(partition))] == [_typed(row) for row in rows]
+    assert _typed({k: partition.column(k) for k in df.columns}) == _typed(
+        {k: [row[k] for row in rows] for k in df.columns}
+    )
+
+
+def test_getall_columns_same_as_rows(rc: RawConfig, tmp_path: Path, monkeypatch: MonkeyPatch):
+    path = tmp_path / "cities.json"
+    path.write_text(
+        json.dumps(
+            {
+                "cities": [
+                    {"code": "1", "name": "Vilnius", "type": 1, "size": 5.5, "file": "YQ=="},
+                    {"code": "1", "name": "Kaunas", "type": 2, "size": None, "file": "Yg=="},
+                    {"code": "2", "name": "Vilnius", "type": 1, "size": 3, "file": "Yw=="},
+                ]
+            }
+        )
+    )
+
+    context, manifest = prepare_manifest(
+        rc,
+        f"""
+    d | r | b | m | property | type      | ref        | source | prepare  | access
+    example/json             |           |            |        |          |
+      | json                 | dask/json |            | {path} |          |
+      |   |   | City         |           | code, name | cities |          |
+      |   |   |   | code     | string    |            | code   |          | open
+      |   |   |   | name     | string    |            | name   |          | open
+      |   |   |   | type     | string    |            | type   |          | open
+      |   |   |   |          | enum      |            | 1      | 'city'   |
+      |   |   |   |          |           |            | 2      | 'town'   |
+      |   |   |   | size     | number    |            | size   |          | open
+      |   |   |   | file     | binary    |            | file   | base64() | open
+    """,
+        mode=Mode.external,
+    )
+    context.loaded = True
+    app = create_test_client(context)
+    app.authmodel("example/json/City", ["getall", "search"])
+
+    computed = []
+    get_column_values = dataframe_read._get_column_values
+
+    def _get_column_values(context, df, sel: Any):
+        values = get_column_values(context, df, sel)
+        computed.append(values is not None)
+        return values
+
+    monkeypatch.setattr(dataframe_read, "_get_column_values", _get_column_values)
+    columns = app.get("/example/json/City").json()["_data"]
+    # Only `file` is resolved row by row, because of `base64()` expression.
+    assert computed.count(False) == 1
+
+    # Resolve all selected values row by row.
+    monkeypatch.setattr(dataframe_read, "_get_column_values", lambda context, df, sel: None)
+    rows = app.get("/example/json/City").json()["_data"]
+
+    assert columns == rows
+    assert [(row["code"], row["name"], row["type"], row["size"]) for row in rows] == [
+        ("1", "Vilnius", "city", 5.5),
+        ("1", "Kaunas", "town", None),
+        ("2", "Vilnius", "city", 3),
+    ]
+    # Composite ids are encoded from both primary key values.
+    assert len({row["_id"] for row in rows}) == 3
+
+
+def test_rate_limiter():
+    limiter = RateLimiter(50)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.wait) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.08
+
+
 def test_xml_json_csv_combined_read_parametrize_advanced_iterate_pages(rc: RawConfig, tmp_path: Path):
     page_count = 3
     database_types = {"SQL": ["PostgresSQL", "SQLite"], "NOSQL": ["MongoDB"]}
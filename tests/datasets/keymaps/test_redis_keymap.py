@@ -62,6 +62,37 @@ def test_contains(redis_in_memory_keymap):
     assert redis_in_memory_keymap.contains(name, value)
 
 
+def test_encode_many_and_decode_many(redis_in_memory_keymap):
+    name = "test"
+    key = redis_in_memory_keymap.encode(name, {"id": 1})
+
+    keys = redis_in_memory_keymap.encode_many(name, [{"id": 2}, {"id": 1}, None, {"id": 2}])
+    assert keys[1] == key
+    assert keys[2] is None
+    assert keys[0] == keys[3] != key
+    assert redis_in_memory_keymap.encode(name, {"id": 2}) == keys[0]
+
+    decoded = redis_in_memory_keymap.decode_many(name, [keys[0], key, "missing"])
+    assert decoded == [{"id": 2}, {"id": 1}, None]
+
+
+def test_encode_cache():
+    from spinta.datasets.keymaps.components import KeymapSyncData
+
+    keymap = RedisKeyMap(dsn="redis://localhost", cache_size=10)
+    keymap.redis = fakeredis.FakeRedis(decode_responses=True)
+    name = "test"
+
+    key = keymap.encode(name, {"id": 1})
+    with mock.patch.object(keymap.redis, "hget") as hget:
+        assert keymap.encode(name, {"id": 1}) == key
+        assert keymap.decode(name, key) == {"id": 1}
+        hget.assert_not_called()
+
+    keymap.synchronize(KeymapSyncData(name=name, value={"id": 1}, identifier=key, data={}))
+    assert keymap.cache.get_key(name, json.dumps({"id": 1})) is None
+
+
 def test_has_synced_before_and_get_last_synced_id(redis_in_memory_keymap):
     sync_table = redis_in_memory_keymap._get_sync_table_name()
 
@@ -126,6 +157,22 @@ def test_synchronize_with_redirect(redis_in_memory_keymap):
     assert redis_in_memory_keymap.redis.hgetall(value_table) == {'{"x": 5}': "old-id"}
 
 
+def test_synchronize_many(redis_in_memory_keymap):
+    from spinta.datasets.keymaps.components import KeymapSyncData
+
+    redis_in_memory_keymap.synchronize_many(
+        [
+            KeymapSyncData(name="test", value={"id": 1}, identifier="key-1", data={"_created": "2024-01-01"}),
+            KeymapSyncData(name="test", value={"id": 2}, identifier="key-2", data={}),
+            KeymapSyncData(name="test", value=None, identifier="key-1", data={}, redirect="key-2"),
+        ]
+    )
+
+    assert redis_in_memory_keymap.decode_many("test", ["key-1", "key-2"]) == [{"id": 1}, {"id": 2}]
+    metadata = json.loads(redis_in_memory_keymap.redis.hget("keymap:test:meta", "key-1"))
+    assert metadata == {"modified_at": json.dumps("2024-01-01"), "redirect": json.dumps("key-2")}
+
+
 def test_validate_data_no_duplicates(redis_in_memory_keymap):
     name = "unique"
     val_table = redis_in_memory_keymap._get_value_table_name(name)
@@ -161,3 +208,25 @@ def test_validate_data_duplicates_warn_only(redis_in_memory_keymap, monkeypatch)
         msg, err = mock_echo.call_args[0][0], mock_echo.call_args[1].get("err", False)
         assert "WARNING: Keymap's" in msg
         assert err is True
+
+
+def test_encode_cache_synchronized_by_another_process():
+    from spinta.datasets.keymaps.components import KeymapSyncData
+
+    keymap = RedisKeyMap(dsn="redis://localhost", cache_size=10)
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    name = "test"
+
+    with mock.patch("spinta.datasets.keymaps.redis.Redis.from_url", return_value=redis):
+        with keymap.copy() as copied:
+            key = copied.encode(name, {"id": 1})
+
+        # Same keymap synchronized by another process, with its own cache.
+        synced = RedisKeyMap(dsn="redis://localhost")
+        synced.redis = redis
+        synced.synchronize(KeymapSyncData(name=name, value={"id": 2}, identifier=key, data={}))
+        synced.update_sync_data(name, cid=1, time=datetime.datetime.now())
+
+        with keymap.copy() as copied:
+            assert copied.cache.get_value(name, key) is None
+            assert copied.decode(name, key) == {"id": 2}
@@ -0,0 +1,198 @@
+import json
+import pathlib
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql
+
+from spinta.core.config import RawConfig
+from spinta.datasets.backends.sql.components import Sql, _dump_type, _load_type
+from spinta.datasets.backends.sql.helpers import warm_up_schema
+from spinta.manifests.tabular.helpers import striptable
+from spinta.testing.client import create_rc, create_test_client
+from spinta.testing.context import create_test_context
+from spinta.testing.data import listdata
+from spinta.testing.datasets import Sqlite
+from spinta.testing.tabular import create_tabular_manifest
+
+
+def _create_db(path: pathlib.Path) -> Sqlite:
+    db = Sqlite(f"sqlite:///{path / 'db.sqlite'}")
+    db.init(
+        {
+            "cities": [
+                sa.Column("id", sa.Integer, primary_key=True),
+                sa.Column("name", sa.Text),
+            ],
+        }
+    )
+    db.write("cities", [{"id": 1, "name": "Vilnius"}])
+    return db
+
+
+def _create_manifest(rc: RawConfig, tmp_path: pathlib.Path, table: str) -> None:
+    context = create_test_context(rc)
+    create_tabular_manifest(context, tmp_path / "manifest.csv", striptable(table))
+
+
+def _create_client(rc: RawConfig, tmp_path: pathlib.Path, db: Sqlite):
+    rc = create_rc(rc, tmp_path, db).fork(
+        {
+            "data_path": str(tmp_path / "data"),
+            "sql_schema_cache": True,
+        }
+    )
+    context = create_test_context(rc)
+    app = create_test_client(context)
+    app.authmodel("example/City", ["getall"])
+    backend: Sql = context.get("store").backends["sql"]
+    return context, app, backend
+
+
+CITY = """
+d | r | b | m | property | type    | ref | source  | access
+example                  |         |     |         |
+  | data                 | sql     |     |         |
+  |   |   | City         |         | id  | cities  |
+  |   |   |   | id       | integer |     | id      | open
+  |   |   |   | name     | string  |     | name    | open
+"""
+
+
+def test_schema_cache(rc: RawConfig, tmp_path: pathlib.Path):
+    db = _create_db(tmp_path)
+    _create_manifest(rc, tmp_path, CITY)
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    assert backend.tables == {}
+    resp = app.get("/example/City")
+    assert listdata(resp, "name") == ["Vilnius"]
+    assert list((tmp_path / "data" / "sqlschema").glob("*.json")) == [backend.schema_cache]
+
+    # After restart, table is loaded from schema cache.
+    context, app, backend = _create_client(rc, tmp_path, db)
+    table = backend.tables["cities"]
+    assert backend._unchecked == {"cities"}
+    resp = app.get("/example/City")
+    assert listdata(resp, "name") == ["Vilnius"]
+    assert backend.tables["cities"] is table
+    assert backend._unchecked == set()
+
+
+def test_schema_cache_missing_column(rc: RawConfig, tmp_path: pathlib.Path):
+    db = _create_db(tmp_path)
+    _create_manifest(rc, tmp_path, CITY)
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    app.get("/example/City")
+
+    with db.engine.begin() as conn:
+        conn.execute(sa.text("ALTER TABLE cities ADD COLUMN code TEXT"))
+        conn.execute(sa.text("UPDATE cities SET code = 'VLN'"))
+    _create_manifest(
+        rc,
+        tmp_path,
+        CITY
+        + """\
+  |   |   |   | code     | string  |     | code    | open
+""",
+    )
+
+    # Cached table does not have `code` column, so it is reflected again.
+    context, app, backend = _create_client(rc, tmp_path, db)
+    assert "code" not in backend.tables["cities"].c
+    resp = app.get("/example/City")
+    assert listdata(resp, "name", "code") == [("Vilnius", "VLN")]
+    assert "code" in backend.tables["cities"].c
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    assert "code" in backend.tables["cities"].c
+
+
+def test_warm_up_schema(rc: RawConfig, tmp_path: pathlib.Path):
+    db = _create_db(tmp_path)
+    _create_manifest(rc, tmp_path, CITY)
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    for thread in warm_up_schema(context, context.get("store").manifest):
+        thread.join()
+    assert list(backend.tables) == ["cities"]
+    assert backend.schema_cache.exists()
+
+
+def test_refresh_schema(rc: RawConfig, tmp_path: pathlib.Path):
+    db = _create_db(tmp_path)
+    _create_manifest(rc, tmp_path, CITY)
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    app.get("/example/City")
+    with db.engine.begin() as conn:
+        conn.execute(sa.text("ALTER TABLE cities ADD COLUMN code TEXT"))
+
+    backend.refresh_schema()
+    assert "code" in backend.tables["cities"].c
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    assert "code" in backend.tables["cities"].c
+
+
+def test_schema_cache_column_types(rc: RawConfig, tmp_path: pathlib.Path):
+    db = Sqlite(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    with db.engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                """
+                CREATE TABLE cities (
+                    id INTEGER PRIMARY KEY,
+                    name VARCHAR(20) NOT NULL,
+                    area NUMERIC(10, 2),
+                    founded DATETIME,
+                    capital BOOLEAN
+                )
+                """
+            )
+        )
+    _create_manifest(rc, tmp_path, CITY)
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    reflected = backend.reflect_table("cities")
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    cached = backend.tables["cities"]
+    assert cached is not reflected
+    assert [(c.name, repr(c.type), c.nullable, c.primary_key) for c in cached.c] == [
+        (c.name, repr(c.type), c.nullable, c.primary_key) for c in reflected.c
+    ]
+
+
+def test_schema_cache_unknown_type(rc: RawConfig, tmp_path: pathlib.Path):
+    db = _create_db(tmp_path)
+    _create_manifest(rc, tmp_path, CITY)
+
+    context, app, backend = _create_client(rc, tmp_path, db)
+    app.get("/example/City")
+    data = json.loads(backend.schema_cache.read_text())
+    data["tables"]["cities"]["columns"][1]["type"]["type"] = "os.system"
+    backend.schema_cache.write_text(json.dumps(data))
+
+    # Only types known to database dialect are loaded, other tables are
+    # reflected again.
+    context, app, backend = _create_client(rc, tmp_path, db)
+    assert backend.tables == {}
+    resp = app.get("/example/City")
+    assert listdata(resp, "name") == ["Vilnius"]
+
+
+def test_schema_cache_enum_type():
+    dialect = mysql.dialect()
+    data = json.loads(json.dumps(_dump_type(mysql.ENUM("a", "b"))))
+    type_ = _load_type(dialect, data)
+    assert repr(type_) == "ENUM('a', 'b')"
+    assert type_.result_processor(dialect, None)("a") == "a"
+
+
+def test_schema_cache_type_not_rebuilt():
+    # Name of PostgreSQL enum is not a constructor argument, so type can't be
+    # rebuilt and table is not stored in schema cache.
+    with pytest.raises(TypeError):
+        _dump_type(postgresql.ENUM("a", "b", name="letters"))
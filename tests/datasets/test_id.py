@@ -1,5 +1,9 @@
+import datetime
+
 from spinta import commands
 from spinta.components import Context
+from spinta.datasets.keymaps.components import KeymapSyncData
+from spinta.datasets.keymaps.helpers import KeymapCache
 from spinta.datasets.keymaps.sqlalchemy import SqlAlchemyKeyMap as KeyMap
 
 
@@ -23,3 +27,87 @@ def test_list():
         val = [42, "foo", "bar"]
         key = kmap.encode("test", val)
         assert kmap.decode("test", key) == val
+
+
+def test_encode_many():
+    context = Context("test")
+    kmap = KeyMap("sqlite:///:memory:")
+    commands.prepare(context, kmap)
+    with kmap:
+        key = kmap.encode("test", "lt")
+        keys = kmap.encode_many("test", ["lv", "lt", None, "lv"])
+        assert keys[1] == key
+        assert keys[2] is None
+        assert keys[0] == keys[3] != key
+        assert kmap.encode("test", "lv") == keys[0]
+        assert kmap.decode_many("test", [keys[0], key, "missing"]) == ["lv", "lt", None]
+
+
+def test_encode_cache():
+    context = Context("test")
+    kmap = KeyMap("sqlite:///:memory:", cache_size=2)
+    commands.prepare(context, kmap)
+    with kmap:
+        keys = kmap.encode_many("test", ["lt", "lv", "ee"])
+        # Only the most recently used values are kept in cache.
+        assert kmap.cache.get_key("test", '"lt"') is None
+        assert kmap.cache.get_key("test", '"ee"') == keys[2]
+        assert kmap.encode_many("test", ["lt", "lv", "ee"]) == keys
+
+        kmap.synchronize(KeymapSyncData(name="test", value="ee", identifier=keys[2], data={}, identifiable=True))
+        assert kmap.cache.get_key("test", '"ee"') is None
+        assert kmap.encode("test", "ee") == keys[2]
+
+
+def test_synchronize_many():
+    context = Context("test")
+    kmap = KeyMap("sqlite:///:memory:")
+    commands.prepare(context, kmap)
+    with kmap:
+        created = {"_created": "2024-01-01T00:00:00"}
+        with kmap.transaction():
+            kmap.synchronize_many(
+                [
+                    KeymapSyncData(name="test", value="lt", identifier="1", data=created, identifiable=True),
+                    KeymapSyncData(name="test", value="lv", identifier="2", data=created, identifiable=True),
+                    KeymapSyncData(name="test", value="ee", identifier="1", data=created, identifiable=True),
+                    KeymapSyncData(name="test", value=None, identifier="2", data={}, redirect="1", identifiable=True),
+                    KeymapSyncData(name="test", value=None, identifier="3", data={}, identifiable=True),
+                ]
+            )
+        assert kmap.decode_many("test", ["1", "2", "3"]) == ["ee", "lv", None]
+        assert kmap.encode("test", "ee") == "1"
+        assert kmap.encode("test", "lv") != "2"
+
+
+def test_encode_cache_shared_between_copies(tmp_path):
+    context = Context("test")
+    kmap = KeyMap(f"sqlite:///{tmp_path / 'keymap.db'}", cache_size=10)
+    commands.prepare(context, kmap)
+    with kmap.copy() as copied:
+        key = copied.encode("test", "lt")
+    with kmap.copy() as copied:
+        assert copied.cache is kmap.cache
+        assert copied.cache.get_key("test", '"lt"') == key
+
+
+def test_encode_cache_synchronized_by_another_process(tmp_path):
+    context = Context("test")
+    kmap = KeyMap(f"sqlite:///{tmp_path / 'keymap.db'}", cache_size=10)
+    commands.prepare(context, kmap)
+    with kmap.copy() as copied:
+        key = copied.encode("test", "lt")
+
+    # Same keymap synchronized by another process, with its own cache.
+    synced = kmap.copy()
+    synced.cache = KeymapCache()
+    with synced:
+        with synced.transaction():
+            synced.synchronize_many(
+                [KeymapSyncData(name="test", value=None, identifier=key, data={}, redirect="1", identifiable=True)]
+            )
+            synced.update_sync_data("test", 1, datetime.datetime.now())
+
+    with kmap.copy() as copied:
+        assert copied.cache.get_key("test", '"lt"') is None
+        assert copied.encode("test", "lt") != key
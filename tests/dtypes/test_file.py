@@ -296,6 +296,55 @@ def test_subresource_get_ref(model, app, tmp_path):
     }
 
 
+@pytest.mark.models(
+    "backends/postgres/dtypes/File",
+)
+def test_subresource_get_range(model, app, tmp_path):
+    app.authmodel(model, ["insert", "update", "getone"])
+
+    resp = _create_file(app, model)
+    data = resp.json()
+    pk = data["_id"]
+    rev = data["_revision"]
+
+    resp = app.put(
+        f"/{model}/{pk}/file",
+        content=iter([b"0123", b"4567", b"89"]),
+        headers={
+            "Revision": rev,
+            "Content-Type": "text/plain",
+            "Content-Disposition": 'attachment; filename="data.txt"',
+        },
+    )
+    assert resp.status_code == 200, resp.json()
+    rev = resp.json()["_revision"]
+
+    resp = app.get(f"/{model}/{pk}/file")
+    assert resp.status_code == 200
+    assert resp.content == b"0123456789"
+    assert resp.headers["ETag"] == f'"{rev}"'
+    assert resp.headers["Accept-Ranges"] == "bytes"
+
+    resp = app.get(f"/{model}/{pk}/file", headers={"Range": "bytes=2-5"})
+    assert resp.status_code == 206
+    assert resp.content == b"2345"
+    assert resp.headers["Content-Range"] == "bytes 2-5/10"
+
+    resp = app.get(f"/{model}/{pk}/file", headers={"Range": "bytes=-3", "If-Range": f'"{rev}"'})
+    assert resp.status_code == 206
+    assert resp.content == b"789"
+
+    resp = app.get(f"/{model}/{pk}/file", headers={"Range": "bytes=-3", "If-Range": "changed"})
+    assert resp.status_code == 200
+    assert resp.content == b"0123456789"
+
+    resp = app.get(f"/{model}/{pk}/file", headers={"Range": "bytes=10-"})
+    assert resp.status_code == 416
+    assert resp.headers["Content-Range"] == "bytes */10"
+    assert resp.headers["ETag"] == f'"{rev}"'
+    assert resp.headers["Accept-Ranges"] == "bytes"
+
+
 @pytest.mark.models(
     "backends/postgres/dtypes/File",
 )
@@ -11,6 +11,7 @@ from spinta import commands
 from spinta.backends.constants import TableType
 from spinta.backends.postgresql.components import PostgreSQL
 from spinta.core.config import RawConfig
+from spinta.formats.json.components import Json
 from spinta.testing.client import create_test_client
 from spinta.testing.data import encode_page_values_manually, pushdata
 from spinta.testing.manifest import bootstrap_manifest
@@ -449,3 +450,11 @@ def test_json_changes_corrupt_data(
     assert value["name"] == "Vilnius"
     assert value["country"] == {"_id": country_id}
     assert value["obj"] == {"test": "t_obj_updated"}
+
+
+def test_json_encoder_page():
+    rows = [
+        {"_id": "1", "_page": "a"},
+        {"_id": "2", "_page": "b"},
+    ]
+    assert b"".join(Json()(iter(rows))) == (b'{"_data":[{"_id":"1"},{"_id":"2"}],"_page":{"next":"b"}}')
@@ -13,6 +13,7 @@ from spinta import commands
 from spinta.backends.constants import TableType
 from spinta.backends.postgresql.components import PostgreSQL
 from spinta.core.config import RawConfig
+from spinta.formats.jsonlines.components import JsonLines
 from spinta.testing.client import create_test_client
 from spinta.testing.data import encode_page_values_manually, pushdata
 from spinta.testing.manifest import bootstrap_manifest
@@ -498,3 +499,11 @@ def test_jsonl_changes_corrupt_data(
     assert value["name"] == "Vilnius"
     assert value["country"] == {"_id": country_id}
     assert value["obj"] == {"test": "t_obj_updated"}
+
+
+def test_jsonl_encoder_page():
+    rows = [
+        {"_id": "1", "_page": "a"},
+        {"_id": "2", "_page": "b"},
+    ]
+    assert b"".join(JsonLines()(iter(rows))) == (b'{"_id":"1"}\n{"_id":"2","_page":{"next":"b"}}\n')
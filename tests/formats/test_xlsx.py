@@ -0,0 +1,115 @@
+import datetime
+import decimal
+import io
+import zipfile
+from pathlib import Path
+
+import openpyxl
+import pytest
+from _pytest.fixtures import FixtureRequest
+
+from spinta.core.config import RawConfig
+from spinta.formats.xlsx.helpers import stream_xlsx
+from spinta.testing.client import create_test_client
+from spinta.testing.manifest import bootstrap_manifest
+
+
+def _read_xlsx(data: bytes) -> dict:
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook.worksheets}
+
+
+def test_stream_xlsx():
+    rows = [
+        {
+            "name": "Vilnius",
+            "size": 1,
+            "area": decimal.Decimal("401.5"),
+            "capital": True,
+            "created": datetime.date(2024, 1, 1),
+        },
+        {
+            "name": "<Kaunas> & \x01",
+            "size": 2.5,
+            "area": None,
+            "capital": False,
+            "created": None,
+        },
+    ]
+    cols = ["name", "size", "area", "capital", "created"]
+    chunks = list(stream_xlsx(iter(rows), cols))
+    assert len(chunks) > 1
+    assert _read_xlsx(b"".join(chunks)) == {
+        "Sheet1": [
+            ["name", "size", "area", "capital", "created"],
+            ["Vilnius", 1, 401.5, True, "2024-01-01"],
+            ["<Kaunas> & ", 2.5, None, False, None],
+        ],
+    }
+
+
+def test_stream_xlsx_split_sheets():
+    rows = ({"name": str(i)} for i in range(5))
+    data = b"".join(stream_xlsx(rows, ["name"], max_rows=3))
+    assert _read_xlsx(data) == {
+        "Sheet1": [["name"], ["0"], ["1"]],
+        "Sheet2": [["name"], ["2"], ["3"]],
+        "Sheet3": [["name"], ["4"]],
+    }
+
+
+def test_stream_xlsx_zip64(monkeypatch: pytest.MonkeyPatch):
+    # Pretend, that a sheet larger than 1 KiB does not fit into a zip file
+    # without ZIP64 extensions.
+    monkeypatch.setattr(zipfile, "ZIP64_LIMIT", 1024)
+    rows = ({"name": f"City {i}"} for i in range(100))
+    data = b"".join(stream_xlsx(rows, ["name"]))
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        sheet = zf.getinfo("xl/worksheets/sheet1.xml")
+        assert sheet.file_size > 1024
+    assert _read_xlsx(data)["Sheet1"][-1] == ["City 99"]
+
+
+def test_stream_xlsx_empty():
+    data = b"".join(stream_xlsx(iter([]), ["name", "size"]))
+    assert _read_xlsx(data) == {
+        "Sheet1": [["name", "size"]],
+    }
+
+
+@pytest.mark.manifests("internal_sql", "csv")
+def test_export_xlsx(
+    manifest_type: str,
+    tmp_path: Path,
+    rc: RawConfig,
+    postgresql: str,
+    request: FixtureRequest,
+):
+    context = bootstrap_manifest(
+        rc,
+        """
+    d | r | b | m | property | type    | ref | access
+    example/xlsx             |         |     |
+      |   |   | City         |         |     |
+      |   |   |   | name     | string  |     | open
+      |   |   |   | size     | integer |     | open
+    """,
+        backend=postgresql,
+        tmp_path=tmp_path,
+        manifest_type=manifest_type,
+        request=request,
+        full_load=True,
+    )
+    app = create_test_client(context)
+    app.authmodel("example/xlsx/City", ["insert", "getall"])
+    app.post("/example/xlsx/City", json={"name": "Vilnius", "size": 1})
+
+    resp = app.get("/example/xlsx/City/:format/xlsx?select(name,size)")
+    assert resp.status_code == 200
+    assert resp.headers["content-disposition"] == 'attachment; filename="City.xlsx"'
+    assert _read_xlsx(resp.content) == {
+        "Sheet1": [
+            ["name", "size"],
+            ["Vilnius", 1],
+        ],
+    }
@@ -0,0 +1,203 @@
+import pathlib
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy_utils as su
+from sqlalchemy.dialects import postgresql as pg
+
+from spinta.manifests.sql.catalog import CatalogInspector
+
+TABLES = ["country", "region", "city", "district", "cities"]
+
+
+@pytest.fixture()
+def engine(tmp_path: pathlib.Path) -> sa.engine.Engine:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    with engine.begin() as conn:
+        for stmt in [
+            "CREATE TABLE country (id INTEGER PRIMARY KEY, code TEXT, name VARCHAR(20))",
+            "CREATE TABLE region (country INTEGER, code INTEGER, name TEXT, PRIMARY KEY (code, country))",
+            """
+            CREATE TABLE city (
+                id INTEGER PRIMARY KEY,
+                country INTEGER REFERENCES country (id),
+                region_country INTEGER,
+                region_code INTEGER,
+                area NUMERIC(10, 2),
+                founded DATETIME,
+                title TEXT GENERATED ALWAYS AS (upper(name)) VIRTUAL,
+                name TEXT,
+                FOREIGN KEY (region_country, region_code) REFERENCES region (country, code)
+            )
+            """,
+            # Foreign key to primary key of referenced table.
+            "CREATE TABLE district (id INTEGER, region_code INTEGER, FOREIGN KEY (region_code, id) REFERENCES region)",
+            "CREATE VIEW cities AS SELECT id, name FROM city",
+        ]:
+            conn.execute(sa.text(stmt))
+    return engine
+
+
+def _read(insp, table: str) -> tuple:
+    return (
+        [(c["name"], repr(c["type"]), c["nullable"]) for c in insp.get_columns(table, schema="main")],
+        insp.get_pk_constraint(table, schema="main")["constrained_columns"],
+        [
+            (fk["constrained_columns"], fk["referred_schema"], fk["referred_table"], fk["referred_columns"])
+            for fk in insp.get_foreign_keys(table, schema="main")
+        ],
+    )
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_catalog_inspector(engine: sa.engine.Engine, bulk: bool):
+    insp = sa.inspect(engine)
+    catalog = CatalogInspector(engine, bulk=bulk)
+    for table in TABLES:
+        assert _read(catalog, table) == _read(insp, table)
+
+    with pytest.raises(NotImplementedError):
+        catalog.get_table_comment("city", schema="main")
+
+
+def test_catalog_inspector_bulk_queries(engine: sa.engine.Engine):
+    queries = []
+
+    @sa.event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    catalog = CatalogInspector(engine)
+    catalog.prefetch(["main"])
+    assert len(queries) == 2
+
+    for table in TABLES:
+        _read(catalog, table)
+    assert len(queries) == 2
+
+
+def test_catalog_inspector_fallback(engine: sa.engine.Engine):
+    def reader(conn, dialect, schema):
+        conn.execute(sa.text("SELECT * FROM missing"))
+
+    catalog = CatalogInspector(engine)
+    catalog.reader = reader
+    assert _read(catalog, "city") == _read(sa.inspect(engine), "city")
+
+
+@pytest.fixture()
+def pg_engine(postgresql: str) -> sa.engine.Engine:
+    db = f"{postgresql}/catalog_inspector"
+    if su.database_exists(db):
+        su.drop_database(db)
+    su.create_database(db)
+    engine = sa.create_engine(db)
+    with engine.begin() as conn:
+        for stmt in [
+            "CREATE SCHEMA geo",
+            "CREATE TYPE geo.kind AS ENUM ('city', 'town')",
+            "CREATE DOMAIN geo.code AS VARCHAR(3) NOT NULL",
+            "CREATE TABLE country (id INTEGER PRIMARY KEY, code geo.code, name VARCHAR(20))",
+            "COMMENT ON TABLE country IS 'Countries'",
+            "COMMENT ON COLUMN country.name IS 'Name of a country'",
+            """
+            CREATE TABLE geo.region (
+                country INTEGER REFERENCES country (id),
+                code INTEGER,
+                names TEXT[],
+                PRIMARY KEY (code, country)
+            )
+            """,
+            """
+            CREATE TABLE geo.city (
+                id SERIAL PRIMARY KEY,
+                kind geo.kind NOT NULL,
+                region_country INTEGER,
+                region_code INTEGER,
+                area NUMERIC(10, 2),
+                tags VARCHAR(10)[][],
+                founded TIMESTAMP,
+                FOREIGN KEY (region_country, region_code) REFERENCES geo.region (country, code)
+            )
+            """,
+            "COMMENT ON COLUMN geo.city.kind IS 'Kind of a city'",
+            "CREATE VIEW geo.cities AS SELECT id, kind FROM geo.city",
+        ]:
+            conn.execute(sa.text(stmt))
+    yield engine
+    engine.dispose()
+    su.drop_database(db)
+
+
+def _type_name(type_) -> str:
+    # Catalog queries do not read type parameters, like length or enum values.
+    if isinstance(type_, pg.ARRAY):
+        return f"{type(type_).__name__}[{_type_name(type_.item_type)}]"
+    return type(type_).__name__
+
+
+def _read_postgresql(insp, table: str, schema: str) -> tuple:
+    return (
+        [
+            (c["name"], _type_name(c["type"]), c["nullable"], c.get("comment"))
+            for c in insp.get_columns(table, schema=schema)
+        ],
+        insp.get_pk_constraint(table, schema=schema)["constrained_columns"],
+        [
+            (
+                fk["name"],
+                fk["constrained_columns"],
+                # `Inspector` leaves out schemas found in `search_path`.
+                fk["referred_schema"] or "public",
+                fk["referred_table"],
+                fk["referred_columns"],
+            )
+            for fk in insp.get_foreign_keys(table, schema=schema)
+        ],
+        insp.get_table_comment(table, schema=schema)["text"],
+    )
+
+
+def test_catalog_inspector_postgresql(pg_engine: sa.engine.Engine):
+    insp = sa.inspect(pg_engine)
+    catalog = CatalogInspector(pg_engine)
+    for schema, table in [
+        ("public", "country"),
+        ("geo", "region"),
+        ("geo", "city"),
+        ("geo", "cities"),
+    ]:
+        assert _read_postgresql(catalog, table, schema) == _read_postgresql(insp, table, schema)
+
+    assert _read_postgresql(catalog, "city", "geo") == (
+        [
+            ("id", "INTEGER", False, None),
+            ("kind", "ENUM", False, "Kind of a city"),
+            ("region_country", "INTEGER", True, None),
+            ("region_code", "INTEGER", True, None),
+            ("area", "NUMERIC", True, None),
+            ("tags", "ARRAY[VARCHAR]", True, None),
+            ("founded", "TIMESTAMP", True, None),
+        ],
+        ["id"],
+        [
+            (
+                "city_region_country_region_code_fkey",
+                ["region_country", "region_code"],
+                "geo",
+                "region",
+                ["country", "code"],
+            )
+        ],
+        None,
+    )
+    assert [c["type"].__class__ for c in catalog.get_columns("country", schema="public")] == [
+        sa.INTEGER,
+        sa.VARCHAR,
+        sa.VARCHAR,
+    ]
+    assert catalog.get_table_comment("country", schema="public") == {"text": "Countries"}
+
+    # Referred schema is set, even if it is in `search_path`.
+    assert [fk["referred_schema"] for fk in insp.get_foreign_keys("region", schema="geo")] == [None]
+    assert [fk["referred_schema"] for fk in catalog.get_foreign_keys("region", schema="geo")] == ["public"]
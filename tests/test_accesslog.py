@@ -1,12 +1,18 @@
 import datetime
+import io
 import json
+import os
 import pathlib
+import signal
+import time
 
 import pytest
 from _pytest.capture import CaptureFixture
 from _pytest.fixtures import FixtureRequest
 
-from spinta.accesslog.file import FileAccessLog
+from spinta.accesslog import file as accesslog_file
+from spinta.accesslog.file import AccessLogWriter, FileAccessLog, get_accesslog_writer
+from spinta.accesslog.python import PythonAccessLog
 from spinta.auth import KeyType, create_access_token, get_default_auth_client_id, load_key
 from spinta.components import Store
 from spinta.core.config import RawConfig
@@ -489,14 +495,14 @@ def test_getall_accesslog(app, model, context):
     assert resp.status_code == 200
 
     accesslog = context.get("accesslog.stream")
-    assert len(accesslog) == 4
-    assert accesslog[-2:] == [
+    assert len(accesslog) == 5
+    assert accesslog[-3:] == [
         {
-            "txn": accesslog[-2]["txn"],
-            "pid": accesslog[-2]["pid"],
-            "token": accesslog[-2]["token"],
+            "txn": accesslog[-3]["txn"],
+            "pid": accesslog[-3]["pid"],
+            "token": accesslog[-3]["token"],
             "type": "request",
-            "time": accesslog[-2]["time"],
+            "time": accesslog[-3]["time"],
             "agent": "testclient",
             "format": "json",
             "action": "getall",
@@ -506,13 +512,20 @@ def test_getall_accesslog(app, model, context):
             "model": model,
         },
         {
-            "txn": accesslog[-2]["txn"],
+            "txn": accesslog[-3]["txn"],
             "type": "response",
-            "time": accesslog[-1]["time"],
-            "delta": accesslog[-1]["delta"],
-            "memory": accesslog[-1]["memory"],
+            "time": accesslog[-2]["time"],
+            "delta": accesslog[-2]["delta"],
+            "memory": accesslog[-2]["memory"],
             "objects": 1,
         },
+        {
+            "txn": accesslog[-3]["txn"],
+            "type": "body",
+            "time": accesslog[-1]["time"],
+            "buffer_size": 65536,
+            "flushes": 1,
+        },
     ]
 
 
@@ -528,14 +541,14 @@ def test_getall_w_select_accesslog(app, model, context):
     assert resp.status_code == 200
 
     accesslog = context.get("accesslog.stream")
-    assert len(accesslog) == 4
-    assert accesslog[-2:] == [
+    assert len(accesslog) == 5
+    assert accesslog[-3:] == [
         {
-            "txn": accesslog[-2]["txn"],
-            "pid": accesslog[-2]["pid"],
-            "token": accesslog[-2]["token"],
+            "txn": accesslog[-3]["txn"],
+            "pid": accesslog[-3]["pid"],
+            "token": accesslog[-3]["token"],
             "type": "request",
-            "time": accesslog[-2]["time"],
+            "time": accesslog[-3]["time"],
             "agent": "testclient",
             "format": "json",
             "action": "search",
@@ -545,13 +558,20 @@ def test_getall_w_select_accesslog(app, model, context):
             "model": model,
         },
         {
-            "txn": accesslog[-2]["txn"],
+            "txn": accesslog[-3]["txn"],
             "type": "response",
-            "time": accesslog[-1]["time"],
-            "delta": accesslog[-1]["delta"],
-            "memory": accesslog[-1]["memory"],
+            "time": accesslog[-2]["time"],
+            "delta": accesslog[-2]["delta"],
+            "memory": accesslog[-2]["memory"],
             "objects": 1,
         },
+        {
+            "txn": accesslog[-3]["txn"],
+            "type": "body",
+            "time": accesslog[-1]["time"],
+            "buffer_size": 65536,
+            "flushes": 1,
+        },
     ]
 
 
@@ -578,6 +598,9 @@ def test_accesslog_file(model, postgresql, rc, request, tmp_path):
     resp = app.post(f"/{model}", json={"status": "42"})
     assert resp.status_code == 201
 
+    store: Store = context.get("store")
+    store.accesslog.flush()
+
     accesslog = [json.loads(line) for line in logfile.read_text().splitlines()]
     assert len(accesslog) == 2
     assert accesslog[-2:] == [
@@ -688,6 +711,7 @@ def test_accesslog_file_stdin(
 
     store: Store = context.get("store")
     assert isinstance(store.accesslog, FileAccessLog)
+    store.accesslog.flush()
 
     cap = capsys.readouterr()
     accesslog = [
@@ -753,6 +777,7 @@ def test_accesslog_file_stderr(
 
     store: Store = context.get("store")
     assert isinstance(store.accesslog, FileAccessLog)
+    store.accesslog.flush()
 
     cap = capsys.readouterr()
     accesslog = [
@@ -789,6 +814,88 @@ def test_accesslog_file_stderr(
     ]
 
 
+def test_accesslog_writer(tmp_path: pathlib.Path):
+    logfile = tmp_path / "accesslog.log"
+    writer = AccessLogWriter(logfile, buffer_size=2, flush_interval=60)
+    try:
+        writer.write({"n": 1})
+        writer.write({"n": 2})
+        writer.write({"n": 3})
+        writer.flush()
+        assert logfile.read_text().splitlines() == ['{"n": 1}', '{"n": 2}', '{"n": 3}']
+
+        # Log rotation: file is moved away and writer is asked to reopen it.
+        logfile.rename(tmp_path / "accesslog.log.1")
+        writer.reopen()
+        writer.write({"n": 4})
+        writer.flush()
+        assert logfile.read_text().splitlines() == ['{"n": 4}']
+    finally:
+        writer.close()
+
+
+def test_accesslog_writer_flush_interval(tmp_path: pathlib.Path):
+    logfile = tmp_path / "accesslog.log"
+    writer = AccessLogWriter(logfile, buffer_size=100, flush_interval=0.01)
+    try:
+        writer.write({"n": 1})
+        for _ in range(100):
+            if logfile.exists() and logfile.read_text():
+                break
+            time.sleep(0.01)
+        assert logfile.read_text().splitlines() == ['{"n": 1}']
+    finally:
+        writer.close()
+
+
+def test_accesslog_writer_fork(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    logfile = tmp_path / "accesslog.log"
+    writer = AccessLogWriter(logfile, buffer_size=100, flush_interval=60)
+    parent = writer._thread
+    parent_queue = writer._queue
+    try:
+        writer.write({"n": 1})
+
+        # Forked process does not have the writer thread of parent process.
+        pid = os.getpid()
+        monkeypatch.setattr(os, "getpid", lambda: pid + 1)
+        writer.write({"n": 2})
+        writer.flush()
+        assert writer._thread is not parent
+        assert logfile.read_text().splitlines() == ['{"n": 2}']
+        writer.close()
+    finally:
+        parent_queue.put(StopIteration)
+        parent.join()
+
+
+def test_accesslog_sighup_handler(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(accesslog_file, "_writers", {})
+    monkeypatch.setattr(accesslog_file, "_sighup_installed", False)
+    monkeypatch.setattr(accesslog_file, "_previous_sighup", None)
+    previous = signal.getsignal(signal.SIGHUP)
+    try:
+        # SIGHUP is not handled, when logging to stdout.
+        writer = get_accesslog_writer(io.StringIO(), buffer_size=1, flush_interval=1)
+        writer.close()
+        assert signal.getsignal(signal.SIGHUP) is previous
+
+        writer = get_accesslog_writer(tmp_path / "accesslog.log", buffer_size=1, flush_interval=1)
+        writer.close()
+        assert signal.getsignal(signal.SIGHUP) is accesslog_file._reopen_writers
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+
+def test_accesslog_without_memory():
+    accesslog = PythonAccessLog()
+    accesslog.stream = []
+    accesslog.log_memory = False
+    accesslog.request(txn="txn")
+    accesslog.response(objects=1)
+    assert "memory" not in accesslog.stream[-1]
+
+
 @pytest.mark.models(
     "backends/postgres/Report",
 )
@@ -1061,14 +1168,14 @@ def test_ns_read(model, app, context, tmp_path):
     }
 
     accesslog = context.get("accesslog.stream")
-    assert len(accesslog) == 2
-    assert accesslog[-2:] == [
+    assert len(accesslog) == 3
+    assert accesslog[-3:] == [
         {
-            "txn": accesslog[-2]["txn"],
-            "pid": accesslog[-2]["pid"],
-            "token": accesslog[-2]["token"],
+            "txn": accesslog[-3]["txn"],
+            "pid": accesslog[-3]["pid"],
+            "token": accesslog[-3]["token"],
             "type": "request",
-            "time": accesslog[-2]["time"],
+            "time": accesslog[-3]["time"],
             "agent": "testclient",
             "format": "json",
             "action": "getall",
@@ -1078,13 +1185,20 @@ def test_ns_read(model, app, context, tmp_path):
             "ns": ns,
         },
         {
-            "txn": accesslog[-2]["txn"],
+            "txn": accesslog[-3]["txn"],
             "type": "response",
-            "time": accesslog[-1]["time"],
-            "delta": accesslog[-1]["delta"],
-            "memory": accesslog[-1]["memory"],
+            "time": accesslog[-2]["time"],
+            "delta": accesslog[-2]["delta"],
+            "memory": accesslog[-2]["memory"],
             "objects": objects[model],
         },
+        {
+            "txn": accesslog[-3]["txn"],
+            "type": "body",
+            "time": accesslog[-1]["time"],
+            "buffer_size": 65536,
+            "flushes": 1,
+        },
     ]
 
 
@@ -1177,13 +1291,13 @@ def test_get_accesslog_default_user(
     assert resp.status_code == 200, resp.json()
 
     accesslog = context.get("accesslog.stream")
-    assert len(accesslog) == 4
-    assert accesslog[-2:] == [
+    assert len(accesslog) == 5
+    assert accesslog[-3:] == [
         {
-            "txn": accesslog[-2]["txn"],
-            "pid": accesslog[-2]["pid"],
+            "txn": accesslog[-3]["txn"],
+            "pid": accesslog[-3]["pid"],
             "type": "request",
-            "time": accesslog[-2]["time"],
+            "time": accesslog[-3]["time"],
             "client": default_client_id,
             "method": "GET",
             "url": f"https://testserver/{model}?select(id)",
@@ -1193,13 +1307,20 @@ def test_get_accesslog_default_user(
             "model": model,
         },
         {
-            "txn": accesslog[-2]["txn"],
+            "txn": accesslog[-3]["txn"],
             "type": "response",
-            "time": accesslog[-1]["time"],
-            "delta": accesslog[-1]["delta"],
-            "memory": accesslog[-1]["memory"],
+            "time": accesslog[-2]["time"],
+            "delta": accesslog[-2]["delta"],
+            "memory": accesslog[-2]["memory"],
             "objects": 1,
         },
+        {
+            "txn": accesslog[-3]["txn"],
+            "type": "body",
+            "time": accesslog[-1]["time"],
+            "buffer_size": 65536,
+            "flushes": 1,
+        },
     ]
 
 
@@ -1244,10 +1365,10 @@ def test_get_accesslog_not_default_user(
     assert resp.status_code == 200, resp.json()
 
     accesslog = context.get("accesslog.stream")
-    assert len(accesslog) == 5
-    client = accesslog[-5]["client"]
-    token = accesslog[-5]["token"]
-    assert accesslog[-5:] == [
+    assert len(accesslog) == 6
+    client = accesslog[-6]["client"]
+    token = accesslog[-6]["token"]
+    assert accesslog[-6:] == [
         {
             "agent": "testclient",
             "client": client,
@@ -1255,7 +1376,7 @@ def test_get_accesslog_not_default_user(
             "method": "POST",
             "rctype": "application/x-www-form-urlencoded",
             "scope": expected_scope,
-            "time": accesslog[-5]["time"],
+            "time": accesslog[-6]["time"],
             "token": token,
             "type": "auth",
             "url": "https://testserver/auth/token",
@@ -1267,28 +1388,28 @@ def test_get_accesslog_not_default_user(
             "format": "json",
             "method": "POST",
             "model": "backends/postgres/dtypes/test/Entity",
-            "pid": accesslog[-4]["pid"],
+            "pid": accesslog[-5]["pid"],
             "rctype": "application/json",
-            "time": accesslog[-4]["time"],
+            "time": accesslog[-5]["time"],
             "token": token,
-            "txn": accesslog[-4]["txn"],
+            "txn": accesslog[-5]["txn"],
             "type": "request",
             "url": "https://testserver/backends/postgres/dtypes/test/Entity",
         },
         {
-            "delta": accesslog[-3]["delta"],
-            "memory": accesslog[-3]["memory"],
+            "delta": accesslog[-4]["delta"],
+            "memory": accesslog[-4]["memory"],
             "objects": 1,
-            "time": accesslog[-3]["time"],
-            "txn": accesslog[-4]["txn"],
+            "time": accesslog[-4]["time"],
+            "txn": accesslog[-5]["txn"],
             "type": "response",
         },
         {
-            "txn": accesslog[-2]["txn"],
-            "pid": accesslog[-2]["pid"],
+            "txn": accesslog[-3]["txn"],
+            "pid": accesslog[-3]["pid"],
             "token": token,
             "type": "request",
-            "time": accesslog[-2]["time"],
+            "time": accesslog[-3]["time"],
             "client": client,
             "method": "GET",
             "url": "https://testserver/backends/postgres/dtypes/test/Entity?select(id)",
@@ -1298,13 +1419,20 @@ def test_get_accesslog_not_default_user(
             "model": model,
         },
         {
-            "txn": accesslog[-2]["txn"],
+            "txn": accesslog[-3]["txn"],
             "type": "response",
-            "time": accesslog[-1]["time"],
-            "delta": accesslog[-1]["delta"],
-            "memory": accesslog[-1]["memory"],
+            "time": accesslog[-2]["time"],
+            "delta": accesslog[-2]["delta"],
+            "memory": accesslog[-2]["memory"],
             "objects": 1,
         },
+        {
+            "txn": accesslog[-3]["txn"],
+            "type": "body",
+            "time": accesslog[-1]["time"],
+            "buffer_size": 65536,
+            "flushes": 1,
+        },
     ]
 
 
@@ -17,6 +17,7 @@ from spinta.auth import (
     BearerTokenValidator,
     KeyType,
     Token,
+    VerifiedTokenCache,
     authorized,
     create_access_token,
     create_client_file,
@@ -26,6 +27,7 @@ from spinta.auth import (
     load_key,
     load_key_from_file,
     query_client,
+    verified_tokens,
 )
 from spinta.components import Context
 from spinta.core.config import RawConfig
@@ -1367,3 +1369,48 @@ class TestTokenCheckContractScopes:
         context.set("auth.token", token)
 
         assert token.check_contract_scopes(context) is None
+
+
+def test_decode_token_uses_verified_token_cache(monkeypatch):
+    private, jwk = generate_rsa_keypair("rotation-1")
+    validator = BearerTokenValidator.__new__(BearerTokenValidator)
+    validator._all_public_keys = [import_key(jwk)]
+    verified_tokens.use_keys(validator._public_keys_id)
+
+    token = generate_jwt(private, "rotation-1")
+
+    real_decode = jwt.decode
+    decoded = []
+
+    def spy_decode(token_string, key, *args, **kwargs):
+        decoded.append(token_string)
+        return real_decode(token_string, key, *args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", spy_decode)
+
+    hits = verified_tokens.hits
+    first = validator.decode_token(token)
+    first["sub"] = "changed"
+    second = validator.decode_token(token)
+    assert second["sub"] == "user1"
+    assert len(decoded) == 1
+    assert verified_tokens.hits == hits + 1
+
+    # Cache is flushed, when public keys change.
+    _, other_jwk = generate_rsa_keypair("rotation-2")
+    verified_tokens.use_keys(",".join(import_key(k).thumbprint() for k in (jwk, other_jwk)))
+    validator.decode_token(token)
+    assert len(decoded) == 2
+
+
+def test_verified_token_cache_expires_with_token():
+    cache = VerifiedTokenCache(10)
+    now = int(datetime.datetime.now().timestamp())
+    cache.set("keys", "token", {"sub": "user1", "exp": now + 60})
+    cache.set("keys", "expired", {"sub": "user1", "exp": now - 1})
+    cache.set("keys", "no-exp", {"sub": "user1"})
+    assert cache.get("keys", "token") == {"sub": "user1", "exp": now + 60}
+    assert cache.get("keys", "expired") is None
+    assert cache.get("keys", "no-exp") is None
+    assert cache.get("other", "token") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 3}
@@ -0,0 +1,119 @@
+import json
+import os
+import pathlib
+import sys
+
+import pytest
+
+from spinta.core.config import RawConfig
+from spinta.core.context import get_commands_index_path, load_commands, write_commands_index
+from spinta.dispatcher import Command, _commands
+
+
+def _create_command() -> Command:
+    lazy_command = Command("lazy_command")
+    lazy_command.module = __name__
+    return lazy_command
+
+
+@pytest.fixture()
+def lazy_package(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    package = tmp_path / "lazy_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "components.py").write_text("class Thing:\n    pass\n\n\nclass Other:\n    pass\n")
+    (package / "commands.py").write_text(
+        "from spinta.dispatcher import _commands\n"
+        "from lazy_package.components import Thing\n"
+        "\n"
+        "\n"
+        "@_commands['lazy_command'].register(Thing, type(None))\n"
+        "def lazy_command(thing, value):\n"
+        "    return 'thing'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(_commands, "lazy_command", _create_command())
+    yield package
+    for name in list(sys.modules):
+        if name.startswith("lazy_package"):
+            del sys.modules[name]
+
+
+def _reset(package: pathlib.Path) -> None:
+    # Simulate a fresh process, where only index is available.
+    for name in list(sys.modules):
+        if name.startswith(package.name):
+            del sys.modules[name]
+    _commands["lazy_command"] = _create_command()
+
+
+def test_commands_index(lazy_package: pathlib.Path, tmp_path: pathlib.Path):
+    write_commands_index(["lazy_package"], tmp_path / "index.json")
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert index["modules"]["lazy_package.commands"]["eager"] is False
+    assert index["modules"]["lazy_package.commands"]["commands"] == [
+        [
+            "lazy_command",
+            [
+                ["lazy_package.components", "Thing"],
+                ["types", "NoneType"],
+            ],
+        ],
+    ]
+    assert index["modules"]["lazy_package.components"]["commands"] == []
+    assert index["modules"]["tests.test_dispatcher"]["eager"] is True
+
+
+def test_load_commands_lazily(lazy_package: pathlib.Path, tmp_path: pathlib.Path):
+    write_commands_index(["lazy_package"], tmp_path / "index.json")
+    _reset(lazy_package)
+
+    load_commands(["lazy_package"], index=tmp_path / "index.json")
+    assert "lazy_package.commands" not in sys.modules
+    assert "lazy_package.components" not in sys.modules
+
+    from lazy_package.components import Other, Thing
+
+    with pytest.raises(NotImplementedError):
+        _commands["lazy_command"](Other(), None)
+    assert "lazy_package.commands" not in sys.modules
+
+    assert _commands["lazy_command"](Thing(), None) == "thing"
+    assert "lazy_package.commands" in sys.modules
+    assert _commands["lazy_command"].pending == {}
+
+
+def test_load_commands_changed_module(lazy_package: pathlib.Path, tmp_path: pathlib.Path):
+    write_commands_index(["lazy_package"], tmp_path / "index.json")
+    _reset(lazy_package)
+
+    # Module changed after index was built, so it is imported on startup.
+    path = lazy_package / "commands.py"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    load_commands(["lazy_package"], index=tmp_path / "index.json")
+    assert "lazy_package.commands" in sys.modules
+    assert _commands["lazy_command"].pending == {}
+
+
+def test_load_commands_outdated_index(lazy_package: pathlib.Path, tmp_path: pathlib.Path):
+    write_commands_index(["lazy_package"], tmp_path / "index.json")
+    index = json.loads((tmp_path / "index.json").read_text())
+    index["spinta"] = "0.0.0"
+    (tmp_path / "index.json").write_text(json.dumps(index))
+    _reset(lazy_package)
+
+    # Index built by another spinta version is not used.
+    load_commands(["lazy_package"], index=tmp_path / "index.json")
+    assert "lazy_package.commands" in sys.modules
+    assert _commands["lazy_command"].pending == {}
+
+
+def test_commands_index_path(rc: RawConfig, tmp_path: pathlib.Path):
+    rc = rc.fork({"data_path": str(tmp_path)})
+    assert get_commands_index_path(rc) == tmp_path / "commands-index.json"
+    assert get_commands_index_path(rc.fork({"commands": {"index": str(tmp_path / "index.json")}})) == (
+        tmp_path / "index.json"
+    )
+    assert get_commands_index_path(rc.fork({"commands": {"index": ""}})) is None
@@ -2,6 +2,7 @@ import datetime
 import hashlib
 import json
 import textwrap
+import uuid
 from typing import Any, Callable, Dict, Tuple
 
 import pytest
@@ -9,13 +10,22 @@ import requests
 import sqlalchemy as sa
 from pprintpp import pformat
 from requests import PreparedRequest
-from responses import POST, RequestsMock
+from responses import GET, POST, RequestsMock
 
 from spinta import commands
 from spinta.cli.helpers.errors import ErrorCounter
 from spinta.cli.helpers.push.components import PushRow, State
-from spinta.cli.helpers.push.state import init_push_state, reset_pushed
-from spinta.cli.helpers.push.write import _map_sent_and_recv, get_row_for_error, push, send_request
+from spinta.cli.helpers.push.state import check_push_state, init_push_state, reset_pushed, save_push_state
+from spinta.cli.helpers.push.utils import get_data_checksum
+from spinta.cli.helpers.push.write import (
+    _build_error_rows_url,
+    _iter_error_row_batches,
+    _map_sent_and_recv,
+    get_row_for_error,
+    prepare_rows_with_errors,
+    push,
+    send_request,
+)
 from spinta.core.config import RawConfig
 from spinta.manifests.tabular.helpers import striptable
 from spinta.testing.cli import SpintaCliRunner
@@ -1083,6 +1093,271 @@ def test_push_state__max_errors(rc: RawConfig, responses: RequestsMock):
     assert list(conn.execute(query)) == [(_id1, rev, True), (_id2, None, True)]
 
 
+def test_push_state__concurrent(rc: RawConfig, responses: RequestsMock):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    m | property | type   | access
+    City         |        |
+      | name     | string | open
+    """,
+    )
+
+    model = commands.get_model(context, manifest, "City")
+    models = [model]
+
+    state = State(*init_push_state("sqlite://", models))
+    conn = state.engine.connect()
+    context.set("push.state.conn", conn)
+
+    ids = [
+        "4d741843-4e94-4890-81d9-5af7c5b5989a",
+        "21ef6792-0315-4e86-9c39-b1b8f04b1f53",
+        "1e0d9d6f-3c1e-4b8a-9d84-4a6f5f7d0c55",
+        "7b4d0b3e-5a1f-4a8e-8f38-2f6bde3c9a11",
+    ]
+    rows = [
+        PushRow(model, {"_type": model.name, "_id": _id, "name": f"City {i}"}, op="insert") for i, _id in enumerate(ids)
+    ]
+
+    def _callback(request: PreparedRequest) -> Tuple[int, Dict[str, str], str]:
+        data = json.loads(request.body)["_data"]
+        for row in data:
+            row["_revision"] = f"rev-{row['_id']}"
+        return 200, {}, json.dumps({"_data": data})
+
+    client = requests.Session()
+    server = "https://example.com/"
+    responses.add_callback(POST, server, callback=_callback)
+
+    push(
+        context,
+        client,
+        server,
+        models,
+        rows,
+        timeout=(5, 300),
+        state=state,
+        chunk_size=1,
+        workers=2,
+        inflight=3,
+    )
+
+    assert len(responses.calls) == 4
+    table = state.metadata.tables[model.name]
+    query = sa.select([table.c.id, table.c.revision, table.c.error])
+    assert sorted(conn.execute(query)) == sorted((_id, f"rev-{_id}", False) for _id in ids)
+
+
+def test_check_push_state__batches(rc: RawConfig):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    m | property | type   | access
+    City         |        |
+      | name     | string | open
+    """,
+    )
+
+    model = commands.get_model(context, manifest, "City")
+    models = [model]
+
+    state = State(*init_push_state("sqlite://", models))
+    conn = state.engine.connect()
+    context.set("push.state.conn", conn)
+
+    _id1 = "4d741843-4e94-4890-81d9-5af7c5b5989a"
+    _id2 = "21ef6792-0315-4e86-9c39-b1b8f04b1f53"
+    _id3 = "1e0d9d6f-3c1e-4b8a-9d84-4a6f5f7d0c55"
+    rows = [
+        PushRow(model, {"_type": model.name, "_id": _id1, "name": "Vilnius"}),
+        PushRow(model, {"_type": model.name, "_id": _id2, "name": "Kaunas"}),
+        PushRow(model, {"_type": model.name, "_id": _id3, "name": "Klaipėda"}),
+    ]
+
+    table = state.metadata.tables[model.name]
+    conn.execute(
+        table.insert(),
+        [
+            {"id": _id1, "revision": "rev1", "checksum": get_data_checksum(rows[0].data, model), "error": False},
+            {"id": _id2, "revision": "rev2", "checksum": "CHANGED", "error": False},
+        ],
+    )
+
+    result = list(check_push_state(context, rows, state.metadata, batch_size=2))
+    assert [(row.data["_id"], row.op, row.data.get("_revision")) for row in result] == [
+        (_id2, "patch", "rev2"),
+        (_id3, "insert", None),
+    ]
+
+    query = sa.select([table.c.id, table.c.pushed.isnot(None)]).order_by(table.c.id)
+    assert list(conn.execute(query)) == [(_id2, False), (_id1, True)]
+
+
+def test_save_push_state__chunk(rc: RawConfig):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    m | property | type   | access
+    City         |        |
+      | name     | string | open
+    """,
+    )
+
+    model = commands.get_model(context, manifest, "City")
+    models = [model]
+
+    state = State(*init_push_state("sqlite://", models))
+    conn = state.engine.connect()
+    context.set("push.state.conn", conn)
+
+    _id1 = "4d741843-4e94-4890-81d9-5af7c5b5989a"
+    _id2 = "21ef6792-0315-4e86-9c39-b1b8f04b1f53"
+    _id3 = "1e0d9d6f-3c1e-4b8a-9d84-4a6f5f7d0c55"
+
+    table = state.metadata.tables[model.name]
+    page_table = state.metadata.tables["_page"]
+    conn.execute(
+        table.insert(),
+        [
+            {"id": _id1, "revision": "rev1", "checksum": "old", "error": False},
+            {"id": _id3, "revision": "rev3", "checksum": "old", "error": False},
+        ],
+    )
+
+    chunk = [
+        PushRow(model, {"_type": model.name, "_page": [_id1], "_id": _id1, "_revision": "rev1a"}, checksum="new"),
+        PushRow(model, {"_type": model.name, "_page": [_id2], "_id": _id2, "_revision": "rev2"}, checksum="new"),
+        PushRow(model, {"_type": model.name, "_where": f"eq(_id, '{_id3}')"}, op="delete"),
+    ]
+    result = list(save_push_state(context, [chunk], state.metadata))
+    assert result == chunk
+    assert all("_page" not in row.data for row in result)
+
+    query = sa.select([table.c.id, table.c.revision, table.c.checksum, table.c["page._id"]]).order_by(table.c.id)
+    assert list(conn.execute(query)) == [
+        (_id2, "rev2", "new", _id2),
+        (_id1, "rev1a", "new", _id1),
+    ]
+
+    query = sa.select([page_table.c.model, page_table.c.value])
+    assert list(conn.execute(query)) == [(model.name, '{"_id": "' + _id2 + '"}')]
+
+
+def test_prepare_rows_with_errors(rc: RawConfig, responses: RequestsMock):
+    context, manifest = load_manifest_and_context(
+        rc,
+        """
+    m | property | type   | access
+    City         |        |
+      | name     | string | open
+    """,
+    )
+
+    model = commands.get_model(context, manifest, "City")
+    models = [model]
+
+    state = State(*init_push_state("sqlite://", models))
+    conn = state.engine.connect()
+    context.set("push.state.conn", conn)
+
+    _id1 = "4d741843-4e94-4890-81d9-5af7c5b5989a"
+    _id2 = "21ef6792-0315-4e86-9c39-b1b8f04b1f53"
+    _id3 = "1e0d9d6f-3c1e-4b8a-9d84-4a6f5f7d0c55"
+    _id4 = "7b4d0b3e-5a1f-4a8e-8f38-2f6bde3c9a11"
+    _id5 = "9c2e1f4a-6b3d-4c8e-a7f1-3e5d2b1c0a99"
+    _id6 = "3f6c2a1b-8d4e-4f7a-9b2c-5e1d0a3c7b88"
+    _id7 = "5a8b3c2d-1e4f-4a6b-8c9d-0e2f4a6b8c1d"
+
+    vilnius = {"_type": model.name, "_id": _id1, "name": "Vilnius"}
+    kaunas = {"_type": model.name, "_id": _id2, "name": "Kaunas"}
+    klaipeda = {"_type": model.name, "_id": _id3, "name": "Klaipėda"}
+    siauliai = {"_type": model.name, "_id": _id6, "name": "Šiauliai"}
+
+    table = state.metadata.tables[model.name]
+    conn.execute(
+        table.insert(),
+        [
+            # Pushed, but response was not received.
+            {"id": _id1, "checksum": get_data_checksum(vilnius, model), "error": True, "data": json.dumps(vilnius)},
+            # Changed on target server.
+            {"id": _id2, "checksum": get_data_checksum(kaunas, model), "error": True, "data": json.dumps(kaunas)},
+            # Not found on target server.
+            {"id": _id3, "checksum": get_data_checksum(klaipeda, model), "error": True, "data": json.dumps(klaipeda)},
+            # Deleted on both servers.
+            {"id": _id4, "checksum": "DELETED", "error": True, "data": None},
+            # Deleted only on local server.
+            {"id": _id5, "checksum": "DELETED", "error": True, "data": None},
+            # Moved to another id on target server.
+            {"id": _id6, "checksum": get_data_checksum(siauliai, model), "error": True, "data": json.dumps(siauliai)},
+        ],
+    )
+
+    server = "https://example.com/"
+    responses.add(
+        GET,
+        f"{server}/{model.name}",
+        json={
+            "_data": [
+                {**vilnius, "_revision": "rev1"},
+                {**kaunas, "_revision": "rev2", "name": "Kaunas 2"},
+                {"_type": model.name, "_id": _id5, "_revision": "rev5", "name": "Alytus"},
+            ]
+        },
+    )
+    responses.add(GET, f"{server}/{model.name}/{_id3}", status=404, json={"errors": []})
+    responses.add(GET, f"{server}/{model.name}/{_id4}", status=404, json={"errors": []})
+    responses.add(GET, f"{server}/{model.name}/{_id6}", status=301, headers={"Location": f"/{model.name}/{_id7}"})
+    responses.add(GET, f"https://example.com/{model.name}/{_id7}", json={**siauliai, "_id": _id7, "_revision": "rev7"})
+
+    rows = conn.execute(sa.select([table.c.id, table.c.checksum, table.c.data]).where(table.c.error.is_(True)))
+    client = requests.Session()
+    result = list(prepare_rows_with_errors(client, server, context, rows, model, table, timeout=(5, 300)))
+
+    # All errored rows are checked with a single request, rows not found are
+    # checked one by one, because they might have been moved.
+    assert [call.request.url for call in responses.calls] == [
+        f"{server}/{model.name}?format(json)&any(%27eq%27,%20_id,%20"
+        + ",%20".join(f"%27{_id}%27" for _id in [_id1, _id2, _id3, _id4, _id5, _id6])
+        + ")",
+        f"{server}/{model.name}/{_id3}",
+        f"{server}/{model.name}/{_id4}",
+        f"{server}/{model.name}/{_id6}",
+        f"https://example.com/{model.name}/{_id7}",
+    ]
+    assert [(row.send, row.op, row.data.get("_id"), row.data.get("_revision")) for row in result] == [
+        (False, None, None, None),
+        (True, "patch", _id2, "rev2"),
+        (True, "insert", _id3, None),
+        (False, None, None, None),
+        (True, "delete", None, None),
+        (False, None, None, None),
+    ]
+    assert result[4].data["_where"] == f"eq(_id, '{_id5}')"
+
+    query = sa.select([table.c.id, table.c.revision, table.c.error]).order_by(table.c.id)
+    assert list(conn.execute(query)) == [
+        (_id3, None, True),
+        (_id2, None, True),
+        (_id6, "rev7", False),
+        (_id1, "rev1", False),
+        (_id5, None, True),
+    ]
+
+
+def test_prepare_rows_with_errors_url_length():
+    table = sa.Table("City", sa.MetaData(), sa.Column("id", sa.Text))
+    rows = [{table.c.id: str(uuid.UUID(int=i))} for i in range(100)]
+    server = "https://example.com"
+    batches = list(_iter_error_row_batches(server, "City", rows, table, batch_size=30, max_url_length=1000))
+    urls = [_build_error_rows_url(server, "City", [row[table.c.id] for row in batch]) for batch in batches]
+    assert [len(batch) for batch in batches] == [20, 20, 20, 20, 20]
+    assert [len(url) for url in urls] == [978, 978, 978, 978, 978]
+
+    batches = list(_iter_error_row_batches(server, "City", rows, table, batch_size=30, max_url_length=2000))
+    assert [len(batch) for batch in batches] == [30, 30, 30, 10]
+
+
 def test_push_init_state(rc: RawConfig, sqlite: Sqlite):
     context, manifest = load_manifest_and_context(
         rc,
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from starlette.requests import Request
+
+from spinta.utils.response import RangeNotSatisfiable, StreamingResponse, aiter, buffer_stream, get_byte_range
+
+
+@pytest.mark.asyncio
+async def test_aiter():
+    threads = set()
+
+    def stream():
+        for i in range(5):
+            threads.add(threading.get_ident())
+            yield i
+
+    assert [x async for x in aiter(stream(), buffer_size=2)] == [0, 1, 2, 3, 4]
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_aiter_error():
+    def stream():
+        yield 1
+        raise ValueError("boom")
+
+    result = []
+    with pytest.raises(ValueError, match="boom"):
+        async for x in aiter(stream()):
+            result.append(x)
+    assert result == [1]
+
+
+@pytest.mark.asyncio
+async def test_aiter_close():
+    closed = threading.Event()
+    produced = []
+
+    def stream():
+        try:
+            for i in range(100):
+                produced.append(i)
+                yield i
+        finally:
+            closed.set()
+
+    it = aiter(stream(), buffer_size=2)
+    assert await it.__anext__() == 0
+    await it.aclose()
+
+    # Stream is closed, before iteration ends.
+    assert closed.is_set()
+    assert len(produced) < 100
+
+
+@pytest.mark.asyncio
+async def test_aiter_cancel():
+    started = threading.Event()
+    closed = threading.Event()
+
+    def stream():
+        try:
+            yield 0
+            started.set()
+            # Producer is still reading, when consumer is cancelled.
+            time.sleep(0.2)
+            yield 1
+        finally:
+            closed.set()
+
+    async def consume():
+        async for _ in aiter(stream(), buffer_size=1):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert closed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_close():
+    closed = threading.Event()
+
+    def stream():
+        try:
+            for i in range(100):
+                yield b"x"
+        finally:
+            closed.set()
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("disconnected")
+
+    resp = StreamingResponse(aiter(stream(), buffer_size=2))
+    with pytest.raises(OSError):
+        await resp.stream_response(send)
+    assert closed.is_set()
+
+
+def test_buffer_stream():
+    chunks = [b"ab", b"c", b"de", b"f", b"g"]
+    assert list(buffer_stream(iter(chunks), 3)) == [b"abc", b"def", b"g"]
+    assert list(buffer_stream(iter(chunks), 0)) == chunks
+
+
+def _request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "value,result",
+    [
+        ("bytes=0-3", (0, 4)),
+        ("bytes=2-", (2, 10)),
+        ("bytes=5-100", (5, 10)),
+        ("bytes=-3", (7, 10)),
+        ("bytes=-100", (0, 10)),
+        ("bytes=5-2", None),
+        ("bytes=0-1,4-5", None),
+        ("items=0-3", None),
+        ("bytes=a-b", None),
+        ("bytes=-", None),
+    ],
+)
+def test_get_byte_range(value, result):
+    assert get_byte_range(_request(range=value), 10, "rev") == result
+
+
+@pytest.mark.parametrize("value", ["bytes=10-", "bytes=-0"])
+def test_get_byte_range_not_satisfiable(value):
+    with pytest.raises(RangeNotSatisfiable):
+        get_byte_range(_request(range=value), 10, "rev")
+
+
+def test_get_byte_range_if_range():
+    assert get_byte_range(_request(range="bytes=2-", if_range="rev"), 10, "rev") == (2, 10)
+    assert get_byte_range(_request(range="bytes=2-", if_range='"rev"'), 10, "rev") == (2, 10)
+    assert get_byte_range(_request(range="bytes=2-", if_range="old"), 10, "rev") is None
+    assert get_byte_range(_request(), 10, "rev") is None